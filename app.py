@@ -1,87 +1,289 @@
+import time
+_STARTED_AT = time.perf_counter()
+
+import argparse
+import itertools
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import numpy as np
-import whisper
-import tempfile
 import os
+import logging
 import sys
 from datetime import datetime
-from threading import Thread
-import subprocess
+from threading import RLock, Thread
 import wave
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from config import get_config, AudioConfig, WhisperConfig, AppConfig
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, Optional, List, Set, Union
+from audio_buffer import AudioBuffer
+from audio_utils import WHISPER_SAMPLE_RATE, prepare_for_whisper
+from capture import CAPTURE_BACKENDS, AudioProcessor, WSLAudioRecorder, create_recorder
+from config import (INFERENCE_PROFILES, get_config, get_inference_profile, ensure_audio_setup, AudioConfig, WhisperConfig, AppConfig,
+                    MetricsConfig, SystemConfiguration)
+from inference import apply_thread_settings, decode_options, detect_language, model_device, model_variant, prepare_model
+from memory_governor import MemoryGovernor
+from metrics import get_metrics
+from model_registry import ModelRegistry, get_model_registry
+from session_log import SessionLog
+from session_index import SessionIndex, default_index_path
+from startup_profile import format_report, profile_imports
+from streaming import StreamingTranscriber
+from transcription_cache import TranscriptionCache
+from transcription_queue import JobState, TranscriptionJob, TranscriptionQueue
+from ui_channel import HistoryView, UIChannel
 from user_settings import Settings, SettingsButton, AudioDeviceManager
-
-class AudioProcessor(ABC):
-    @abstractmethod
-    def record_audio(self, duration: int) -> None:
-        pass
-
-    @abstractmethod
-    def save_to_wav(self, file_path: str) -> None:
-        pass
+from vad import VoiceActivityDetector
 
 class TranscriptionProcessor(ABC):
     @abstractmethod
-    def transcribe(self, file_path: str) -> str:
+    def transcribe(self, audio: Union[str, np.ndarray, AudioBuffer], sample_rate: int = WHISPER_SAMPLE_RATE,
+                   use_cache: bool = True, prompt: Optional[str] = None) -> str:
         pass
 
-class WSLAudioRecorder(AudioProcessor):
-    def __init__(self, config: AudioConfig):
-        self.config = config
-        self.audio_data = None
-
-    def _build_powershell_command(self, duration: int) -> str:
-        return (
-            'powershell.exe -Command "'
-            'Add-Type -Path \\"C:\\Program Files\\NAudio\\NAudio.dll\\"; '
-            '$waveIn = New-Object NAudio.Wave.WaveInEvent; '
-            '$waveIn.DeviceNumber = 0; '
-            '$waveIn.WaveFormat = New-Object NAudio.Wave.WaveFormat(44100, 16, 1); '
-            '$waveFile = New-Object NAudio.Wave.WaveFileWriter('
-            f'\'{self.config.windows_audio_path}\', $waveIn.WaveFormat); '
-            '$waveIn.DataAvailable = { param($sender, $e) '
-            '$waveFile.Write($e.Buffer, 0, $e.BytesRecorded) }; '
-            '$waveIn.StartRecording(); '
-            f'Start-Sleep -Seconds {duration}; '
-            '$waveIn.StopRecording(); '
-            '$waveFile.Dispose(); '
-            '$waveIn.Dispose()'
-            '"'
-        )
-        
 class WhisperTranscriber(TranscriptionProcessor):
-    def __init__(self, config: WhisperConfig):
+    def __init__(self, config: WhisperConfig, registry: Optional[ModelRegistry] = None,
+                 cache: Optional[TranscriptionCache] = None):
         self.config = config
+        self.registry = registry or get_model_registry()
+        self.cache = cache
+        self.profile = get_inference_profile(config.profile)
+        self._model_lock = RLock()
+        self._model_future: Optional[Future] = self.preload(config, self.registry)
+        self._active = 0
+        self.last_used = time.monotonic()
+        # Session state: the pinned language, and recent text to prime the decoder with.
+        self.session_language: Optional[str] = config.language
+        self.prompt_provider: Optional[Callable[[int], str]] = None
+
+    @classmethod
+    def preload(cls, config: WhisperConfig, registry: Optional[ModelRegistry] = None) -> Future:
+        """Start loading the model for ``config`` and its inference profile in the background."""
+        registry = registry or get_model_registry()
+        profile = get_inference_profile(config.profile)
         if os.environ.get('TESTING') == 'true':
-            self.model = self._create_mock_model()
+            loader = lambda model_size, device: cls._create_mock_model()
         else:
-            self.model = whisper.load_model(self.config.model_size)
+            def loader(model_size: str, device: Optional[str]):
+                apply_thread_settings(profile)
+                return prepare_model(registry.loader(model_size, device), profile)
+
+        return registry.load(
+            config.model_size,
+            config.device,
+            warmup=config.warmup,
+            loader=loader,
+            variant=model_variant(profile)
+        )
+
+    @property
+    def model_ready(self) -> Future:
+        """Future of the model, starting a reload if it was released."""
+        with self._model_lock:
+            if self._model_future is None:
+                logging.getLogger('SpeechToText').info(f"Reloading released model {self.config.model_size}")
+                # A reload is use: the idle clock restarts now and again once the model is back.
+                self.last_used = time.monotonic()
+                self._model_future = self.preload(self.config, self.registry)
+                self._model_future.add_done_callback(self._touch)
+            return self._model_future
+
+    @property
+    def model(self):
+        """The loaded model, waiting for the background load if it is still running."""
+        return self.model_ready.result()
+
+    @property
+    def is_loaded(self) -> bool:
+        with self._model_lock:
+            return self._model_future is not None and self._model_future.done()
+
+    @property
+    def is_busy(self) -> bool:
+        return self._active > 0
+
+    def _touch(self, _future: Optional[Future] = None) -> None:
+        with self._model_lock:
+            self.last_used = time.monotonic()
+
+    def release_model(self) -> bool:
+        """Drop the model unless a transcription is using it; the next request reloads it.
 
-    def _create_mock_model(self):
+        Its memory is only returned once no other transcriber sharing the registry holds it.
+        """
+        with self._model_lock:
+            if self._active or self._model_future is None or not self._model_future.done():
+                return False
+            self._model_future = None
+            self.registry.evict(self.config.model_size, self.config.device, model_variant(self.profile))
+            return True
+
+    @contextmanager
+    def _using_model(self) -> Iterator[Any]:
+        """The model, held exclusively: whisper keeps per-decode state on shared modules."""
+        with self._model_lock:
+            self._active += 1
+        try:
+            model = self.model
+            with self.registry.lock(self.config.model_size, self.config.device, model_variant(self.profile)):
+                yield model
+        finally:
+            with self._model_lock:
+                self._active -= 1
+                self.last_used = time.monotonic()
+
+    @staticmethod
+    def _create_mock_model():
         class MockModel:
-            def transcribe(self, file_path):
-                with wave.open(file_path, 'rb') as wf:
-                    frames = wf.readframes(wf.getnframes())
-                    if all(b == 0 for b in frames):
-                        return {"text": ""}
+            def transcribe(self, audio, **kwargs):
+                if isinstance(audio, str):
+                    with wave.open(audio, 'rb') as wf:
+                        frames = wf.readframes(wf.getnframes())
+                        if not np.any(np.frombuffer(frames, dtype=np.uint8)):
+                            return {"text": ""}
+                elif not np.any(audio):
+                    return {"text": ""}
                 return {"text": "This is a mock transcription for testing."}
+
+            def detect_language(self, audio):
+                return None, ({"en": 0.97, "de": 0.03} if np.any(audio) else {})
         return MockModel()
 
-    def transcribe(self, file_path: str) -> str:
-        return self.model.transcribe(file_path)["text"]
+    def transcribe(self, audio: Union[str, np.ndarray, AudioBuffer], sample_rate: int = WHISPER_SAMPLE_RATE,
+                   use_cache: bool = True, prompt: Optional[str] = None) -> str:
+        """Transcribe ``audio``; ``use_cache=False`` skips the cache for audio that will not recur.
+
+        ``prompt`` overrides the session's initial prompt, e.g. to decode a recording again the same way.
+        """
+        if isinstance(audio, AudioBuffer):
+            audio, sample_rate = audio.samples, audio.sample_rate
+        if prompt is None:
+            prompt = self.initial_prompt()
+        key = None
+        language = self.session_language
+        if self.cache is not None and use_cache:
+            key = self.cache.key(audio, sample_rate, self.config, language=language, prompt=prompt)
+            cached = self.cache.get(key)
+            get_metrics().increment("cache_lookups_total", result="hit" if cached is not None else "miss")
+            if cached is not None:
+                return cached
+
+        # File paths go through whisper's ffmpeg loader; arrays are decoded in-process.
+        source = audio
+        if not isinstance(audio, str):
+            with get_metrics().span("decode"):
+                audio = prepare_for_whisper(audio, sample_rate)
+        with get_metrics().span("inference", model=self.config.model_size, profile=self.profile.name):
+            with self._using_model() as model:
+                text = model.transcribe(audio, **self._decode_options(model, audio, prompt))["text"]
+
+        if key is not None:
+            self.cache.put(key, text)
+            if self.session_language != language:
+                # This call pinned the language; file the text under it too, so the same audio
+                # decoded again in this session is a hit.
+                self.cache.put(self.cache.key(source, sample_rate, self.config, language=self.session_language,
+                                              prompt=prompt), text)
+        return text
+
+    def transcribe_segments(self, audio: Union[np.ndarray, AudioBuffer],
+                            sample_rate: int = WHISPER_SAMPLE_RATE) -> List[Dict[str, Any]]:
+        """Timed segments, in seconds from the start of ``audio``; bypasses the cache."""
+        if isinstance(audio, AudioBuffer):
+            audio, sample_rate = audio.samples, audio.sample_rate
+        with get_metrics().span("decode"):
+            audio = prepare_for_whisper(audio, sample_rate)
+        with get_metrics().span("inference", model=self.config.model_size, profile=self.profile.name):
+            with self._using_model() as model:
+                result = model.transcribe(audio, **self._decode_options(model, audio))
+
+        segments = result.get("segments")
+        if segments is None:
+            # Models without timestamps report the whole clip as one segment.
+            segments = [{"start": 0.0, "end": len(audio) / WHISPER_SAMPLE_RATE, "text": result["text"]}]
+        return [{"start": float(s["start"]), "end": float(s["end"]), "text": s["text"].strip()}
+                for s in segments if s["text"].strip()]
+
+    def initial_prompt(self) -> str:
+        if self.prompt_provider is None or self.config.prompt_chars <= 0:
+            return ""
+        return self.prompt_provider(self.config.prompt_chars)
+
+    def _decode_options(self, model, audio: Union[str, np.ndarray], prompt: str = "") -> Dict[str, Any]:
+        options = {**decode_options(self.profile, model_device(model)), "task": self.config.task}
+        language = self.session_language
+        if language is None and self.config.pin_language and not isinstance(audio, str):
+            # Passing the detected language on spares transcribe() its own detection pass.
+            language = self._detect_session_language(model, audio)
+        if language:
+            options["language"] = language
+        if prompt:
+            options["initial_prompt"] = prompt
+        return options
+
+    def _detect_session_language(self, model, audio: np.ndarray) -> Optional[str]:
+        """Detect the clip's language, pinning it for the session once detection is confident."""
+        with get_metrics().span("language_detection"):
+            detected = detect_language(model, audio)
+        if detected is None:
+            return None
+        language, probability = detected
+        if probability >= self.config.language_confidence:
+            self.session_language = language
+            logging.getLogger('SpeechToText').info(
+                f"Pinned session language to '{language}' (p={probability:.2f})")
+        return language
 
 class TranscriptionManager:
-    def __init__(self, file_prefix: str = "session"):
-        self.transcriptions: List[str] = []
+    def __init__(self, file_prefix: str = "session", session_log: Optional[SessionLog] = None,
+                 max_in_memory: int = 100, index: Optional[SessionIndex] = None):
+        # With a session log the full history lives on disk; only recent text is kept here.
+        self.transcriptions = deque(maxlen=max_in_memory) if session_log else []
         self.file_prefix = file_prefix
+        self.session_log = session_log
+        self.index = index
+        self.session_id = session_log.session_id if session_log else datetime.now().strftime("%d-%m-%Y-%H%M%S")
+        self._export_offsets: Dict[str, int] = {}
+
+    def tail(self, max_chars: int = 200) -> str:
+        """The most recent text, at most ``max_chars`` long and starting at a word boundary."""
+        parts, length = [], 0
+        # A snapshot, since transcription workers call this while the Tk thread appends.
+        for text in reversed(list(self.transcriptions)):
+            parts.append(text.strip())
+            length += len(parts[-1]) + 1
+            if length > max_chars:
+                break
+        tail = " ".join(reversed(parts))
+        if len(tail) > max_chars:
+            cut = tail[-max_chars:]
+            tail = cut if tail[-max_chars - 1] == " " else cut.partition(" ")[2]
+        return tail.strip()
 
-    def add_transcription(self, text: str) -> None:
+    def add_transcription(self, text: str, duration: Optional[float] = None,
+                          model: Optional[str] = None) -> None:
         self.transcriptions.append(text)
+        timestamp = None
+        with get_metrics().span("persist", op="append"):
+            if self.session_log is not None:
+                timestamp = self.session_log.append(text, duration=duration, model=model)["timestamp"]
+            if self.index is not None:
+                try:
+                    self.index.add(self.session_id, text, timestamp=timestamp, duration=duration, model=model)
+                except Exception as e:
+                    logging.getLogger('SpeechToText').warning(f"Could not index transcription: {e}")
 
     def save_transcriptions(self, session_id: Optional[str] = None) -> str:
+        with get_metrics().span("persist", op="export"):
+            return self._save_transcriptions(session_id)
+
+    def _save_transcriptions(self, session_id: Optional[str]) -> str:
+        if self.session_log is not None:
+            if session_id not in (None, self.session_log.session_id):
+                raise ValueError(f"Session {session_id} is not the current session {self.session_log.session_id}")
+            return self._export_session_log(self.session_log.session_id)
+
         if not self.transcriptions:
             raise ValueError("No transcriptions to save")
 
@@ -97,20 +299,92 @@ class TranscriptionManager:
 
         return filename
 
+    def _export_session_log(self, session_id: str) -> str:
+        """Append log records not yet exported to the .txt transcript.
+
+        The first export in a process rewrites the transcript, since a file left by an
+        earlier run of the same session may hold any prefix of the log.
+        """
+        filename = f"{self.file_prefix}-{session_id}.txt"
+        offset = self._export_offsets.get(filename, 0) if os.path.exists(filename) else 0
+        records = self.session_log.records(offset)
+        # Look for a record before touching the file, so an empty session leaves no empty transcript.
+        first = next(records, None)
+        if first is None:
+            if offset == 0:
+                raise ValueError("No transcriptions to save")
+            return filename
+
+        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        with open(filename, "a" if offset else "w") as file:
+            for record, offset in itertools.chain([first], records):
+                file.write(f"{record['text']}\n")
+        self._export_offsets[filename] = offset
+        return filename
+
 class SpeechToTextApp:
-    def __init__(self, root: tk.Tk):
-        self.config = get_config(testing=bool(os.environ.get('TESTING')))
+    def __init__(self, root: tk.Tk, config: Optional[SystemConfiguration] = None):
+        self.config = config or get_config(testing=bool(os.environ.get('TESTING')))
         self.root = root
         self.settings = Settings()
         self.settings_button = SettingsButton(self.root, self.settings)
-        self.recorder = WSLAudioRecorder(self.config.audio)
-        self.transcriber = WhisperTranscriber(self.config.whisper)
-        self.transcription_manager = TranscriptionManager()
-        self.audio_temp_file = None
+        self.recorder = create_recorder(self.config.audio)
+        self.transcriber = WhisperTranscriber(
+            self.config.whisper,
+            cache=TranscriptionCache(
+                max_entries=self.config.whisper.cache_entries,
+                cache_dir=os.path.join(self.settings.get("session_folder"), ".cache"),
+                max_disk_bytes=self.config.whisper.disk_cache_mb * 1024 * 1024
+            )
+        )
+        self.memory_governor = MemoryGovernor(
+            self.transcriber,
+            idle_timeout=self.config.whisper.idle_timeout,
+            memory_budget_mb=self.config.whisper.memory_budget_mb
+        )
+        self.vad = VoiceActivityDetector(self.config.audio)
+        self.transcription_manager = self._create_transcription_manager()
+        self.transcriber.prompt_provider = self.transcription_manager.tail
+        self.recorded_audio = None
+        self._recording_prompt: Optional[str] = None
+        # A recording can be processed more than once; only its first result is logged.
+        self._recording_id = 0
+        self._job_recordings: Dict[int, int] = {}
+        self._logged_recordings: Set[int] = set()
         self.buttons = {}
         self.setup_ui()
+        self.ui = UIChannel(self.root, interval_ms=self.config.app.ui_interval_ms, on_batch=self.history.flush)
+        self.transcription_queue = TranscriptionQueue(
+            self._transcribe_job,
+            workers=self.config.whisper.workers,
+            on_result=lambda job: self.ui.post(self._show_result, job)
+        )
         self.setup_buttons()
         self.settings_button.pack(side=tk.TOP, pady=5)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.update_history("Loading speech model...")
+        self.root.after(100, self._check_model_ready)
+        self.ui.start()
+        self.memory_governor.start()
+
+    def _create_transcription_manager(self) -> TranscriptionManager:
+        if os.environ.get('TESTING'):
+            return TranscriptionManager()
+        session_folder = self.settings.get("session_folder")
+        return TranscriptionManager(
+            file_prefix=os.path.join(session_folder, "session"),
+            session_log=SessionLog(session_folder),
+            index=SessionIndex(default_index_path(session_folder))
+        )
+
+    def on_close(self):
+        if self.transcription_manager.session_log is not None:
+            self.transcription_manager.session_log.close()
+        if self.transcription_manager.index is not None:
+            self.transcription_manager.index.close()
+        self.ui.stop()
+        self.memory_governor.stop()
+        self.root.destroy()
 
     def setup_ui(self):
         self.root.title(self.config.app.title)
@@ -123,6 +397,13 @@ class SpeechToTextApp:
             wrap=tk.WORD
         )
         self.history_text.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        self.history = HistoryView(self.history_text, max_lines=self.config.app.history_max_lines)
+        self.live_var = tk.BooleanVar(value=self.config.app.live_transcription)
+        tk.Checkbutton(
+            self.root,
+            text="Live transcription",
+            variable=self.live_var
+        ).pack()
 
     def setup_buttons(self):
         button_configs = [
@@ -144,38 +425,133 @@ class SpeechToTextApp:
             button.pack(pady=5)
             self.buttons[text] = button
 
+    def _check_model_ready(self):
+        if not self.transcriber.model_ready.done():
+            self.root.after(100, self._check_model_ready)
+            return
+        error = self.transcriber.model_ready.exception()
+        if error is not None:
+            self.update_history(f"Failed to load speech model: {error}", error=True)
+        else:
+            self.update_history("Speech model ready.")
+
     def start_recording(self):
         self.update_history("Recording started. Speak now.")
         self.buttons["Push to Record (5s)"].config(state=tk.DISABLED)
-        Thread(target=self.record_audio_thread).start()
+        # If the model was released while idle, reload it while the user speaks.
+        self.transcriber.model_ready
+        # Tk variables are read here, on the Tk thread, and handed to the worker.
+        Thread(target=self.record_audio_thread, args=(self.live_var.get(),)).start()
 
-    def record_audio_thread(self):
+    def record_audio_thread(self, live: bool = False):
+        """Runs on a worker thread; UI changes go through self.ui."""
+        if live:
+            self.live_record_thread()
+            return
         try:
-            self.audio_temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
             self.recorder.record_audio(duration=self.config.audio.duration)
-            self.recorder.save_to_wav(self.audio_temp_file.name)
-            self.update_history("Recording completed. Ready to process.")
-            self.buttons["Process Audio"].config(state=tk.NORMAL)
-            self.buttons["Delete Recording"].config(state=tk.NORMAL)
+            self.ui.post(self._recording_finished, self.recorder.buffer)
         except Exception as e:
-            self.update_history(f"Error during recording: {e}", error=True)
+            self.ui.post(self.update_history, f"Error during recording: {e}", True)
         finally:
-            self.buttons["Push to Record (5s)"].config(state=tk.NORMAL)
+            self.ui.post(self._set_button_state, "Push to Record (5s)", tk.NORMAL)
 
-    def process_audio(self):
-        self.buttons["Process Audio"].config(state=tk.DISABLED)
+    def _recording_finished(self, recording: AudioBuffer):
+        self.recorded_audio = recording
+        self._recording_prompt = None
+        self._recording_id += 1
+        self.update_history("Recording completed. Ready to process.")
+        self._set_button_state("Process Audio", tk.NORMAL)
+        self._set_button_state("Delete Recording", tk.NORMAL)
+
+    def _set_button_state(self, name: str, state: str):
+        self.buttons[name].config(state=state)
+
+    def live_record_thread(self):
+        stream = StreamingTranscriber(
+            self.transcriber,
+            sample_rate=self.config.audio.samplerate,
+            channels=self.config.audio.channels,
+            window_seconds=self.config.audio.stream_window_seconds,
+            step_ms=self.config.audio.stream_step_ms,
+            on_update=lambda committed, partial: self.ui.post_latest(
+                "live", self._show_live_text, committed, partial, False
+            )
+        )
         try:
-            transcription = self.transcriber.transcribe(self.audio_temp_file.name)
-            self.transcription_manager.add_transcription(transcription)
-            self.update_history(f"Transcription: {transcription}")
-            self.buttons["Save Transcriptions"].config(state=tk.NORMAL)
+            stream.start()
+            self.recorder.record_audio(duration=self.config.audio.duration, on_chunk=stream.feed)
         except Exception as e:
-            self.update_history(f"Error during transcription: {e}", error=True)
+            self.ui.post(self.update_history, f"Error during recording: {e}", True)
+        finally:
+            self.ui.post(self._show_live_text, stream.finish(), "", True)
+            self.ui.post(self._set_button_state, "Push to Record (5s)", tk.NORMAL)
+
+    def _show_live_text(self, committed: str, partial: str, final: bool):
+        if not final:
+            self.history.set_live(committed, partial)
+            return
+        self.history.clear_live()
+        if committed:
+            self.transcription_manager.add_transcription(
+                committed,
+                duration=self.config.audio.duration,
+                model=self.config.whisper.model_size
+            )
+            self.update_history(f"Transcription: {committed}")
+            self.buttons["Save Transcriptions"].config(state=tk.NORMAL)
+
+    def process_audio(self):
+        if self.recorded_audio is None:
+            return
+        # The recording stays loaded so it can be processed again. Its prompt is pinned on the
+        # first pass, so a second pass decodes the same way and is answered from the cache.
+        reprocess = self._recording_prompt is not None
+        if not reprocess:
+            self._recording_prompt = self.transcriber.initial_prompt()
+        job = self.transcription_queue.submit(
+            self.recorded_audio,
+            self.recorded_audio.sample_rate,
+            duration=self.recorded_audio.duration,
+            prompt=self._recording_prompt
+        )
+        self._job_recordings[job.job_id] = self._recording_id
+        self.update_history(f"Recording #{job.job_id} queued for {'re-' if reprocess else ''}transcription.")
+
+    def _transcribe_job(self, job: TranscriptionJob) -> str:
+        """Runs on a queue worker thread; must not touch Tk widgets."""
+        audio = job.audio
+        if self.config.audio.vad_enabled:
+            with get_metrics().span("vad"):
+                speech = self.vad.trim(audio.samples, audio.sample_rate)
+            if speech.is_empty:
+                return ""
+            audio = audio[speech.start:speech.end]
+        return self.transcriber.transcribe(audio, **job.options)
+
+    def _show_result(self, job: TranscriptionJob):
+        recording = self._job_recordings.pop(job.job_id, None)
+        if job.state is JobState.FAILED:
+            self.update_history(f"Error during transcription: {job.error}", error=True)
+        elif not job.result.strip():
+            self.update_history(f"No speech detected in recording #{job.job_id}.")
+        elif recording in self._logged_recordings:
+            self.update_history(f"Transcription (already saved): {job.result}")
+        else:
+            if recording is not None:
+                self._logged_recordings.add(recording)
+            self.transcription_manager.add_transcription(
+                job.result,
+                duration=job.duration,
+                model=self.config.whisper.model_size
+            )
+            self.update_history(f"Transcription: {job.result}")
+            self.buttons["Save Transcriptions"].config(state=tk.NORMAL)
 
     def delete_audio(self):
-        if self.audio_temp_file:
-            os.remove(self.audio_temp_file.name)
-            self.audio_temp_file = None
+        if self.recorded_audio is not None:
+            self.recorded_audio = None
+            self._recording_prompt = None
             self.update_history("Recording deleted. Ready to record again.")
             self.buttons["Process Audio"].config(state=tk.DISABLED)
             self.buttons["Delete Recording"].config(state=tk.DISABLED)
@@ -192,22 +568,72 @@ class SpeechToTextApp:
             self.update_history(f"Error saving transcriptions: {str(e)}", error=True)
 
     def update_history(self, text: str, error: bool = False):
-        self.history_text.config(state=tk.NORMAL)
-        tag = "error" if error else "normal"
+        """Tk thread only; worker threads post this through self.ui."""
         prefix = "Error: " if error else ""
-        self.history_text.insert(tk.END, f"{prefix}{text}\n", tag)
-        self.history_text.tag_config(tag, foreground="red" if error else "black")
-        self.history_text.see(tk.END)
-        self.history_text.config(state=tk.DISABLED)
+        self.history.append(f"{prefix}{text}", "error" if error else "normal")
+
+def setup_metrics(metrics_config: MetricsConfig) -> None:
+    metrics = get_metrics()
+    if metrics_config.trace_file:
+        metrics.open_trace(metrics_config.trace_file)
+    if metrics_config.prometheus_file:
+        metrics.export_periodically(metrics_config.prometheus_file, metrics_config.export_interval)
+    if metrics_config.http_port is not None:
+        metrics.serve(metrics_config.http_port)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="WSL2 speech-to-text")
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help="Report per-module import time and time to first window"
+    )
+    parser.add_argument('--metrics-port', type=int, default=None, help="Serve Prometheus metrics on this port")
+    parser.add_argument('--metrics-file', default=None, help="Periodically write Prometheus metrics to this file")
+    parser.add_argument('--trace-file', default=None, help="Append a JSONL record per timed stage to this file")
+    parser.add_argument('--inference-profile', choices=sorted(INFERENCE_PROFILES), default=None,
+                        help="Speed/accuracy trade-off for the speech model")
+    parser.add_argument('--capture-backend', choices=sorted(CAPTURE_BACKENDS), default=None,
+                        help="Audio capture backend (default: from settings, else $TAIK_CAPTURE_BACKEND or wsl)")
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help="Release the speech model after this many idle seconds (0 to keep it loaded)")
+    parser.add_argument('--memory-budget-mb', type=int, default=None,
+                        help="Release the idle speech model while the process uses more memory than this")
+    args = parser.parse_args(argv)
 
-def main():
     config = get_config()
+    if args.idle_timeout is not None:
+        config.whisper.idle_timeout = args.idle_timeout or None
+    if args.memory_budget_mb is not None:
+        config.whisper.memory_budget_mb = args.memory_budget_mb
+    if args.inference_profile:
+        config.whisper.profile = args.inference_profile
+    config.audio.backend = args.capture_backend or Settings().get("capture_backend") or config.audio.backend
+    if args.metrics_port is not None:
+        config.metrics.http_port = args.metrics_port
+    if args.metrics_file:
+        config.metrics.prometheus_file = args.metrics_file
+    if args.trace_file:
+        config.metrics.trace_file = args.trace_file
+    setup_metrics(config.metrics)
+    # Start loading the model while the checks run and the window comes up.
+    WhisperTranscriber.preload(config.whisper)
     if not config.run_preflight_checks():
         print("System configuration checks failed. Please check the logs.")
         sys.exit(1)
+    if config.audio.backend == 'wsl':
+        try:
+            ensure_audio_setup()
+        except RuntimeError as e:
+            print(f"{e} Please check the logs.")
+            sys.exit(1)
     
     root = tk.Tk()
-    app = SpeechToTextApp(root)
+    app = SpeechToTextApp(root, config)
+    if args.profile_startup:
+        root.update()
+        first_window = time.perf_counter() - _STARTED_AT
+        print(format_report(profile_imports('app'), first_window))
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+import struct
+import wave
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from audio_utils import pcm16_to_float32
+
+def _wav_layout(path: str) -> Tuple[int, int, int, int]:
+    """(data offset, frames, channels, sample rate) of a 16-bit PCM WAV file."""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Only 16-bit PCM WAV files are supported: {path}")
+        frames, channels, sample_rate = wf.getnframes(), wf.getnchannels(), wf.getframerate()
+
+    with open(path, 'rb') as f:
+        f.seek(12)  # past "RIFF" <size> "WAVE"
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No data chunk in WAV file: {path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'data':
+                return f.tell(), frames, channels, sample_rate
+            f.seek(size + (size & 1), 1)
+
+class AudioBuffer:
+    """16-bit PCM frames plus their sample rate and channel count, over one int16 array.
+
+    A linear buffer grows by doubling as frames are appended; a ring buffer keeps only
+    the newest ``capacity`` frames. ``samples``, slicing and ``memoryview`` share memory
+    with the buffer instead of copying it.
+    """
+
+    __slots__ = ('sample_rate', 'channels', 'ring', '_data', '_nbytes', '_start')
+
+    def __init__(self, capacity: int, sample_rate: int, channels: int = 1, ring: bool = False):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.ring = ring
+        self._data = np.zeros(max(1, capacity) * channels, dtype='<i2')
+        self._nbytes = 0
+        self._start = 0  # oldest frame of a ring buffer
+
+    @classmethod
+    def wrap(cls, audio: Union[bytes, bytearray, memoryview, np.ndarray], sample_rate: int,
+             channels: Optional[int] = None) -> "AudioBuffer":
+        """Use existing PCM as the buffer's storage without copying it."""
+        if isinstance(audio, np.ndarray):
+            if audio.dtype != np.int16:
+                raise ValueError(f"AudioBuffer holds int16 samples, not {audio.dtype}")
+            channels = channels or (audio.shape[1] if audio.ndim > 1 else 1)
+            data = audio.reshape(-1)
+        else:
+            channels = channels or 1
+            usable = len(audio) - len(audio) % (2 * channels)
+            data = np.frombuffer(audio, dtype='<i2', count=usable // 2)
+        buffer = cls.__new__(cls)
+        buffer.sample_rate = sample_rate
+        buffer.channels = channels
+        buffer.ring = False
+        buffer._data = data
+        buffer._nbytes = data.nbytes - data.nbytes % (2 * channels)
+        buffer._start = 0
+        return buffer
+
+    @classmethod
+    def from_wav(cls, path: str, mmap: bool = True) -> "AudioBuffer":
+        """Load a 16-bit PCM WAV file, memory-mapping its samples unless ``mmap`` is False."""
+        offset, frames, channels, sample_rate = _wav_layout(path)
+        count = frames * channels
+        if count == 0:
+            data = np.zeros(0, dtype='<i2')
+        elif mmap:
+            data = np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(count,))
+        else:
+            data = np.fromfile(path, dtype='<i2', count=count, offset=offset)
+        return cls.wrap(data.reshape(-1, channels) if channels > 1 else data, sample_rate, channels)
+
+    @property
+    def frame_size(self) -> int:
+        return 2 * self.channels
+
+    @property
+    def capacity(self) -> int:
+        return self._data.size // self.channels
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def duration(self) -> float:
+        return len(self) / self.sample_rate
+
+    def __len__(self) -> int:
+        return self._nbytes // self.frame_size
+
+    @property
+    def samples(self) -> np.ndarray:
+        """The buffered frames, shaped (frames,) or (frames, channels).
+
+        A view, except for a ring buffer that has wrapped around, which is copied into order.
+        """
+        frames = len(self)
+        end = self._start + frames
+        if end <= self.capacity:
+            flat = self._data[self._start * self.channels:end * self.channels]
+        else:
+            flat = np.concatenate((self._data[self._start * self.channels:],
+                                   self._data[:(end - self.capacity) * self.channels]))
+        return flat.reshape(-1, self.channels) if self.channels > 1 else flat
+
+    def __getitem__(self, frames: slice) -> "AudioBuffer":
+        if not isinstance(frames, slice):
+            raise TypeError("AudioBuffer only supports slicing by frames")
+        return AudioBuffer.wrap(self.samples[frames], self.sample_rate, self.channels)
+
+    def memoryview(self, start: int = 0, stop: Optional[int] = None) -> memoryview:
+        """Raw little-endian bytes of frames ``start:stop``."""
+        samples = self.samples
+        flat = samples.reshape(-1)[start * self.channels:None if stop is None else stop * self.channels]
+        return memoryview(np.ascontiguousarray(flat)).cast('B')
+
+    def extend(self, data: Union[bytes, bytearray, memoryview, np.ndarray]) -> None:
+        """Append PCM; a linear buffer also accepts partial frames, completed by later data."""
+        raw = memoryview(data).cast('B') if not isinstance(data, np.ndarray) else \
+            memoryview(np.ascontiguousarray(data, dtype='<i2')).cast('B')
+        if self.ring:
+            self._extend_ring(raw)
+            return
+        self._reserve(len(raw))
+        self._bytes()[self._nbytes:self._nbytes + len(raw)] = raw
+        self._nbytes += len(raw)
+
+    def readinto(self, stream, size: int) -> int:
+        """Read up to ``size`` bytes from a binary stream straight into the buffer."""
+        if self.ring:
+            raise ValueError("readinto is only supported on linear buffers")
+        self._reserve(size)
+        target = self._bytes()[self._nbytes:self._nbytes + size]
+        read = stream.readinto1(target) if hasattr(stream, 'readinto1') else stream.readinto(target)
+        self._nbytes += read or 0
+        return read or 0
+
+    def clear(self) -> None:
+        self._nbytes = 0
+        self._start = 0
+
+    def to_float32(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Samples scaled to [-1.0, 1.0); pass ``out`` to reuse an existing float32 array."""
+        return pcm16_to_float32(self.samples, out=out)
+
+    def write_wav(self, path: str) -> None:
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(self.channels)
+            wf.setsampwidth(2)
+            wf.setframerate(self.sample_rate)
+            wf.writeframes(self.memoryview())
+
+    def _bytes(self) -> memoryview:
+        return memoryview(self._data).cast('B')
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._nbytes + extra
+        if needed <= self._data.nbytes and self._data.flags.writeable:
+            return
+        size = max(needed, 2 * self._data.nbytes)
+        size += -size % self.frame_size
+        grown = np.zeros(size // 2, dtype='<i2')
+        memoryview(grown).cast('B')[:self._nbytes] = self._bytes()[:self._nbytes]
+        self._data = grown
+
+    def _extend_ring(self, raw: memoryview) -> None:
+        if len(raw) % self.frame_size:
+            raise ValueError("Ring buffers only accept whole frames")
+        capacity_bytes = self._data.nbytes
+        if len(raw) >= capacity_bytes:
+            self._bytes()[:] = raw[len(raw) - capacity_bytes:]
+            self._start, self._nbytes = 0, capacity_bytes
+            return
+
+        storage = self._bytes()
+        write_at = (self._start * self.frame_size + self._nbytes) % capacity_bytes
+        first = min(len(raw), capacity_bytes - write_at)
+        storage[write_at:write_at + first] = raw[:first]
+        storage[:len(raw) - first] = raw[first:]
+        overflow = max(0, self._nbytes + len(raw) - capacity_bytes)
+        self._nbytes = min(capacity_bytes, self._nbytes + len(raw))
+        self._start = (self._start + overflow // self.frame_size) % self.capacity
@@ -0,0 +1,60 @@
+import wave
+import numpy as np
+from typing import Optional, Tuple, Union
+
+WHISPER_SAMPLE_RATE = 16000
+
+def pcm16_to_float32(audio: Union[bytes, np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert little-endian 16-bit PCM to float32 samples in [-1.0, 1.0).
+
+    Converts and scales in one pass; ``out`` lets callers reuse a float32 array.
+    """
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        audio = np.frombuffer(audio, dtype='<i2')
+    if out is not None and out.shape != audio.shape:
+        out = out[:len(audio)]
+    return np.multiply(audio, np.float32(1 / 32768.0), out=out, dtype=np.float32)
+
+def to_mono(audio: np.ndarray) -> np.ndarray:
+    if audio.ndim == 1:
+        return audio
+    return audio.mean(axis=1, dtype=np.float32)
+
+def _lowpass_kernel(cutoff: float, taps: int = 63) -> np.ndarray:
+    # Windowed-sinc FIR; cutoff is a fraction of the source sample rate.
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """Vectorized resampling: anti-alias FIR followed by linear interpolation."""
+    if source_rate == target_rate or audio.size == 0:
+        return audio.astype(np.float32, copy=False)
+
+    if target_rate < source_rate:
+        audio = np.convolve(audio, _lowpass_kernel(0.45 * target_rate / source_rate), mode='same')
+
+    target_length = int(round(audio.size * target_rate / source_rate))
+    positions = np.arange(target_length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(audio.size), audio).astype(np.float32)
+
+def prepare_for_whisper(audio: Union[bytes, np.ndarray], sample_rate: int) -> np.ndarray:
+    """Turn raw recorder output into the mono float32 16 kHz array Whisper expects."""
+    if isinstance(audio, (bytes, bytearray, memoryview)) or audio.dtype == np.int16:
+        audio = pcm16_to_float32(audio)
+    audio = to_mono(np.asarray(audio, dtype=np.float32))
+    return resample(audio, sample_rate, WHISPER_SAMPLE_RATE)
+
+def load_wav(file_path: str) -> Tuple[np.ndarray, int]:
+    """Read a 16-bit PCM WAV into an int16 array (frames x channels for multichannel files)."""
+    with wave.open(file_path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"Only 16-bit PCM WAV files are supported: {file_path}")
+        channels = wf.getnchannels()
+        sample_rate = wf.getframerate()
+        frames = wf.readframes(wf.getnframes())
+
+    samples = np.frombuffer(frames, dtype='<i2')
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples, sample_rate
@@ -0,0 +1,189 @@
+"""Headless batch transcription of WAV archives.
+
+    python batch_transcribe.py recordings/ -o results.jsonl --workers 4
+    python batch_transcribe.py "archive/**/*.wav" -o results.jsonl --transcript session
+
+Results are appended to the JSONL file as each file finishes; re-running with
+the same output skips files that already have a result.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Set
+
+from audio_utils import load_wav
+from config import INFERENCE_PROFILES, WhisperConfig
+
+_worker_transcriber = None
+
+def worker_threads(workers: Optional[int]) -> int:
+    """Torch threads per pool worker, so the pool as a whole does not oversubscribe the cores."""
+    cpus = os.cpu_count() or 1
+    return max(1, cpus // (workers or cpus))
+
+def _init_worker(whisper_config: Dict[str, Any], threads: Optional[int] = None) -> None:
+    # Imported here so the parent process never loads the model itself.
+    from app import WhisperTranscriber
+    from inference import limit_threads
+
+    global _worker_transcriber
+    # Files (and long-audio chunks) are unrelated, so one must not pin the language for the rest.
+    _worker_transcriber = WhisperTranscriber(WhisperConfig(**{**whisper_config, "pin_language": False}))
+    _worker_transcriber.model_ready.result()
+    if threads is not None:
+        # After the load, so it overrides thread counts the inference profile applied.
+        limit_threads(threads)
+
+def _transcribe_file(file_path: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        samples, sample_rate = load_wav(file_path)
+        duration = len(samples) / sample_rate
+        text = _worker_transcriber.transcribe(samples, sample_rate=sample_rate)
+    except Exception as e:
+        return {"path": file_path, "error": str(e)}
+
+    elapsed = time.perf_counter() - start
+    return {
+        "path": file_path,
+        "text": text,
+        "duration": round(duration, 3),
+        "processing_seconds": round(elapsed, 3),
+        "rtf": round(elapsed / duration, 4) if duration else None,
+        "worker_pid": os.getpid()
+    }
+
+def collect_inputs(inputs: List[str]) -> List[str]:
+    files = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.wav")
+        files.extend(glob.glob(pattern, recursive=True))
+    return sorted(set(os.path.abspath(f) for f in files))
+
+def load_checkpoint(output_path: str) -> Dict[str, Dict[str, Any]]:
+    """Return finished results from a previous run of the same output file."""
+    done = {}
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if "text" in result:
+                done[result["path"]] = result
+    return done
+
+def repair_checkpoint(output_path: str) -> None:
+    """End the checkpoint on a newline so appended results start on a line of their own.
+
+    A last line cut short by an interrupted run is dropped; a complete one is kept.
+    """
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        if not data or data.endswith(b"\n"):
+            return
+        start = data.rfind(b"\n") + 1
+        try:
+            json.loads(data[start:])
+        except ValueError:
+            f.truncate(start)
+        else:
+            f.write(b"\n")
+
+def run_batch(files: List[str], output_path: str, whisper_config: WhisperConfig,
+              workers: Optional[int] = None, log=print) -> Dict[str, Any]:
+    done = load_checkpoint(output_path)
+    todo = [f for f in files if f not in done]
+    if done:
+        log(f"Resuming: {len(files) - len(todo)} of {len(files)} files already transcribed")
+
+    repair_checkpoint(output_path)
+    results = dict(done)
+    failures = 0
+    started = time.perf_counter()
+    with open(output_path, "a") as out, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(asdict(whisper_config), worker_threads(workers))
+    ) as pool:
+        futures = [pool.submit(_transcribe_file, f) for f in todo]
+        for future in as_completed(futures):
+            result = future.result()
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            if "error" in result:
+                failures += 1
+                log(f"FAILED {result['path']}: {result['error']}")
+                continue
+            results[result["path"]] = result
+            log(f"{result['path']}: {result['duration']:.1f}s audio, RTF {result['rtf']}")
+    wall_seconds = time.perf_counter() - started
+
+    new_results = [results[f] for f in todo if f in results]
+    audio_seconds = sum(r["duration"] for r in new_results)
+    processing_seconds = sum(r["processing_seconds"] for r in new_results)
+    summary = {
+        "files": len(files),
+        "transcribed": len(new_results),
+        "skipped": len(files) - len(todo),
+        "failed": failures,
+        "audio_seconds": round(audio_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "rtf": round(processing_seconds / audio_seconds, 4) if audio_seconds else None,
+        "wall_rtf": round(wall_seconds / audio_seconds, 4) if audio_seconds else None,
+        "results": [results[f] for f in files if f in results]
+    }
+    log(f"Transcribed {summary['transcribed']} files ({audio_seconds:.1f}s audio) in {wall_seconds:.1f}s: "
+        f"per-file RTF {summary['rtf']}, aggregate RTF {summary['wall_rtf']}")
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Transcribe a folder or glob of WAV files.")
+    parser.add_argument("inputs", nargs="+", help="Folders or glob patterns of WAV files")
+    parser.add_argument("-o", "--output", default="transcriptions.jsonl", help="JSONL results/checkpoint file")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--model", default=WhisperConfig.model_size)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--inference-profile", choices=sorted(INFERENCE_PROFILES), default=None,
+                        help="Speed/accuracy trade-off (default: $TAIK_INFERENCE_PROFILE or balanced)")
+    parser.add_argument("--transcript", default=None, metavar="PREFIX",
+                        help="Also save a plain-text transcript with this file prefix")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("No WAV files found.", file=sys.stderr)
+        return 1
+
+    whisper_config = WhisperConfig(
+        model_size=args.model,
+        language=args.language,
+        device=args.device,
+        warmup=False
+    )
+    if args.inference_profile:
+        whisper_config.profile = args.inference_profile
+    summary = run_batch(files, args.output, whisper_config, workers=args.workers)
+
+    if args.transcript and summary["results"]:
+        from app import TranscriptionManager
+
+        manager = TranscriptionManager(file_prefix=args.transcript)
+        for result in summary["results"]:
+            manager.add_transcription(result["text"])
+        print(f"Transcript saved to {manager.save_transcriptions()}")
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
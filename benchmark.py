@@ -0,0 +1,256 @@
+"""End-to-end pipeline benchmark: record -> save -> load -> transcribe -> persist.
+
+Runs headless: capture goes through an in-process stand-in for the PowerShell host
+that replays synthetic PCM, so no Windows side or microphone is needed.
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app import TranscriptionManager, WSLAudioRecorder, WhisperTranscriber
+from audio_buffer import AudioBuffer
+from config import INFERENCE_PROFILES, AudioConfig, WhisperConfig
+from model_registry import ModelRegistry
+from session_log import SessionLog
+
+STAGES = ("record", "save", "load", "transcribe", "persist")
+KINDS = ("silence", "tone", "noise", "speech")
+
+def synthesize(kind: str, seconds: float, sample_rate: int = 44100, channels: int = 1,
+               seed: int = 0) -> np.ndarray:
+    """Generate int16 test audio of the given kind, shaped (frames,) or (frames, channels)."""
+    frames = int(seconds * sample_rate)
+    t = np.arange(frames) / sample_rate
+    rng = np.random.default_rng(seed)
+    if kind == "silence":
+        signal = np.zeros(frames)
+    elif kind == "tone":
+        signal = 0.5 * np.sin(2 * np.pi * 440 * t)
+    elif kind == "noise":
+        signal = 0.3 * rng.standard_normal(frames)
+    elif kind == "speech":
+        # Harmonic "syllables" at ~4 Hz with short pauses, over a faint noise floor.
+        voiced = sum(np.sin(2 * np.pi * 140 * h * t) / h for h in range(1, 6))
+        envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.5 * t) > -0.5)
+        signal = 0.3 * voiced * envelope + 0.005 * rng.standard_normal(frames)
+    else:
+        raise ValueError(f"Unknown audio kind: {kind}")
+
+    samples = np.clip(signal * 32767, -32768, 32767).astype(np.int16)
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return samples
+
+class SyntheticCaptureHost:
+    """Answers 'record' like the PowerShell host, streaming preset PCM as chunk events."""
+
+    def __init__(self, pcm: bytes, chunk_bytes: int = 8820):
+        self.pcm = pcm
+        self.chunk_bytes = chunk_bytes
+
+    def request(self, op: str, timeout: Optional[float] = None, on_event: Optional[Callable] = None,
+                **params: Any) -> Any:
+        if op != "record":
+            raise ValueError(f"Unsupported operation: {op}")
+        for start in range(0, len(self.pcm), self.chunk_bytes):
+            if on_event is not None:
+                on_event("chunk", base64.b64encode(self.pcm[start:start + self.chunk_bytes]).decode("ascii"))
+        return {"bytes": len(self.pcm)}
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    values = np.asarray(samples) * 1000
+    return {
+        "runs": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3)
+    }
+
+def create_transcriber(model: str, device: Optional[str] = None, profile: Optional[str] = None) -> WhisperTranscriber:
+    """A transcriber for ``model``; "mock" uses the test model instead of whisper."""
+    if model == "mock":
+        registry = ModelRegistry(loader=lambda size, device: WhisperTranscriber._create_mock_model())
+    else:
+        registry = ModelRegistry()
+    config = WhisperConfig(model_size=model, device=device)
+    if profile:
+        config.profile = profile
+    transcriber = WhisperTranscriber(config, registry=registry)
+    transcriber.model_ready.result()
+    return transcriber
+
+@contextmanager
+def _timed(timings: Dict[str, List[float]], stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    timings[stage].append(time.perf_counter() - start)
+
+def run_case(kind: str, seconds: float, transcriber: WhisperTranscriber, workdir: str,
+             iterations: int = 5, audio_config: Optional[AudioConfig] = None) -> Dict[str, Dict[str, float]]:
+    audio_config = audio_config or AudioConfig()
+    pcm = synthesize(kind, seconds, audio_config.samplerate, audio_config.channels).tobytes()
+    recorder = WSLAudioRecorder(audio_config, host=SyntheticCaptureHost(pcm))
+    wav_path = os.path.join(workdir, f"{kind}-{seconds:g}s.wav")
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    for i in range(iterations):
+        with _timed(timings, "record"):
+            recorder.record_audio(duration=seconds)
+        with _timed(timings, "save"):
+            recorder.save_to_wav(wav_path)
+        with _timed(timings, "load"):
+            recording = AudioBuffer.from_wav(wav_path)
+        with _timed(timings, "transcribe"):
+            text = transcriber.transcribe(recording)
+        session_log = SessionLog(workdir, session_id=f"{kind}-{seconds:g}s-{i}")
+        manager = TranscriptionManager(file_prefix=os.path.join(workdir, "session"), session_log=session_log)
+        with _timed(timings, "persist"):
+            manager.add_transcription(text or "(silence)", duration=seconds, model=transcriber.config.model_size)
+            manager.save_transcriptions()
+            session_log.close()
+
+    return {stage: summarize(values) for stage, values in timings.items()}
+
+def run_benchmark(kinds: Sequence[str] = KINDS, seconds: Sequence[float] = (1.0, 5.0), iterations: int = 5,
+                  model: str = "mock", device: Optional[str] = None,
+                  log: Callable[[str], None] = print) -> Dict[str, Any]:
+    load_start = time.perf_counter()
+    transcriber = create_transcriber(model, device)
+    load_seconds = time.perf_counter() - load_start
+
+    cases = {}
+    with tempfile.TemporaryDirectory(prefix="taik-bench-") as workdir:
+        for kind in kinds:
+            for length in seconds:
+                name = f"{kind}-{length:g}s"
+                cases[name] = run_case(kind, length, transcriber, workdir, iterations)
+                log(f"{name}: " + ", ".join(f"{stage} p50 {stats['p50_ms']:.1f} ms"
+                                            for stage, stats in cases[name].items()))
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "model": model,
+        "model_load_ms": round(load_seconds * 1000, 3),
+        "iterations": iterations,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count()
+        },
+        "cases": cases
+    }
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+def compare_profiles(profiles: Sequence[str], kinds: Sequence[str] = ("speech",), seconds: Sequence[float] = (5.0,),
+                     iterations: int = 3, model: str = "mock", device: Optional[str] = None,
+                     log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """Transcription latency of each inference profile, and its WER against the first profile's output."""
+    clips = {f"{kind}-{length:g}s": synthesize(kind, length) for kind in kinds for length in seconds}
+    sample_rate = AudioConfig().samplerate
+    report: Dict[str, Dict[str, Any]] = {}
+    reference: Dict[str, str] = {}
+    for name in profiles:
+        transcriber = create_transcriber(model, device, profile=name)
+        timings, errors = [], []
+        for clip, samples in clips.items():
+            for _ in range(iterations):
+                start = time.perf_counter()
+                text = transcriber.transcribe(samples, sample_rate=sample_rate)
+                timings.append(time.perf_counter() - start)
+            reference.setdefault(clip, text)
+            errors.append(word_error_rate(reference[clip], text))
+        report[name] = {**summarize(timings), "wer_vs_reference": round(float(np.mean(errors)), 4)}
+        log(f"{name}: transcribe p50 {report[name]['p50_ms']:.1f} ms, "
+            f"WER vs {profiles[0]} {report[name]['wer_vs_reference']:.1%}")
+    return report
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10,
+            min_delta_ms: float = 1.0) -> List[Dict[str, Any]]:
+    """Per case/stage p50 and p95 change against ``baseline``.
+
+    A row is a regression when p50 grew by more than ``tolerance`` and by at least
+    ``min_delta_ms``, so sub-millisecond jitter on fast stages is not flagged.
+    """
+    rows = []
+    for case, stages in results["cases"].items():
+        for stage, stats in stages.items():
+            base = baseline.get("cases", {}).get(case, {}).get(stage)
+            if base is None:
+                continue
+            change = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] if base["p50_ms"] else 0.0
+            rows.append({
+                "case": case,
+                "stage": stage,
+                "baseline_p50_ms": base["p50_ms"],
+                "p50_ms": stats["p50_ms"],
+                "baseline_p95_ms": base["p95_ms"],
+                "p95_ms": stats["p95_ms"],
+                "change": round(change, 4),
+                "regression": change > tolerance and stats["p50_ms"] - base["p50_ms"] >= min_delta_ms
+            })
+    return rows
+
+def format_comparison(rows: Sequence[Dict[str, Any]]) -> str:
+    lines = [f"{'case':<16} {'stage':<11} {'base p50':>10} {'p50':>10} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(f"{row['case']:<16} {row['stage']:<11} {row['baseline_p50_ms']:>10.2f} "
+                     f"{row['p50_ms']:>10.2f} {row['change']:>+8.1%}{flag}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the record/transcribe pipeline on synthetic audio.")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--seconds", nargs="+", type=float, default=[1.0, 5.0], help="Clip lengths")
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    parser.add_argument("--model", default="mock", help="'mock' or a whisper model size such as 'tiny'")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--profiles", nargs="+", choices=sorted(INFERENCE_PROFILES), default=None,
+                        help="Also compare these inference profiles; the first is the accuracy reference")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="Compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed p50 slowdown (fraction)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore p50 slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.kinds, args.seconds, args.iterations, args.model, args.device)
+    if args.profiles:
+        results["profiles"] = compare_profiles(args.profiles, args.kinds, args.seconds, args.iterations,
+                                               args.model, args.device)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        results["comparison"] = rows
+        regressions = [row for row in rows if row["regression"]]
+        print(format_comparison(rows))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""Audio capture backends.
+
+Every backend records into an ``AudioBuffer`` and hands whole frames of raw PCM
+to an optional ``on_chunk`` callback as they arrive, so recording, streaming
+transcription and the benchmark work the same whichever backend captured it.
+"""
+import base64
+import logging
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Type
+
+import numpy as np
+
+from audio_buffer import AudioBuffer
+from config import AudioConfig
+from metrics import get_metrics
+from powershell_host import PowerShellHost, get_powershell_host
+
+ChunkCallback = Callable[[bytes], None]
+
+CAPTURE_BACKENDS: Dict[str, Type["AudioProcessor"]] = {}
+
+def register_backend(name: str) -> Callable[[Type["AudioProcessor"]], Type["AudioProcessor"]]:
+    def register(cls: Type["AudioProcessor"]) -> Type["AudioProcessor"]:
+        cls.name = name
+        CAPTURE_BACKENDS[name] = cls
+        return cls
+    return register
+
+def get_capture_backend(name: str) -> Type["AudioProcessor"]:
+    try:
+        return CAPTURE_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown capture backend '{name}'; choose from {', '.join(sorted(CAPTURE_BACKENDS))}") from None
+
+def create_recorder(config: AudioConfig, backend: Optional[str] = None, **kwargs) -> "AudioProcessor":
+    """Instantiate ``backend`` (default: ``config.backend``) for ``config``."""
+    return get_capture_backend(backend or config.backend)(config, **kwargs)
+
+class AudioProcessor(ABC):
+    """A capture backend: ``record_audio`` fills ``buffer``, passing frames to ``on_chunk`` as they arrive."""
+
+    name = ''
+
+    def __init__(self, config: AudioConfig):
+        self.config = config
+        self.buffer: Optional[AudioBuffer] = None
+        self.logger = logging.getLogger('SpeechToText')
+
+    @classmethod
+    def available(cls, config: AudioConfig) -> bool:
+        """Whether this backend can record on this machine."""
+        return True
+
+    @abstractmethod
+    def record_audio(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> None:
+        pass
+
+    @property
+    def audio_data(self) -> Optional[memoryview]:
+        """The last recording as raw PCM bytes, viewed without copying."""
+        return self.buffer.memoryview() if self.buffer is not None else None
+
+    def save_to_wav(self, file_path: str) -> None:
+        if self.buffer is None:
+            raise ValueError("No audio data recorded")
+        self.buffer.write_wav(file_path)
+
+    def get_samples(self) -> np.ndarray:
+        """Return the recording as an int16 array without touching disk."""
+        if self.buffer is None:
+            raise ValueError("No audio data recorded")
+        return self.buffer.samples
+
+    def _new_buffer(self, duration: float) -> AudioBuffer:
+        # Sized for the whole recording plus slack, so capture never reallocates.
+        frames = int((duration + 0.5) * self.config.samplerate)
+        return AudioBuffer(frames, self.config.samplerate, self.config.channels)
+
+    def _read_pcm_stream(self, stream, on_chunk: Optional[ChunkCallback] = None,
+                         buffer: Optional[AudioBuffer] = None, max_bytes: Optional[int] = None) -> AudioBuffer:
+        """Read PCM from a capture process straight into the buffer, handing out whole frames only."""
+        buffer = buffer or AudioBuffer(self.config.samplerate, self.config.samplerate, self.config.channels)
+        delivered = 0
+        remaining = max_bytes
+
+        while remaining is None or remaining > 0:
+            size = self.config.stream_chunk_size if remaining is None else min(self.config.stream_chunk_size, remaining)
+            read = buffer.readinto(stream, size)
+            if not read:
+                break
+            if remaining is not None:
+                remaining -= read
+            if on_chunk is not None and len(buffer) > delivered:
+                on_chunk(bytes(buffer.memoryview(delivered)))
+                delivered = len(buffer)
+        return buffer
+
+    def _run_capture_process(self, command: list, duration: float, on_chunk: Optional[ChunkCallback] = None) -> AudioBuffer:
+        """Read ``duration`` seconds of PCM from a capture command's stdout, then stop it."""
+        frames = int(duration * self.config.samplerate)
+        # stderr goes to a file: nobody reads a pipe while capturing, and a chatty tool would block on it.
+        with tempfile.TemporaryFile() as errors:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors)
+            try:
+                buffer = self._read_pcm_stream(process.stdout, on_chunk, self._new_buffer(duration),
+                                               max_bytes=frames * self.config.channels * self.config.sample_width)
+            finally:
+                if process.poll() is None:
+                    process.terminate()
+                process.stdout.close()
+                returncode = process.wait()
+
+            # A full recording is a success however the tool exits once it is stopped.
+            if len(buffer) >= frames or (returncode in (0, -signal.SIGTERM) and len(buffer)):
+                return buffer
+            errors.seek(0)
+            stderr = errors.read().decode(errors='replace').strip()
+        raise RuntimeError(f"Audio capture failed: {stderr or f'exit code {returncode}'}")
+
+@register_backend('wsl')
+class WSLAudioRecorder(AudioProcessor):
+    """Windows-side capture through PowerShell and NAudio."""
+
+    def __init__(self, config: AudioConfig, host: Optional[PowerShellHost] = None):
+        super().__init__(config)
+        self.host = host
+
+    @classmethod
+    def available(cls, config: AudioConfig) -> bool:
+        return shutil.which('powershell.exe') is not None
+
+    def record_audio(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> None:
+        with get_metrics().span("capture", backend=self.name, mode=self.config.capture_mode):
+            if self.config.capture_mode == 'host':
+                self.buffer = self._capture_host(duration, on_chunk)
+            elif self.config.capture_mode == 'stream':
+                self.buffer = self._capture_stream(duration, on_chunk)
+            else:
+                self.buffer = self._capture_file(duration)
+
+    def _capture_host(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> AudioBuffer:
+        host = self.host or get_powershell_host()
+        buffer = self._new_buffer(duration)
+
+        def handle_event(event: str, data: str) -> None:
+            if event == 'chunk':
+                chunk = base64.b64decode(data)
+                buffer.extend(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+
+        host.request(
+            'record',
+            timeout=duration + 30,
+            on_event=handle_event,
+            duration=duration,
+            device=0,
+            samplerate=self.config.samplerate,
+            bits=self.config.sample_width * 8,
+            channels=self.config.channels
+        )
+        return buffer
+
+    def _capture_stream(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> AudioBuffer:
+        process = subprocess.Popen(
+            shlex.split(self._build_powershell_command(duration, stream=True)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        try:
+            audio_data = self._read_pcm_stream(process.stdout, on_chunk, self._new_buffer(duration))
+            stderr = process.stderr.read()
+        finally:
+            process.stdout.close()
+            process.stderr.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            raise RuntimeError(f"Audio capture failed: {stderr.decode(errors='replace').strip()}")
+        return audio_data
+
+    def _capture_file(self, duration: int) -> AudioBuffer:
+        subprocess.run(shlex.split(self._build_powershell_command(duration)), check=True)
+        with get_metrics().span("transfer"):
+            # Read rather than map: the next recording overwrites this file on the Windows side.
+            return AudioBuffer.from_wav(self._windows_to_wsl_path(self.config.windows_audio_path), mmap=False)
+
+    @staticmethod
+    def _windows_to_wsl_path(path: str) -> str:
+        drive, _, rest = path.partition(':')
+        rest = rest.replace('\\', '/')
+        return f"/mnt/{drive.lower()}{rest}"
+
+    def _build_powershell_command(self, duration: int, stream: bool = False) -> str:
+        if stream:
+            sink = '$stdout = [Console]::OpenStandardOutput(); '
+            write = '$stdout.Write($e.Buffer, 0, $e.BytesRecorded); $stdout.Flush() }; '
+            close = '$stdout.Flush(); '
+        else:
+            sink = (
+                '$waveFile = New-Object NAudio.Wave.WaveFileWriter('
+                f'\'{self.config.windows_audio_path}\', $waveIn.WaveFormat); '
+            )
+            write = '$waveFile.Write($e.Buffer, 0, $e.BytesRecorded) }; '
+            close = '$waveFile.Dispose(); '
+
+        return (
+            'powershell.exe -Command "'
+            'Add-Type -Path \\"C:\\Program Files\\NAudio\\NAudio.dll\\"; '
+            '$waveIn = New-Object NAudio.Wave.WaveInEvent; '
+            '$waveIn.DeviceNumber = 0; '
+            '$waveIn.WaveFormat = New-Object NAudio.Wave.WaveFormat('
+            f'{self.config.samplerate}, {self.config.sample_width * 8}, {self.config.channels}); '
+            f'{sink}'
+            '$waveIn.DataAvailable = { param($sender, $e) '
+            f'{write}'
+            '$waveIn.StartRecording(); '
+            f'Start-Sleep -Seconds {duration}; '
+            '$waveIn.StopRecording(); '
+            f'{close}'
+            '$waveIn.Dispose()'
+            '"'
+        )
+
+@register_backend('pulse')
+class PulseAudioRecorder(AudioProcessor):
+    """Native capture from PulseAudio with ``parec``; under WSLg this needs no Windows process."""
+
+    @classmethod
+    def available(cls, config: AudioConfig) -> bool:
+        return shutil.which('parec') is not None
+
+    def record_audio(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> None:
+        with get_metrics().span("capture", backend=self.name, mode='stream'):
+            self.buffer = self._run_capture_process(self.build_command(), duration, on_chunk)
+
+    def build_command(self) -> list:
+        command = ['parec', '--raw', '--format=s16le', f'--rate={self.config.samplerate}',
+                   f'--channels={self.config.channels}', '--latency-msec=20']
+        if self.config.device:
+            command.append(f'--device={self.config.device}')
+        return command
+
+@register_backend('alsa')
+class AlsaAudioRecorder(AudioProcessor):
+    """Native capture from ALSA with ``arecord``."""
+
+    @classmethod
+    def available(cls, config: AudioConfig) -> bool:
+        return shutil.which('arecord') is not None
+
+    def record_audio(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> None:
+        with get_metrics().span("capture", backend=self.name, mode='stream'):
+            self.buffer = self._run_capture_process(self.build_command(), duration, on_chunk)
+
+    def build_command(self) -> list:
+        command = ['arecord', '-q', '-t', 'raw', '-f', 'S16_LE', '-r', str(self.config.samplerate),
+                   '-c', str(self.config.channels)]
+        if self.config.device:
+            command.extend(['-D', self.config.device])
+        return command
+
+@register_backend('replay')
+class ReplayRecorder(AudioProcessor):
+    """Replays a WAV file, or raw PCM from stdin when the path is '-', for load tests and CI.
+
+    A WAV file shorter than the recording is looped. With ``replay_realtime`` chunks
+    are paced like a live device; otherwise they are delivered as fast as possible.
+    """
+
+    def __init__(self, config: AudioConfig, stream=None):
+        super().__init__(config)
+        self.stream = stream
+        self._source: Optional[AudioBuffer] = None
+        self._position = 0
+
+    @classmethod
+    def available(cls, config: AudioConfig) -> bool:
+        return bool(config.replay_path)
+
+    def record_audio(self, duration: int, on_chunk: Optional[ChunkCallback] = None) -> None:
+        with get_metrics().span("capture", backend=self.name, mode='replay'):
+            if self.config.replay_path == '-' or self.stream is not None:
+                self.buffer = self._replay_stream(duration, on_chunk)
+            else:
+                self.buffer = self._replay_file(duration, on_chunk)
+
+    def _replay_stream(self, duration: float, on_chunk: Optional[ChunkCallback]) -> AudioBuffer:
+        stream = self.stream or sys.stdin.buffer
+        frame_size = self.config.channels * self.config.sample_width
+        return self._read_pcm_stream(stream, self._paced(on_chunk), self._new_buffer(duration),
+                                     max_bytes=int(duration * self.config.samplerate) * frame_size)
+
+    def _replay_file(self, duration: float, on_chunk: Optional[ChunkCallback]) -> AudioBuffer:
+        source = self._load_source()
+        buffer = self._new_buffer(duration)
+        remaining = int(duration * self.config.samplerate)
+        chunk_frames = max(1, self.config.stream_chunk_size // source.frame_size)
+        deliver = self._paced(on_chunk)
+        # Continue where the previous recording stopped, so repeated recordings walk through the file.
+        while remaining > 0 and len(source):
+            frames = min(chunk_frames, remaining, len(source) - self._position)
+            chunk = source.memoryview(self._position, self._position + frames)
+            buffer.extend(chunk)
+            if deliver is not None:
+                deliver(bytes(chunk))
+            self._position = (self._position + frames) % len(source)
+            remaining -= frames
+        return buffer
+
+    def _load_source(self) -> AudioBuffer:
+        if self._source is None:
+            source = AudioBuffer.from_wav(self.config.replay_path)
+            if (source.sample_rate, source.channels) != (self.config.samplerate, self.config.channels):
+                raise ValueError(
+                    f"{self.config.replay_path} is {source.sample_rate} Hz x{source.channels}, but capture is "
+                    f"configured for {self.config.samplerate} Hz x{self.config.channels}"
+                )
+            self._source = source
+        return self._source
+
+    def _paced(self, on_chunk: Optional[ChunkCallback]) -> Optional[ChunkCallback]:
+        if not self.config.replay_realtime:
+            return on_chunk
+        frame_size = self.config.channels * self.config.sample_width
+        start = time.perf_counter()
+        delivered = 0
+
+        def deliver(chunk: bytes) -> None:
+            nonlocal delivered
+            delivered += len(chunk) // frame_size
+            delay = start + delivered / self.config.samplerate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if on_chunk is not None:
+                on_chunk(chunk)
+        return deliver
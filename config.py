@@ -1,11 +1,30 @@
 import os
 import sys
+import json
+import time
+import hashlib
 import platform
+import threading
 import subprocess
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from importlib import metadata
+from importlib.util import find_spec
 from typing import Dict, List, Optional
 import logging
+from powershell_host import PowerShellHost, get_powershell_host
+
+SETUP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'setup_audio.ps1')
+# Where setup_audio.ps1 installs NAudio, as seen from WSL.
+NAUDIO_DLL_PATH = '/mnt/c/Program Files/NAudio/NAudio.dll'
+# Bump when the sentinel format or the meaning of a completed setup changes.
+AUDIO_SETUP_VERSION = 1
+
+_audio_setup_lock = threading.Lock()
+
+def _default_cache_dir() -> str:
+    return os.path.join(os.environ.get('XDG_CACHE_HOME', str(Path.home() / '.cache')), 'taik')
 
 @dataclass
 class AudioConfig:
@@ -15,44 +34,156 @@ class AudioConfig:
     duration: int = 5
     windows_audio_path: str = ''
     wsl_path: str = '/tmp/recording.wav'
+    # 'wsl' (PowerShell/NAudio), 'pulse' (parec, e.g. under WSLg), 'alsa' (arecord) or 'replay'; see capture.py.
+    backend: str = field(default_factory=lambda: os.environ.get('TAIK_CAPTURE_BACKEND', 'wsl'))
+    capture_mode: str = 'host'  # wsl backend: 'host' uses the persistent PowerShell host, 'stream' pipes PCM over stdout, 'file' writes a WAV on the Windows side
+    device: str = ''  # pulse/alsa source name; empty for the default source
+    replay_path: str = ''  # replay backend: WAV file, or '-' for raw PCM on stdin
+    replay_realtime: bool = False
+    stream_chunk_size: int = 4096
+    vad_enabled: bool = True
+    vad_frame_ms: int = 30
+    vad_energy_threshold_db: float = -45.0
+    vad_zcr_threshold: float = 0.25
+    vad_unvoiced_reach_ms: int = 150
+    vad_min_speech_ms: int = 90
+    vad_padding_ms: int = 200
+    stream_window_seconds: float = 6.0
+    stream_step_ms: int = 500
 
     def __post_init__(self):
         if not self.windows_audio_path:
             # Use Public folder for reliability
             self.windows_audio_path = 'C:\\Users\\Public\\wsl_recording.wav'
-        
-        # Ensure NAudio is installed
-        setup_script = os.path.join(os.path.dirname(__file__), 'setup_audio.ps1')
-        with open(setup_script, 'w') as f:
-            f.write(setup_script_content)  # This would be the content from setup_audio.ps1
-        
+
+def ensure_audio_setup(host: Optional[PowerShellHost] = None, sentinel_file: Optional[str] = None,
+                       naudio_path: str = NAUDIO_DLL_PATH, force: bool = False) -> bool:
+    """Install NAudio through setup_audio.ps1 unless a matching setup already completed.
+
+    Completion is recorded in a versioned sentinel holding the script hash; it is
+    only trusted while NAudio.dll is still present. Returns True if the script ran.
+    """
+    sentinel_file = sentinel_file or os.path.join(_default_cache_dir(), 'audio_setup.json')
+    with open(SETUP_SCRIPT) as f:
+        script = f.read()
+    expected = {
+        'version': AUDIO_SETUP_VERSION,
+        'script_sha256': hashlib.sha256(script.encode()).hexdigest(),
+        'naudio_present': True
+    }
+
+    with _audio_setup_lock:
+        if not force and os.path.exists(naudio_path):
+            try:
+                with open(sentinel_file) as f:
+                    if json.load(f) == expected:
+                        return False
+            except (OSError, ValueError):
+                pass
+
         try:
-            subprocess.run(['powershell.exe', '-ExecutionPolicy', 'Bypass', '-File', setup_script], 
-                         check=True)
-        except subprocess.CalledProcessError as e:
-            if not os.environ.get('TESTING'):
-                raise RuntimeError("Failed to setup audio capture.") from e
-                
+            result = (host or get_powershell_host()).request('run_script', script=script, timeout=300)
+            if result['exit_code'] != 0:
+                raise RuntimeError(result['output'])
+        except (RuntimeError, TimeoutError) as e:
+            raise RuntimeError("Failed to setup audio capture.") from e
+
+        expected['naudio_present'] = os.path.exists(naudio_path)
+        os.makedirs(os.path.dirname(sentinel_file), exist_ok=True)
+        with open(sentinel_file, 'w') as f:
+            json.dump(expected, f)
+        return True
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    name: str
+    description: str
+    quantize: bool = False  # int8 dynamic quantization of Linear layers (CPU only)
+    fp16: bool = False  # half precision; only ever used on CUDA
+    threads: Optional[int] = None  # torch intra-op threads; None keeps torch's default
+    interop_threads: Optional[int] = None
+    beam_size: Optional[int] = None  # None decodes greedily
+    best_of: Optional[int] = None
+
+INFERENCE_PROFILES = {
+    profile.name: profile for profile in (
+        InferenceProfile(
+            "accurate",
+            "Beam search (5) in full precision: lowest error rate, roughly 3-5x slower than greedy.",
+            fp16=True, beam_size=5, best_of=5
+        ),
+        InferenceProfile(
+            "balanced",
+            "Greedy decoding in full precision: whisper's defaults.",
+            fp16=True
+        ),
+        InferenceProfile(
+            "fast",
+            "Greedy decoding with int8 Linear weights on every core: about 2x faster on CPU, "
+            "at a small increase in error rate.",
+            quantize=True, threads=os.cpu_count(), best_of=1
+        ),
+    )
+}
+
+def get_inference_profile(name: str) -> InferenceProfile:
+    try:
+        return INFERENCE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown inference profile '{name}', expected one of {', '.join(INFERENCE_PROFILES)}")
+
 @dataclass
 class WhisperConfig:
     model_size: str = "base"
     language: Optional[str] = None
     task: str = "transcribe"
     device: Optional[str] = None
+    warmup: bool = True
+    workers: int = 1
+    cache_entries: int = 256
+    disk_cache_mb: int = 64
+    # Chosen per deployment; see INFERENCE_PROFILES.
+    profile: str = field(default_factory=lambda: os.environ.get('TAIK_INFERENCE_PROFILE', 'balanced'))
+    # With language=None, the first detection at least this confident fixes the language for the session.
+    pin_language: bool = True
+    language_confidence: float = 0.8
+    prompt_chars: int = 200  # recent session text passed as the initial prompt; 0 disables
+    # The app releases an unused model after idle_timeout seconds, or once idle while RSS exceeds the budget.
+    idle_timeout: Optional[float] = 900.0
+    memory_budget_mb: Optional[int] = None
 
 @dataclass
 class AppConfig:
     title: str = "WSL2 Speech-to-Text"
     geometry: str = "400x400"
     history_height: int = 15
+    history_max_lines: int = 1000
+    ui_interval_ms: int = 30
     button_height: int = 2
     button_width: int = 20
+    live_transcription: bool = False
+
+@dataclass
+class PreflightConfig:
+    check_timeout: float = 10.0
+    cache_ttl: float = 24 * 60 * 60
+    cache_file: str = field(default_factory=lambda: os.path.join(_default_cache_dir(), 'preflight.json'))
+    fingerprint_packages: List[str] = field(default_factory=lambda: ['numpy', 'openai-whisper', 'torch'])
+
+@dataclass
+class MetricsConfig:
+    trace_file: Optional[str] = None  # JSONL record per timing span
+    prometheus_file: Optional[str] = None  # rewritten every export_interval seconds
+    export_interval: float = 15.0
+    http_port: Optional[int] = None  # serve /metrics on localhost
 
 class SystemConfiguration:
     def __init__(self):
         self.audio = AudioConfig()
         self.whisper = WhisperConfig()
         self.app = AppConfig()
+        self.preflight = PreflightConfig()
+        self.metrics = MetricsConfig()
         self.logger = self._setup_logger()
         self._environment_checks = []
         self._dependency_checks = []
@@ -61,10 +192,13 @@ class SystemConfiguration:
     def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger('SpeechToText')
         logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        # Every SystemConfiguration shares the logger; only the first adds the handler.
+        if not any(getattr(handler, '_taik_handler', False) for handler in logger.handlers):
+            handler = logging.StreamHandler()
+            handler._taik_handler = True
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
         return logger
 
     def _setup_checks(self):
@@ -77,7 +211,7 @@ class SystemConfiguration:
 
         # Dependency checks
         self._dependency_checks.extend([
-            (self._check_powershell, "PowerShell accessibility check"),
+            (self._check_capture_backend, "Audio capture backend check"),
             (self._check_python_packages, "Python package check"),
             (self._check_ffmpeg, "FFmpeg installation check")
         ])
@@ -95,11 +229,15 @@ class SystemConfiguration:
         temp_dir = Path('/tmp')
         return temp_dir.exists() and os.access(temp_dir, os.W_OK)
 
+    def _check_capture_backend(self) -> bool:
+        if self.audio.backend == 'wsl':
+            return self._check_powershell()
+        from capture import get_capture_backend
+        return get_capture_backend(self.audio.backend).available(self.audio)
+
     def _check_powershell(self) -> bool:
         try:
-            subprocess.run(['powershell.exe', '-Command', 'echo test'], 
-                         capture_output=True, check=True)
-            return True
+            return get_powershell_host().request('ping', timeout=self.preflight.check_timeout) == 'pong'
         except:
             return False
 
@@ -107,10 +245,9 @@ class SystemConfiguration:
         required_packages = ['numpy', 'whisper', 'torch']
         missing_packages = []
 
+        # find_spec locates a package without executing it, so torch is not imported here.
         for package in required_packages:
-            try:
-                __import__(package)
-            except ImportError:
+            if find_spec(package) is None:
                 missing_packages.append(package)
 
         if missing_packages:
@@ -120,43 +257,84 @@ class SystemConfiguration:
 
     def _check_ffmpeg(self) -> bool:
         try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True,
+                         timeout=self.preflight.check_timeout)
             return True
         except:
             return False
 
-    def run_preflight_checks(self) -> bool:
-        """Run all preflight checks and return True if all pass."""
+    def environment_fingerprint(self) -> str:
+        """Hash of everything that can change a preflight outcome between launches."""
+        versions = {}
+        for package in self.preflight.fingerprint_packages:
+            try:
+                versions[package] = metadata.version(package)
+            except metadata.PackageNotFoundError:
+                versions[package] = None
+        environment = {
+            'kernel': platform.release(),
+            'python': sys.version,
+            'path': os.environ.get('PATH', ''),
+            'display': bool(os.environ.get('DISPLAY')),
+            'capture_backend': self.audio.backend,
+            'packages': versions
+        }
+        return hashlib.sha256(json.dumps(environment, sort_keys=True).encode()).hexdigest()
+
+    def _load_cached_pass(self, fingerprint: str) -> bool:
+        try:
+            with open(self.preflight.cache_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        age = time.time() - cached.get('passed_at', 0)
+        return cached.get('fingerprint') == fingerprint and 0 <= age < self.preflight.cache_ttl
+
+    def _store_cached_pass(self, fingerprint: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.preflight.cache_file), exist_ok=True)
+            with open(self.preflight.cache_file, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'passed_at': time.time()}, f)
+        except OSError as e:
+            self.logger.warning(f"Could not cache preflight results: {e}")
+
+    def run_preflight_checks(self, use_cache: bool = True) -> bool:
+        """Run all preflight checks concurrently and return True if all pass.
+
+        A pass is cached per environment fingerprint, so warm launches skip the checks.
+        """
         self.logger.info("Starting preflight checks...")
-        
+
+        fingerprint = self.environment_fingerprint()
+        if use_cache and self._load_cached_pass(fingerprint):
+            self.logger.info("Preflight checks passed recently in this environment, skipping.")
+            return True
+
+        checks = self._environment_checks + self._dependency_checks
+        executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix='preflight')
+        futures = [(executor.submit(check), description) for check, description in checks]
+        # Every check starts at once, so one shared deadline is a per-check timeout.
+        deadline = time.monotonic() + self.preflight.check_timeout
+
         all_passed = True
-        
-        self.logger.info("Checking environment...")
-        for check, description in self._environment_checks:
+        for future, description in futures:
             try:
-                if not check():
+                if not future.result(timeout=max(0.0, deadline - time.monotonic())):
                     self.logger.error(f"Failed: {description}")
                     all_passed = False
                 else:
                     self.logger.info(f"Passed: {description}")
-            except Exception as e:
-                self.logger.error(f"Error during {description}: {str(e)}")
+            except FutureTimeoutError:
+                self.logger.error(f"Timed out after {self.preflight.check_timeout}s: {description}")
                 all_passed = False
-
-        self.logger.info("Checking dependencies...")
-        for check, description in self._dependency_checks:
-            try:
-                if not check():
-                    self.logger.error(f"Failed: {description}")
-                    all_passed = False
-                else:
-                    self.logger.info(f"Passed: {description}")
             except Exception as e:
                 self.logger.error(f"Error during {description}: {str(e)}")
                 all_passed = False
+        executor.shutdown(wait=False, cancel_futures=True)
 
         if all_passed:
             self.logger.info("All preflight checks passed!")
+            self._store_cached_pass(fingerprint)
         else:
             self.logger.error("Some preflight checks failed!")
             
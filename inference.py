@@ -0,0 +1,97 @@
+"""Applying an InferenceProfile to whisper models; torch is imported only when needed."""
+import logging
+from importlib.util import find_spec
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from config import InferenceProfile
+from model_registry import load_whisper_model
+
+logger = logging.getLogger('SpeechToText')
+
+def model_device(model: Any) -> str:
+    device = getattr(model, 'device', None)
+    return str(device) if device is not None else 'cpu'
+
+def apply_thread_settings(profile: InferenceProfile) -> None:
+    """Pin torch's intra-/inter-op thread pools to the profile's counts."""
+    if profile.threads is None and profile.interop_threads is None:
+        return
+    if find_spec('torch') is None:
+        return  # nothing to configure for non-torch (mock) models
+    import torch
+
+    if profile.threads is not None:
+        torch.set_num_threads(profile.threads)
+    if profile.interop_threads is not None:
+        try:
+            torch.set_num_interop_threads(profile.interop_threads)
+        except RuntimeError as e:
+            # Only allowed before the first parallel op in the process.
+            logger.warning(f"Could not set torch inter-op threads: {e}")
+
+def limit_threads(threads: int) -> None:
+    """Cap torch's intra-op pool, e.g. to one process's share of the cores in a worker pool."""
+    if find_spec('torch') is None:
+        return
+    import torch
+
+    torch.set_num_threads(max(1, threads))
+
+def quantize_linear_layers(model: Any) -> Any:
+    """Replace the model's Linear layers with int8 dynamically quantized ones, in place."""
+    import torch
+    from torch import nn
+
+    # whisper subclasses nn.Linear only to cast weights in forward(); quantize_dynamic
+    # matches exact types, so present those layers as plain nn.Linear.
+    for module in model.modules():
+        if isinstance(module, nn.Linear) and type(module) is not nn.Linear:
+            module.__class__ = nn.Linear
+    # In place, so loading never holds the fp32 and int8 copies at once.
+    quantized = torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    quantized.eval()
+    return quantized
+
+def prepare_model(model: Any, profile: InferenceProfile) -> Any:
+    """Apply the profile's weight transforms to a freshly loaded model."""
+    if profile.quantize and hasattr(model, 'modules'):
+        if model_device(model).startswith('cuda'):
+            logger.warning(f"Profile '{profile.name}' quantizes for CPU; keeping full precision on CUDA")
+        else:
+            model = quantize_linear_layers(model)
+    return model
+
+def load_profiled_model(model_size: str, device: Optional[str], profile: InferenceProfile) -> Any:
+    return prepare_model(load_whisper_model(model_size, device), profile)
+
+def decode_options(profile: InferenceProfile, device: str = 'cpu') -> Dict[str, Any]:
+    """Keyword arguments for ``model.transcribe`` under ``profile``."""
+    options: Dict[str, Any] = {'fp16': profile.fp16 and device.startswith('cuda')}
+    if profile.beam_size is not None:
+        options['beam_size'] = profile.beam_size
+    if profile.best_of is not None:
+        options['best_of'] = profile.best_of
+    return options
+
+def detect_language(model: Any, audio: np.ndarray) -> Optional[Tuple[str, float]]:
+    """Most likely language of 16 kHz ``audio`` with its probability; None if the model cannot tell."""
+    if not hasattr(model, 'detect_language') or not getattr(model, 'is_multilingual', True):
+        return None
+    if hasattr(model, 'dims'):
+        import whisper
+
+        # Whisper decides from the first 30 s, as transcribe() itself would.
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels).to(model.device)
+        _, probabilities = model.detect_language(mel)
+    else:
+        _, probabilities = model.detect_language(audio)
+    if not probabilities:
+        return None
+    language = max(probabilities, key=probabilities.get)
+    return language, float(probabilities[language])
+
+def model_variant(profile: InferenceProfile) -> Optional[str]:
+    """Registry key suffix for models whose weights the profile changes."""
+    return 'int8' if profile.quantize else None
@@ -0,0 +1,179 @@
+"""Parallel transcription of long recordings.
+
+    python long_audio.py meeting.wav -o meeting.json --workers 8
+
+The recording is split at low-energy points into ~30 s chunks, each chunk is
+transcribed by a worker process holding its own model, and the segments are
+merged back with timestamps relative to the whole recording.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import batch_transcribe
+from audio_buffer import AudioBuffer
+from config import INFERENCE_PROFILES, WhisperConfig
+from streaming import stitch
+
+def find_split_points(samples: np.ndarray, sample_rate: int, chunk_seconds: float = 30.0,
+                      search_seconds: float = 5.0, frame_ms: int = 20) -> List[int]:
+    """Frame indices to cut at: the quietest frame within ``search_seconds`` of every chunk boundary.
+
+    Only the search windows are read, so a memory-mapped recording is never loaded whole.
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    target = int(chunk_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    points: List[int] = []
+    last = 0
+    # Stop once the rest fits in one and a half chunks rather than leave a sliver at the end.
+    while len(samples) - last > target + target // 2:
+        low = max(last + frame, last + target - search)
+        high = min(len(samples), last + target + search)
+        window = samples[low:high]
+        if window.ndim > 1:
+            window = window.mean(axis=1, dtype=np.float32)
+        frames = len(window) // frame
+        energy = np.square(window[:frames * frame], dtype=np.float32).reshape(frames, frame).mean(axis=1)
+        point = low + int(np.argmin(energy)) * frame + frame // 2
+        points.append(point)
+        last = point
+    return points
+
+def chunk_bounds(total_frames: int, split_points: Sequence[int]) -> List[Tuple[int, int]]:
+    edges = [0, *split_points, total_frames]
+    return [(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+
+def merge_segments(chunks: Sequence[Tuple[float, Sequence[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """Join per-chunk segments, given in recording time with the chunk's boundary in seconds.
+
+    A segment starting before its chunk's boundary was decoded from audio the previous
+    chunk also covered, so words it repeats from the merged text so far are dropped.
+    """
+    merged: List[Dict[str, Any]] = []
+    words: List[str] = []
+    for boundary, segments in chunks:
+        for segment in segments:
+            segment_words = segment["text"].split()
+            if segment["start"] < boundary:
+                segment_words = stitch(words, segment_words)
+            if not segment_words:
+                continue
+            merged.append({**segment, "text": " ".join(segment_words)})
+            words.extend(segment_words)
+    return merged
+
+def _transcribe_chunk(source: Union[str, np.ndarray], start: int, end: int, sample_rate: int,
+                      offset: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    if isinstance(source, str):
+        # Each worker maps the file itself; only frame offsets cross the process boundary.
+        audio = AudioBuffer.from_wav(source)[start - offset:end]
+    else:
+        audio = AudioBuffer.wrap(source, sample_rate)
+    first = (start - offset) / sample_rate
+    last = end / sample_rate
+    segments = [
+        {**segment, "start": round(first + segment["start"], 3), "end": round(min(first + segment["end"], last), 3)}
+        for segment in batch_transcribe._worker_transcriber.transcribe_segments(audio)
+    ]
+    return {
+        "segments": segments,
+        "processing_seconds": time.perf_counter() - started,
+        "worker_pid": os.getpid()
+    }
+
+def transcribe_long(audio: Union[str, AudioBuffer], whisper_config: WhisperConfig, workers: Optional[int] = None,
+                    chunk_seconds: float = 30.0, overlap_seconds: float = 1.0, search_seconds: float = 5.0,
+                    log=print) -> Dict[str, Any]:
+    """Transcribe a WAV file or buffer in parallel chunks.
+
+    Each chunk after the first also decodes ``overlap_seconds`` of the audio before
+    its boundary, so a word cut at the boundary is heard whole by one of the two.
+    """
+    recording = AudioBuffer.from_wav(audio) if isinstance(audio, str) else audio
+    sample_rate = recording.sample_rate
+    samples = recording.samples
+    bounds = chunk_bounds(len(samples), find_split_points(samples, sample_rate, chunk_seconds, search_seconds))
+    overlap = int(overlap_seconds * sample_rate)
+
+    started = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, max(1, len(bounds)))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=batch_transcribe._init_worker,
+        initargs=(asdict(whisper_config), batch_transcribe.worker_threads(workers))
+    ) as pool:
+        futures = []
+        for start, end in bounds:
+            lead = min(overlap, start)
+            if isinstance(audio, str):
+                futures.append(pool.submit(_transcribe_chunk, audio, start, end, sample_rate, lead))
+            else:
+                futures.append(pool.submit(_transcribe_chunk, np.ascontiguousarray(samples[start - lead:end]),
+                                           start, end, sample_rate, lead))
+        results = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - started
+
+    segments = merge_segments([(start / sample_rate, result["segments"])
+                               for (start, _), result in zip(bounds, results)])
+    duration = len(samples) / sample_rate
+    processing_seconds = sum(result["processing_seconds"] for result in results)
+    summary = {
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "duration": round(duration, 3),
+        "chunks": [{"start": round(start / sample_rate, 3), "end": round(end / sample_rate, 3)} for start, end in bounds],
+        "workers": workers,
+        "processing_seconds": round(processing_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "wall_rtf": round(wall_seconds / duration, 4) if duration else None,
+        # Average number of chunks in flight; not a speedup, since contention inflates processing time.
+        "parallelism": round(processing_seconds / wall_seconds, 2) if wall_seconds else None
+    }
+    log(f"Transcribed {duration:.1f}s in {len(bounds)} chunks on {workers} workers in {wall_seconds:.1f}s "
+        f"(parallelism {summary['parallelism']}, RTF {summary['wall_rtf']})")
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Transcribe a long WAV recording in parallel chunks.")
+    parser.add_argument("input", help="16-bit PCM WAV file")
+    parser.add_argument("-o", "--output", default=None, help="JSON result file (default: print the text)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-seconds", type=float, default=30.0)
+    parser.add_argument("--overlap-seconds", type=float, default=1.0)
+    parser.add_argument("--model", default=WhisperConfig.model_size)
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--inference-profile", choices=sorted(INFERENCE_PROFILES), default=None,
+                        help="Speed/accuracy trade-off (default: $TAIK_INFERENCE_PROFILE or balanced)")
+    args = parser.parse_args(argv)
+
+    whisper_config = WhisperConfig(model_size=args.model, language=args.language, device=args.device, warmup=False)
+    if args.inference_profile:
+        whisper_config.profile = args.inference_profile
+    try:
+        result = transcribe_long(args.input, whisper_config, workers=args.workers,
+                                 chunk_seconds=args.chunk_seconds, overlap_seconds=args.overlap_seconds,
+                                 log=lambda message: print(message, file=sys.stderr))
+    except (OSError, ValueError, EOFError) as e:
+        print(f"Could not read {args.input}: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"path": os.path.abspath(args.input), **result}, f, indent=2)
+        print(f"Result written to {args.output}", file=sys.stderr)
+    else:
+        print(result["text"])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import ctypes
+import ctypes.util
+import gc
+import logging
+import sys
+import threading
+import time
+from typing import Optional
+
+from metrics import get_metrics
+
+def resident_set_size() -> Optional[int]:
+    """Current RSS of this process in bytes, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _format_mb(size: Optional[int]) -> str:
+    return "unknown" if size is None else f"{size / (1 << 20):.1f} MB"
+
+def release_memory() -> None:
+    """Collect garbage, empty torch's CUDA cache and hand freed heap pages back to the OS."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    # glibc keeps freed arenas mapped; without a trim RSS barely moves after a model is dropped.
+    libc = ctypes.util.find_library("c")
+    if libc and sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL(libc).malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+class MemoryGovernor:
+    """Releases a transcriber's model once it has been idle for ``idle_timeout`` seconds,
+    or after ``min_idle`` seconds while the process is over ``memory_budget_mb``.
+
+    The transcriber reloads the model on its next request. ``min_idle`` keeps the budget
+    from evicting between requests that arrive back to back, e.g. live-mode windows.
+    """
+
+    def __init__(self, transcriber, idle_timeout: Optional[float] = 900.0,
+                 memory_budget_mb: Optional[int] = None, check_interval: float = 30.0,
+                 min_idle: float = 60.0):
+        self.transcriber = transcriber
+        self.idle_timeout = idle_timeout
+        self.memory_budget_mb = memory_budget_mb
+        self.min_idle = min_idle
+        self.check_interval = check_interval
+        self.logger = logging.getLogger('SpeechToText')
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None and (self.idle_timeout or self.memory_budget_mb):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="memory-governor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def check(self) -> Optional[str]:
+        """Release the model if a policy calls for it; returns the reason, or None."""
+        if not self.transcriber.is_loaded or self.transcriber.is_busy:
+            return None
+        rss = resident_set_size()
+        idle = time.monotonic() - self.transcriber.last_used
+        if (self.memory_budget_mb and rss is not None and rss > self.memory_budget_mb << 20
+                and idle >= self.min_idle):
+            reason = "memory"
+        elif self.idle_timeout and idle >= self.idle_timeout:
+            reason = "idle"
+        else:
+            return None
+
+        if not self.transcriber.release_model():
+            return None
+        release_memory()
+        get_metrics().increment("model_evictions_total", reason=reason)
+        self.logger.info(f"Released model {self.transcriber.config.model_size} "
+                         f"({'over the memory budget' if reason == 'memory' else f'idle for {idle:.0f}s'}): "
+                         f"RSS {_format_mb(rss)} -> {_format_mb(resident_set_size())}")
+        return reason
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.warning(f"Memory governor check failed: {e}")
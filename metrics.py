@@ -0,0 +1,221 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; spans range from sub-millisecond persistence to minute-long inference.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, Any]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(labels: LabelSet, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound below which a fraction ``q`` of observations fall."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        total = 0
+        for upper, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            if total >= target:
+                return upper
+        return float("inf")
+
+class Metrics:
+    """Timing spans aggregated into histograms and counters, with an optional JSONL trace."""
+
+    def __init__(self, prefix: str = "taik", buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self.logger = logging.getLogger('SpeechToText')
+        self._histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._lock = threading.Lock()
+        self._trace = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @contextmanager
+    def span(self, stage: str, **labels: Any) -> Iterator[None]:
+        """Time the block as ``stage``; failures are counted and traced with status "error"."""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, status, **labels)
+
+    def record(self, stage: str, seconds: float, status: str = "ok", **labels: Any) -> None:
+        label_set = _labels({"stage": stage, **labels})
+        with self._lock:
+            histogram = self._histograms.get(("stage_duration_seconds", label_set))
+            if histogram is None:
+                histogram = self._histograms[("stage_duration_seconds", label_set)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            key = ("stage_total", label_set + (("status", status),))
+            self._counters[key] = self._counters.get(key, 0) + 1
+            if self._trace is not None:
+                self._trace.write(json.dumps({
+                    "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+                    "stage": stage,
+                    "duration_ms": round(seconds * 1000, 3),
+                    "status": status,
+                    "thread": threading.current_thread().name,
+                    **labels
+                }) + "\n")
+                self._trace.flush()
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def histogram(self, stage: str, **labels: Any) -> Optional[Histogram]:
+        return self._histograms.get(("stage_duration_seconds", _labels({"stage": stage, **labels})))
+
+    def counter(self, name: str, **labels: Any) -> float:
+        return self._counters.get((name, _labels(labels)), 0)
+
+    def render_prometheus(self) -> str:
+        """Everything collected so far, in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        seen = set()
+        for (name, labels), histogram in histograms:
+            metric = f"{self.prefix}_{name}"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# HELP {metric} Time spent per pipeline stage.")
+                lines.append(f"# TYPE {metric} histogram")
+            for bound, total in histogram.cumulative():
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {total}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            metric = f"{self.prefix}_{name}"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the text format for node_exporter's textfile collector, replacing ``path`` atomically."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+    def export_periodically(self, path: str, interval: float = 15.0) -> threading.Event:
+        """Rewrite ``path`` every ``interval`` seconds until the returned event is set."""
+        stop = threading.Event()
+
+        def run() -> None:
+            while True:
+                stopped = stop.wait(interval)
+                try:
+                    self.write_prometheus(path)
+                except OSError as e:
+                    self.logger.warning(f"Could not write metrics to {path}: {e}")
+                if stopped:
+                    return
+
+        threading.Thread(target=run, name="metrics-export", daemon=True).start()
+        return stop
+
+    def open_trace(self, path: str) -> None:
+        """Append one JSON record per span to ``path``."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+            self._trace = open(path, "a", encoding="utf-8")
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` over HTTP on a daemon thread; port 0 picks a free port."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        self.logger.info(f"Serving metrics on http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            if self._trace is not None:
+                self._trace.close()
+                self._trace = None
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics collector."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
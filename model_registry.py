@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from audio_utils import WHISPER_SAMPLE_RATE
+
+ModelKey = Tuple[str, Optional[str], Optional[str]]
+ModelLoader = Callable[[str, Optional[str]], Any]
+
+def load_whisper_model(model_size: str, device: Optional[str] = None) -> Any:
+    import whisper
+    return whisper.load_model(model_size, device=device)
+
+def warm_up_model(model: Any, seconds: float = 0.5) -> None:
+    """Run one inference on a short silent clip so the first real request skips lazy init."""
+    on_cuda = str(getattr(model, 'device', 'cpu')).startswith('cuda')
+    model.transcribe(np.zeros(int(WHISPER_SAMPLE_RATE * seconds), dtype=np.float32), fp16=on_cuda)
+
+class ModelRegistry:
+    """Process-wide models keyed by (model_size, device, variant), loaded on background threads.
+
+    ``variant`` tells apart models whose loader transforms the weights, e.g. int8.
+    """
+
+    def __init__(self, loader: ModelLoader = load_whisper_model):
+        self.loader = loader
+        self.logger = logging.getLogger('SpeechToText')
+        self._models: Dict[ModelKey, Future] = {}
+        self._inference_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def load(self, model_size: str, device: Optional[str] = None, warmup: bool = False,
+             loader: Optional[ModelLoader] = None, variant: Optional[str] = None) -> Future:
+        """Return a future for the model, starting the load if nobody has yet."""
+        key = (model_size, device, variant)
+        with self._lock:
+            future = self._models.get(key)
+            if future is None:
+                future = Future()
+                self._models[key] = future
+                threading.Thread(
+                    target=self._load,
+                    args=(key, future, loader or self.loader, warmup),
+                    name=f"model-load-{model_size}",
+                    daemon=True
+                ).start()
+            return future
+
+    def get(self, model_size: str, device: Optional[str] = None, timeout: Optional[float] = None,
+            variant: Optional[str] = None) -> Any:
+        return self.load(model_size, device, variant=variant).result(timeout=timeout)
+
+    def is_ready(self, model_size: str, device: Optional[str] = None, variant: Optional[str] = None) -> bool:
+        future = self._models.get((model_size, device, variant))
+        return future is not None and future.done() and future.exception() is None
+
+    def lock(self, model_size: str, device: Optional[str] = None, variant: Optional[str] = None) -> threading.Lock:
+        """Lock serializing inference on one model across every transcriber that shares it."""
+        key = (model_size, device, variant)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    def evict(self, model_size: str, device: Optional[str] = None, variant: Optional[str] = None) -> bool:
+        """Forget a loaded model so it can be garbage collected; the next ``load`` starts afresh."""
+        key = (model_size, device, variant)
+        with self._lock:
+            future = self._models.get(key)
+            if future is None or not future.done():
+                return False
+            del self._models[key]
+        self.logger.info(f"Evicted model {model_size}")
+        return True
+
+    def _load(self, key: ModelKey, future: Future, loader: ModelLoader, warmup: bool) -> None:
+        start = time.perf_counter()
+        try:
+            model = loader(key[0], key[1])
+        except Exception as e:
+            self.logger.error(f"Failed to load model {key[0]}: {e}")
+            with self._lock:
+                # Forget the failure so a later request can retry the load.
+                self._models.pop(key, None)
+            future.set_exception(e)
+            return
+
+        loaded = time.perf_counter()
+        self.logger.info(f"Loaded model {key[0]} in {loaded - start:.2f}s")
+        if warmup:
+            try:
+                warm_up_model(model)
+                self.logger.info(f"Warmed up model {key[0]} in {time.perf_counter() - loaded:.2f}s")
+            except Exception as e:
+                self.logger.warning(f"Warm-up of model {key[0]} failed: {e}")
+        future.set_result(model)
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
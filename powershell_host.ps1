@@ -0,0 +1,119 @@
+# Long-lived PowerShell host for the WSL side.
+# Protocol: one JSON request per line on stdin ({"id": n, "op": "...", "params": {...}}),
+# one JSON response per line on stdout ({"id": n, "ok": true, "result": ...}).
+# Streaming operations may emit {"id": n, "event": "...", "data": ...} lines before the response.
+$ErrorActionPreference = 'Stop'
+$NAudioPath = "C:\Program Files\NAudio\NAudio.dll"
+$script:captureLoaded = $false
+
+function Import-Capture {
+    if ($script:captureLoaded) { return }
+    Add-Type -Path $NAudioPath
+    Add-Type -ReferencedAssemblies $NAudioPath -TypeDefinition @"
+using System;
+using System.Collections.Concurrent;
+using System.Threading;
+using NAudio.Wave;
+
+public class TaikRecorder : IDisposable {
+    private readonly WaveInEvent waveIn = new WaveInEvent();
+    private readonly ConcurrentQueue<byte[]> chunks = new ConcurrentQueue<byte[]>();
+    private readonly ManualResetEvent stopped = new ManualResetEvent(false);
+
+    public TaikRecorder(int device, int rate, int bits, int channels) {
+        waveIn.DeviceNumber = device;
+        waveIn.WaveFormat = new WaveFormat(rate, bits, channels);
+        waveIn.DataAvailable += (s, e) => {
+            var chunk = new byte[e.BytesRecorded];
+            Buffer.BlockCopy(e.Buffer, 0, chunk, 0, e.BytesRecorded);
+            chunks.Enqueue(chunk);
+        };
+        waveIn.RecordingStopped += (s, e) => stopped.Set();
+    }
+
+    public void Start() { waveIn.StartRecording(); }
+    public void Stop() { waveIn.StopRecording(); stopped.WaitOne(2000); }
+    public bool TryTake(out byte[] chunk) { return chunks.TryDequeue(out chunk); }
+    public void Dispose() { waveIn.Dispose(); stopped.Dispose(); }
+}
+"@
+    $script:captureLoaded = $true
+}
+
+function Send-Message($message) {
+    [Console]::Out.WriteLine(($message | ConvertTo-Json -Compress -Depth 6))
+    [Console]::Out.Flush()
+}
+
+function Send-Chunks($id, $recorder) {
+    $chunk = $null
+    $total = 0
+    while ($recorder.TryTake([ref]$chunk)) {
+        Send-Message @{ id = $id; event = 'chunk'; data = [Convert]::ToBase64String($chunk) }
+        $total += $chunk.Length
+    }
+    return $total
+}
+
+function Invoke-Record($id, $p) {
+    Import-Capture
+    $recorder = New-Object TaikRecorder([int]$p.device, [int]$p.samplerate, [int]$p.bits, [int]$p.channels)
+    $bytes = 0
+    try {
+        $deadline = [DateTime]::UtcNow.AddMilliseconds([double]$p.duration * 1000)
+        $recorder.Start()
+        while ([DateTime]::UtcNow -lt $deadline) {
+            Start-Sleep -Milliseconds 50
+            $bytes += Send-Chunks $id $recorder
+        }
+        $recorder.Stop()
+        $bytes += Send-Chunks $id $recorder
+    } finally {
+        $recorder.Dispose()
+    }
+    return @{ bytes = $bytes }
+}
+
+function Invoke-Script($id, $p) {
+    $path = Join-Path $env:TEMP ("taik_host_" + $id + ".ps1")
+    Set-Content -Path $path -Value $p.script -Encoding UTF8
+    try {
+        $global:LASTEXITCODE = 0
+        $output = & $path *>&1 | Out-String
+        return @{ exit_code = $LASTEXITCODE; output = $output }
+    } finally {
+        Remove-Item $path -ErrorAction SilentlyContinue
+    }
+}
+
+while ($null -ne ($line = [Console]::In.ReadLine())) {
+    if (-not $line.Trim()) { continue }
+    $request = $null
+    try {
+        $request = $line | ConvertFrom-Json
+        $p = $request.params
+        switch ($request.op) {
+            'ping' { $result = 'pong' }
+            'list_devices' {
+                $result = @(Get-WmiObject Win32_SoundDevice |
+                    Where-Object { $_.ConfigManagerErrorCode -eq 0 } |
+                    Select-Object Name, DeviceID)
+            }
+            'record' { $result = Invoke-Record $request.id $p }
+            'test_device' {
+                $device = Get-WmiObject Win32_SoundDevice | Where-Object { $_.DeviceID -eq $p.device_id }
+                if (-not $device) { throw "Audio device not found: $($p.device_id)" }
+                Import-Capture
+                $recorder = New-Object TaikRecorder(0, 44100, 16, 1)
+                try { $recorder.Start(); Start-Sleep -Milliseconds 100; $recorder.Stop() } finally { $recorder.Dispose() }
+                $result = $true
+            }
+            'run_script' { $result = Invoke-Script $request.id $p }
+            default { throw "Unknown operation: $($request.op)" }
+        }
+        Send-Message @{ id = $request.id; ok = $true; result = $result }
+    } catch {
+        $id = if ($request) { $request.id } else { $null }
+        Send-Message @{ id = $id; ok = $false; error = "$_" }
+    }
+}
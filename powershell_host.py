@@ -0,0 +1,168 @@
+import atexit
+import base64
+import itertools
+import json
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HOST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'powershell_host.ps1')
+
+EventCallback = Callable[[str, Any], None]
+
+class PowerShellHostError(RuntimeError):
+    pass
+
+class PowerShellHost:
+    """A single long-lived powershell.exe spoken to over line-delimited JSON.
+
+    Requests carry an id so responses can be matched from a reader thread.
+    A host that exits or stops answering is killed and transparently
+    restarted on the next request.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None, timeout: float = 30.0):
+        self.command = command or self._default_command()
+        self.timeout = timeout
+        self.restarts = 0
+        self.logger = logging.getLogger('SpeechToText')
+        self._process: Optional[subprocess.Popen] = None
+        self._pending: Dict[int, Tuple[Future, Optional[EventCallback]]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default_command() -> List[str]:
+        with open(HOST_SCRIPT, encoding='utf-8') as f:
+            script = f.read()
+        # -EncodedCommand avoids translating the script path to a Windows path.
+        encoded = base64.b64encode(script.encode('utf-16-le')).decode('ascii')
+        return [
+            'powershell.exe', '-NoProfile', '-NoLogo', '-NonInteractive',
+            '-ExecutionPolicy', 'Bypass', '-EncodedCommand', encoded
+        ]
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def request(self, op: str, timeout: Optional[float] = None,
+                on_event: Optional[EventCallback] = None, **params: Any) -> Any:
+        """Send one operation to the host and wait for its result."""
+        timeout = self.timeout if timeout is None else timeout
+        future: Future = Future()
+
+        with self._lock:
+            if not self.is_running:
+                self._start()
+            request_id = next(self._ids)
+            pending = self._pending
+            pending[request_id] = (future, on_event)
+            message = json.dumps({'id': request_id, 'op': op, 'params': params})
+            try:
+                self._process.stdin.write(message + '\n')
+                self._process.stdin.flush()
+            except (OSError, ValueError) as e:
+                pending.pop(request_id, None)
+                self._kill()
+                raise PowerShellHostError(f"PowerShell host is not accepting requests: {e}") from e
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                pending.pop(request_id, None)
+                # A host that misses a deadline may be wedged; replace it.
+                self.logger.warning(f"PowerShell host timed out on '{op}' after {timeout}s, restarting")
+                self._kill()
+            raise TimeoutError(f"PowerShell host did not answer '{op}' within {timeout}s")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=2)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                pass
+            self._kill()
+
+    def _start(self) -> None:
+        if self._process is not None:
+            self.restarts += 1
+            self.logger.info(f"Restarting PowerShell host (restart #{self.restarts})")
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+        except OSError as e:
+            self._process = None
+            raise PowerShellHostError(f"Could not start PowerShell host: {e}") from e
+
+        self._pending = {}
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process, self._pending),
+            daemon=True
+        ).start()
+
+    def _kill(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+    def _read_responses(self, process: subprocess.Popen,
+                        pending: Dict[int, Tuple[Future, Optional[EventCallback]]]) -> None:
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                self.logger.debug(f"Ignoring non-protocol host output: {line.rstrip()}")
+                continue
+
+            request_id = message.get('id')
+            if 'event' in message:
+                entry = pending.get(request_id)
+                if entry is None or entry[1] is None or entry[0].done():
+                    continue
+                try:
+                    entry[1](message['event'], message.get('data'))
+                except Exception as e:
+                    entry[0].set_exception(e)
+                continue
+
+            entry = pending.pop(request_id, None)
+            if entry is None or entry[0].done():
+                continue
+            if message.get('ok'):
+                entry[0].set_result(message.get('result'))
+            else:
+                entry[0].set_exception(PowerShellHostError(message.get('error') or 'Unknown host error'))
+
+        process.stdout.close()
+        error = PowerShellHostError(f"PowerShell host exited with code {process.wait()}")
+        for request_id in list(pending):
+            future, _ = pending.pop(request_id)
+            if not future.done():
+                future.set_exception(error)
+
+_host: Optional[PowerShellHost] = None
+_host_lock = threading.Lock()
+
+def get_powershell_host() -> PowerShellHost:
+    """Return the process-wide PowerShell host, created on first use."""
+    global _host
+    with _host_lock:
+        if _host is None:
+            _host = PowerShellHost()
+            atexit.register(_host.close)
+        return _host
@@ -0,0 +1,197 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+SESSION_FILE_PATTERN = re.compile(r"session-(?P<session_id>.+)\.(?:txt|jsonl)$")
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+    text,
+    session_id UNINDEXED,
+    timestamp UNINDEXED,
+    duration UNINDEXED,
+    model UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS imported_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+@dataclass
+class SearchHit:
+    session_id: str
+    timestamp: Optional[str]
+    text: str
+    snippet: str
+    rank: float
+
+def session_id_from_path(path: str) -> str:
+    match = SESSION_FILE_PATTERN.search(os.path.basename(path))
+    return match.group("session_id") if match else os.path.splitext(os.path.basename(path))[0]
+
+def _phrase(query: str) -> str:
+    return '"' + query.replace('"', '""') + '"'
+
+class SessionIndex:
+    """SQLite FTS5 index of transcript text across every saved session."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.logger = logging.getLogger('SpeechToText')
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def add(self, session_id: str, text: str, timestamp: Optional[str] = None,
+            duration: Optional[float] = None, model: Optional[str] = None) -> None:
+        if not text.strip():
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO entries (text, session_id, timestamp, duration, model) VALUES (?, ?, ?, ?, ?)",
+                (text, session_id, timestamp or datetime.now().isoformat(timespec="milliseconds"),
+                 duration, model)
+            )
+
+    def import_file(self, path: str) -> int:
+        """Index a session .txt or .jsonl file, skipping it if unchanged since the last import."""
+        stat = os.stat(path)
+        path = os.path.abspath(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime, size FROM imported_files WHERE path = ?", (path,)
+            ).fetchone()
+        if row == (stat.st_mtime, stat.st_size):
+            return 0
+
+        session_id = session_id_from_path(path)
+        if path.endswith(".jsonl"):
+            rows = list(self._read_jsonl(path, session_id))
+        else:
+            timestamp = datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+            with open(path, encoding="utf-8", errors="replace") as f:
+                rows = [(line.strip(), session_id, timestamp, None, None) for line in f if line.strip()]
+
+        with self._lock, self._conn:
+            # Re-importing a file that grew replaces its earlier rows.
+            self._conn.execute("DELETE FROM entries WHERE session_id = ?", (session_id,))
+            self._conn.executemany(
+                "INSERT INTO entries (text, session_id, timestamp, duration, model) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imported_files (path, mtime, size) VALUES (?, ?, ?)",
+                (path, stat.st_mtime, stat.st_size)
+            )
+        return len(rows)
+
+    def import_folder(self, folder: str) -> int:
+        """Bulk-import every session file in ``folder``; a JSONL log wins over its .txt export."""
+        paths = {}
+        for path in sorted(glob.glob(os.path.join(folder, "session-*.txt"))
+                           + glob.glob(os.path.join(folder, "session-*.jsonl"))):
+            session_id = session_id_from_path(path)
+            if session_id not in paths or path.endswith(".jsonl"):
+                paths[session_id] = path
+
+        start = time.perf_counter()
+        total = sum(self.import_file(path) for path in paths.values())
+        self.logger.info(f"Indexed {total} entries from {len(paths)} sessions "
+                         f"in {time.perf_counter() - start:.2f}s")
+        return total
+
+    def search(self, query: str, limit: int = 20, session_id: Optional[str] = None) -> List[SearchHit]:
+        """Return the best-ranked entries matching an FTS5 query, most relevant first."""
+        sql = ("SELECT session_id, timestamp, text, "
+               "snippet(entries, 0, '[', ']', '...', 12), bm25(entries) AS rank "
+               "FROM entries WHERE entries MATCH ?")
+        params: list = [query]
+        if session_id is not None:
+            sql += " AND session_id = ?"
+            params.append(session_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax (stray quotes, operators): search it as a phrase.
+                params[0] = _phrase(query)
+                rows = self._conn.execute(sql, params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def sessions(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT session_id FROM entries ORDER BY session_id").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _read_jsonl(self, path: str, session_id: str) -> Iterable[tuple]:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("text", "").strip():
+                    yield (record["text"], session_id, record.get("timestamp"),
+                           record.get("duration"), record.get("model"))
+
+def default_index_path(session_folder: str) -> str:
+    return os.path.join(session_folder, "sessions.db")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from user_settings import Settings
+
+    parser = argparse.ArgumentParser(description="Search transcripts across saved sessions.")
+    parser.add_argument("--db", default=None, help="Index database (default: <session folder>/sessions.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Index existing session files")
+    import_parser.add_argument("folder", nargs="?", default=None, help="Session folder (default: from settings)")
+
+    search_parser = commands.add_parser("search", help="Search indexed transcripts")
+    search_parser.add_argument("query", help="Words, a \"quoted phrase\" or an FTS5 query")
+    search_parser.add_argument("-n", "--limit", type=int, default=20)
+    search_parser.add_argument("--session", default=None, help="Only search this session id")
+    args = parser.parse_args(argv)
+
+    folder = getattr(args, "folder", None) or Settings().get("session_folder")
+    index = SessionIndex(args.db or default_index_path(folder))
+    try:
+        if args.command == "import":
+            print(f"Indexed {index.import_folder(folder)} entries.")
+            return 0
+
+        start = time.perf_counter()
+        hits = index.search(args.query, limit=args.limit, session_id=args.session)
+        for hit in hits:
+            print(f"{hit.session_id}  {hit.timestamp or '-'}  {hit.snippet}")
+        print(f"{len(hits)} matches in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+        return 0 if hits else 1
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+class SessionLog:
+    """Append-only JSONL log of a transcription session.
+
+    Every record is flushed to the OS as soon as it is written, so an app crash
+    loses nothing; fsync is batched by record count and elapsed time.
+    """
+
+    def __init__(self, folder: str, session_id: Optional[str] = None,
+                 fsync_every: int = 10, fsync_interval: float = 2.0):
+        self.session_id = session_id or datetime.now().strftime("%d-%m-%Y-%H%M%S")
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"session-{self.session_id}.jsonl")
+        # Opened on the first record, so a session without transcriptions leaves no file behind.
+        self._file: Optional[TextIO] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def append(self, text: str, duration: Optional[float] = None, model: Optional[str] = None,
+               **extra: Any) -> Dict[str, Any]:
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            "text": text,
+            "duration": duration,
+            "model": model,
+            **extra
+        }
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+        return record
+
+    def records(self, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Yield (record, offset after record) for complete lines from byte ``offset`` on."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return  # a record still being written
+                offset += len(line)
+                try:
+                    yield json.loads(line), offset
+                except ValueError:
+                    continue
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def _sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
@@ -0,0 +1,56 @@
+"""Startup profiling for ``python app.py --profile-startup``."""
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Sequence
+
+HEAVY_MODULES = ('torch', 'whisper')
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse the stderr of ``python -X importtime``."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        timings.append(ImportTiming(
+            module=fields[2].strip(),
+            self_seconds=int(fields[0]) / 1e6,
+            cumulative_seconds=int(fields[1]) / 1e6
+        ))
+    return timings
+
+def profile_imports(module: str = 'app') -> List[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and return per-module import times."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+    return parse_importtime(result.stderr)
+
+def format_report(timings: Sequence[ImportTiming], first_window_seconds: float, limit: int = 15) -> str:
+    top_level = [t for t in timings if '.' not in t.module]
+    slowest = sorted(top_level, key=lambda t: t.cumulative_seconds, reverse=True)[:limit]
+    total = sum(t.self_seconds for t in timings)
+    eager_heavy = [m for m in HEAVY_MODULES if any(t.module == m for t in timings)]
+
+    lines = [f"Startup profile ({len(timings)} modules, {total * 1000:.0f} ms importing)"]
+    lines.append(f"{'module':<30} {'cumulative ms':>14} {'self ms':>10}")
+    for t in slowest:
+        lines.append(f"{t.module:<30} {t.cumulative_seconds * 1000:>14.1f} {t.self_seconds * 1000:>10.1f}")
+    lines.append(f"Eagerly imported heavy modules: {', '.join(eager_heavy) or 'none'}")
+    lines.append(f"Time to first window: {first_window_seconds * 1000:.0f} ms")
+    return "\n".join(lines)
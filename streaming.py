@@ -0,0 +1,168 @@
+import logging
+import re
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+UpdateCallback = Callable[[str, str], None]
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+def stitch(committed: List[str], hypothesis: List[str], max_overlap: int = 12, max_offset: int = 2,
+           min_run: int = 3) -> List[str]:
+    """Return the words of ``hypothesis`` that follow what is already in ``committed``.
+
+    Each window is decoded from the start of the buffer, so a hypothesis starts by
+    repeating committed words: possibly after a word or two cut at the window edge,
+    and possibly more of them than the tail being matched. Runs of ``min_run`` or
+    more words are therefore aligned anywhere in the hypothesis; shorter runs only
+    within ``max_offset`` words of its start. The longest such overlap is dropped.
+    """
+    if not committed or not hypothesis:
+        return list(hypothesis)
+    tail = [_normalize(w) for w in committed[-max_overlap:]]
+    words = [_normalize(w) for w in hypothesis]
+
+    for size in range(min(len(tail), len(words)), 0, -1):
+        # A one-word match is only trusted at the very start of the window.
+        if size == 1:
+            offsets = range(1)
+        elif size < min_run:
+            offsets = range(min(max_offset, len(words) - size) + 1)
+        else:
+            offsets = range(len(words) - size + 1)
+        for offset in offsets:
+            if words[offset:offset + size] == tail[-size:]:
+                return list(hypothesis[offset + size:])
+    return list(hypothesis)
+
+def common_prefix(first: List[str], second: List[str]) -> List[str]:
+    prefix = []
+    for a, b in zip(first, second):
+        if _normalize(a) != _normalize(b):
+            break
+        prefix.append(b)
+    return prefix
+
+def align(previous: List[str], current: List[str]) -> Optional[int]:
+    """Index in ``previous`` where the longest run matching the start of ``current`` begins."""
+    prev = [_normalize(w) for w in previous]
+    cur = [_normalize(w) for w in current]
+    best, best_length = None, 0
+    for start in range(len(prev)):
+        length = 0
+        while start + length < len(prev) and length < len(cur) and prev[start + length] == cur[length]:
+            length += 1
+        if length > best_length:
+            best, best_length = start, length
+    return best
+
+class StreamingTranscriber:
+    """Transcribes overlapping windows of a growing capture buffer.
+
+    Words are finalized once two consecutive windows agree on them; the rest
+    is reported as a partial hypothesis that may still change.
+    """
+
+    def __init__(self, transcriber, sample_rate: int, channels: int = 1, window_seconds: float = 6.0,
+                 step_ms: int = 500, on_update: Optional[UpdateCallback] = None):
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.window_seconds = window_seconds
+        self.step_seconds = step_ms / 1000
+        self.on_update = on_update
+        self.logger = logging.getLogger('SpeechToText')
+        self.committed: List[str] = []
+        self.partial: List[str] = []
+        self._buffer = bytearray()
+        self._processed_bytes = 0
+        self._slid = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.committed)
+
+    def start(self) -> None:
+        self._worker = threading.Thread(target=self._run, name="streaming-transcriber", daemon=True)
+        self._worker.start()
+
+    def feed(self, chunk: bytes) -> None:
+        """Append captured PCM; safe to call from the capture thread."""
+        with self._lock:
+            self._buffer.extend(chunk)
+
+    def finish(self) -> str:
+        """Stop the sliding window, transcribe whatever is left and finalize everything."""
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+        while True:
+            window = self._transcribe_window()
+            if window is None:
+                break
+            self._advance(*window)
+        self.committed.extend(self.partial)
+        self.partial = []
+        self._notify()
+        return self.text
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.step_seconds):
+            window = self._transcribe_window()
+            if window is not None:
+                self._advance(*window)
+                self._notify()
+
+    def _advance(self, hypothesis: List[str], slid: bool) -> None:
+        tentative = stitch(self.committed, hypothesis)
+        if slid:
+            # Partial words before the overlap were only in audio that has left
+            # the window; nothing can confirm them any more, so keep them.
+            start = align(self.partial, tentative)
+            dropped = len(self.partial) if start is None else start
+            self.committed.extend(self.partial[:dropped])
+            self.partial = self.partial[dropped:]
+        agreed = common_prefix(self.partial, tentative)
+        self.committed.extend(agreed)
+        self.partial = tentative[len(agreed):]
+
+    def _transcribe_window(self) -> Optional[Tuple[List[str], bool]]:
+        frame_size = 2 * self.channels
+        window_bytes = int(self.window_seconds * self.sample_rate) * frame_size
+        half_window = window_bytes // frame_size // 2 * frame_size
+        with self._lock:
+            available = len(self._buffer) - len(self._buffer) % frame_size
+            end = min(available, window_bytes)
+            if end <= self._processed_bytes:
+                return None
+            window = bytes(self._buffer[:end])
+            slid, self._slid = self._slid, False
+            if end == window_bytes:
+                # Slide by half a window so every stretch of audio is heard by two
+                # windows, even when inference falls behind the capture.
+                del self._buffer[:half_window]
+                end -= half_window
+                self._slid = True
+            self._processed_bytes = end
+
+        samples = np.frombuffer(window, dtype='<i2')
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels)
+
+        start = time.perf_counter()
+        # Partial windows never recur, so they would only evict useful cache entries.
+        text = self.transcriber.transcribe(samples, sample_rate=self.sample_rate, use_cache=False)
+        self.logger.debug(f"Window of {len(samples) / self.sample_rate:.1f}s transcribed in "
+                          f"{time.perf_counter() - start:.2f}s")
+        return text.split(), slid
+
+    def _notify(self) -> None:
+        if self.on_update is not None:
+            self.on_update(self.text, " ".join(self.partial))
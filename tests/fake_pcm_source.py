@@ -0,0 +1,42 @@
+"""Stand-in for the PowerShell capture process: writes synthetic 16-bit PCM to stdout."""
+import argparse
+import math
+import struct
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--samplerate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--frequency", type=float, default=440.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--realtime", action="store_true")
+    parser.add_argument("--exit-code", type=int, default=0)
+    args = parser.parse_args()
+
+    total_frames = int(args.duration * args.samplerate)
+    chunk_frames = max(1, args.samplerate * args.chunk_ms // 1000)
+    out = sys.stdout.buffer
+
+    for start in range(0, total_frames, chunk_frames):
+        frames = range(start, min(start + chunk_frames, total_frames))
+        samples = [
+            int(16000 * math.sin(2 * math.pi * args.frequency * n / args.samplerate))
+            for n in frames
+            for _ in range(args.channels)
+        ]
+        out.write(struct.pack(f"<{len(samples)}h", *samples))
+        out.flush()
+        if args.realtime:
+            time.sleep(args.chunk_ms / 1000)
+
+    if args.exit_code:
+        sys.stderr.write("capture device unavailable\n")
+    sys.exit(args.exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Linux stand-in for powershell_host.ps1 speaking the same line-delimited JSON protocol."""
+import base64
+import json
+import math
+import os
+import struct
+import sys
+import time
+
+DEVICES = [
+    {"Name": "Fake Microphone 1", "DeviceID": "FAKE-1"},
+    {"Name": "Fake Microphone 2", "DeviceID": "FAKE-2"},
+]
+
+
+def send(message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def record(request_id, params):
+    samplerate = int(params.get("samplerate", 44100))
+    channels = int(params.get("channels", 1))
+    total_frames = int(float(params.get("duration", 1)) * samplerate)
+    chunk_frames = samplerate // 10
+    sent = 0
+    for start in range(0, total_frames, chunk_frames):
+        samples = [
+            int(16000 * math.sin(2 * math.pi * 440 * n / samplerate))
+            for n in range(start, min(start + chunk_frames, total_frames))
+            for _ in range(channels)
+        ]
+        chunk = struct.pack(f"<{len(samples)}h", *samples)
+        send({"id": request_id, "event": "chunk", "data": base64.b64encode(chunk).decode("ascii")})
+        sent += len(chunk)
+    return {"bytes": sent}
+
+
+def handle(request):
+    op = request["op"]
+    params = request.get("params") or {}
+    if op == "ping":
+        return "pong"
+    if op == "pid":
+        return os.getpid()
+    if op == "list_devices":
+        return DEVICES
+    if op == "record":
+        return record(request["id"], params)
+    if op == "test_device":
+        if params.get("device_id") not in {d["DeviceID"] for d in DEVICES}:
+            raise ValueError(f"Audio device not found: {params.get('device_id')}")
+        return True
+    if op == "run_script":
+        return {"exit_code": 0, "output": ""}
+    if op == "sleep":
+        time.sleep(float(params.get("seconds", 1)))
+        return None
+    if op == "crash":
+        sys.exit(1)
+    raise ValueError(f"Unknown operation: {op}")
+
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        try:
+            send({"id": request["id"], "ok": True, "result": handle(request)})
+        except Exception as e:
+            send({"id": request["id"], "ok": False, "error": str(e)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import unittest
+import io
+import os
+import tempfile
+import wave
+import numpy as np
+from audio_buffer import AudioBuffer
+
+class TestAudioBuffer(unittest.TestCase):
+    def setUp(self):
+        self.temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        self.temp_file.close()
+
+    def tearDown(self):
+        os.remove(self.temp_file.name)
+
+    def test_slots(self):
+        buffer = AudioBuffer(10, 16000)
+        with self.assertRaises(AttributeError):
+            buffer.extra = 1
+
+    def test_extend_within_capacity_does_not_reallocate(self):
+        buffer = AudioBuffer(100, 16000)
+        storage = buffer._data
+        buffer.extend(np.arange(60, dtype=np.int16))
+        buffer.extend(np.arange(40, dtype=np.int16).tobytes())
+        self.assertIs(buffer._data, storage)
+        self.assertEqual(len(buffer), 100)
+        self.assertEqual(buffer.duration, 100 / 16000)
+        buffer.extend(b"\x01\x00")
+        self.assertEqual(len(buffer), 101)
+        self.assertGreaterEqual(buffer.capacity, 200)
+
+    def test_partial_frames_wait_for_completion(self):
+        buffer = AudioBuffer(10, 8000, channels=2)
+        buffer.extend(b"\x01\x00\x02\x00\x03")
+        self.assertEqual(len(buffer), 1)
+        buffer.extend(b"\x00\x04\x00")
+        self.assertEqual(buffer.samples.tolist(), [[1, 2], [3, 4]])
+
+    def test_views_share_memory(self):
+        buffer = AudioBuffer(10, 16000)
+        buffer.extend(np.arange(10, dtype=np.int16))
+        part = buffer[2:5]
+        self.assertTrue(np.shares_memory(part.samples, buffer._data))
+        self.assertEqual(part.samples.tolist(), [2, 3, 4])
+        self.assertEqual(part.sample_rate, 16000)
+        view = buffer.memoryview(2, 5)
+        self.assertEqual(view.tobytes(), np.arange(2, 5, dtype=np.int16).tobytes())
+
+    def test_wrap_does_not_copy(self):
+        samples = np.zeros((50, 2), dtype=np.int16)
+        buffer = AudioBuffer.wrap(samples, 44100)
+        self.assertEqual(buffer.channels, 2)
+        self.assertTrue(np.shares_memory(buffer.samples, samples))
+        with self.assertRaises(ValueError):
+            AudioBuffer.wrap(samples.astype(np.float32), 44100)
+
+    def test_ring_buffer_keeps_newest_frames(self):
+        ring = AudioBuffer(4, 16000, ring=True)
+        ring.extend(np.array([1, 2, 3], dtype=np.int16))
+        self.assertEqual(ring.samples.tolist(), [1, 2, 3])
+        ring.extend(np.array([4, 5, 6], dtype=np.int16))
+        self.assertEqual(ring.samples.tolist(), [3, 4, 5, 6])
+        ring.extend(np.arange(10, dtype=np.int16))
+        self.assertEqual(ring.samples.tolist(), [6, 7, 8, 9])
+        with self.assertRaises(ValueError):
+            ring.extend(b"\x01")
+
+    def test_to_float32_reuses_output(self):
+        buffer = AudioBuffer.wrap(np.array([-32768, 0, 16384], dtype=np.int16), 16000)
+        out = np.empty(3, dtype=np.float32)
+        result = buffer.to_float32(out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(result, [-1.0, 0.0, 0.5])
+
+    def test_wav_round_trip_with_mmap(self):
+        buffer = AudioBuffer(100, 22050, channels=2)
+        buffer.extend(np.arange(200, dtype=np.int16))
+        buffer.write_wav(self.temp_file.name)
+
+        for mmap in (True, False):
+            loaded = AudioBuffer.from_wav(self.temp_file.name, mmap=mmap)
+            self.assertEqual((loaded.sample_rate, loaded.channels, len(loaded)), (22050, 2, 100))
+            np.testing.assert_array_equal(loaded.samples, buffer.samples)
+        self.assertIsInstance(AudioBuffer.from_wav(self.temp_file.name)._data.base, np.memmap)
+
+    def test_mapped_buffer_copies_on_write(self):
+        AudioBuffer.wrap(np.ones(10, dtype=np.int16), 16000).write_wav(self.temp_file.name)
+        loaded = AudioBuffer.from_wav(self.temp_file.name)
+        loaded.extend(np.full(5, 2, dtype=np.int16))
+        self.assertEqual(len(loaded), 15)
+        self.assertEqual(len(AudioBuffer.from_wav(self.temp_file.name)), 10)
+
+    def test_readinto_from_stream(self):
+        stream = io.BufferedReader(io.BytesIO(np.arange(1000, dtype=np.int16).tobytes()))
+        buffer = AudioBuffer(100, 16000)
+        while buffer.readinto(stream, 333):
+            pass
+        self.assertEqual(buffer.samples.tolist(), list(range(1000)))
+
+if __name__ == "__main__":
+    unittest.main()
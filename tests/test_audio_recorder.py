@@ -1,9 +1,16 @@
 import unittest
+from unittest.mock import patch
 from app import WSLAudioRecorder
 from config import AudioConfig
+from powershell_host import PowerShellHost
 import tempfile
+import wave
+import sys
 import os
 
+FAKE_PCM_SOURCE = os.path.join(os.path.dirname(__file__), "fake_pcm_source.py")
+FAKE_POWERSHELL_HOST = os.path.join(os.path.dirname(__file__), "fake_powershell_host.py")
+
 class TestAudioRecorder(unittest.TestCase):
     def setUp(self):
         config = AudioConfig()  # Use default config for testing
@@ -23,5 +30,81 @@ class TestAudioRecorder(unittest.TestCase):
         self.recorder.save_to_wav(self.temp_file.name)
         self.assertTrue(os.path.exists(self.temp_file.name), "WAV file should exist after saving.")
 
+class TestStreamingCapture(unittest.TestCase):
+    """Streaming capture driven by a local stand-in for the PowerShell process."""
+
+    def setUp(self):
+        self.config = AudioConfig(capture_mode='stream', stream_chunk_size=1001)
+        self.recorder = WSLAudioRecorder(self.config)
+        self.temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+
+    def tearDown(self):
+        if os.path.exists(self.temp_file.name):
+            os.remove(self.temp_file.name)
+
+    def _fake_command(self, *extra_args):
+        def build(duration, stream=False):
+            args = " ".join(extra_args)
+            return (f'"{sys.executable}" "{FAKE_PCM_SOURCE}" --duration {duration} '
+                    f'--samplerate {self.config.samplerate} {args}')
+        return build
+
+    def test_stream_reads_all_frames(self):
+        with patch.object(self.recorder, '_build_powershell_command', self._fake_command()):
+            self.recorder.record_audio(1)
+        self.assertEqual(len(self.recorder.audio_data), self.config.samplerate * self.config.sample_width)
+
+    def test_stream_delivers_frame_aligned_chunks(self):
+        chunks = []
+        with patch.object(self.recorder, '_build_powershell_command', self._fake_command('--chunk-ms 20')):
+            self.recorder.record_audio(1, on_chunk=chunks.append)
+        self.assertGreater(len(chunks), 1, "PCM should arrive incrementally")
+        self.assertTrue(all(len(c) % self.config.sample_width == 0 for c in chunks))
+        self.assertEqual(b"".join(chunks), self.recorder.audio_data)
+
+    def test_stream_save_to_wav(self):
+        with patch.object(self.recorder, '_build_powershell_command', self._fake_command()):
+            self.recorder.record_audio(1)
+        self.recorder.save_to_wav(self.temp_file.name)
+        with wave.open(self.temp_file.name, 'rb') as wf:
+            self.assertEqual(wf.getframerate(), self.config.samplerate)
+            self.assertEqual(wf.getnframes(), self.config.samplerate)
+
+    def test_stream_samples_in_memory(self):
+        with patch.object(self.recorder, '_build_powershell_command', self._fake_command()):
+            self.recorder.record_audio(1)
+        samples = self.recorder.get_samples()
+        self.assertEqual(samples.dtype.itemsize, self.config.sample_width)
+        self.assertEqual(len(samples), self.config.samplerate)
+        self.assertGreater(abs(samples).max(), 0)
+
+    def test_stream_capture_failure(self):
+        with patch.object(self.recorder, '_build_powershell_command', self._fake_command('--exit-code 3')):
+            with self.assertRaisesRegex(RuntimeError, "capture device unavailable"):
+                self.recorder.record_audio(1)
+
+class TestHostCapture(unittest.TestCase):
+    """Capture through the persistent host, using the Linux fake host script."""
+
+    def setUp(self):
+        self.host = PowerShellHost(command=[sys.executable, FAKE_POWERSHELL_HOST], timeout=10)
+        self.config = AudioConfig(capture_mode='host')
+        self.recorder = WSLAudioRecorder(self.config, host=self.host)
+
+    def tearDown(self):
+        self.host.close()
+
+    def test_host_capture(self):
+        chunks = []
+        self.recorder.record_audio(1, on_chunk=chunks.append)
+        self.assertEqual(len(self.recorder.audio_data), self.config.samplerate * self.config.sample_width)
+        self.assertEqual(b"".join(chunks), self.recorder.audio_data)
+
+    def test_host_reused_across_recordings(self):
+        self.recorder.record_audio(1)
+        pid = self.host.request("pid")
+        self.recorder.record_audio(1)
+        self.assertEqual(self.host.request("pid"), pid)
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+from audio_utils import WHISPER_SAMPLE_RATE, pcm16_to_float32, prepare_for_whisper, resample
+
+class TestAudioUtils(unittest.TestCase):
+    def test_pcm16_to_float32_range(self):
+        pcm = np.array([-32768, 0, 16384, 32767], dtype=np.int16)
+        samples = pcm16_to_float32(pcm.tobytes())
+        self.assertEqual(samples.dtype, np.float32)
+        np.testing.assert_allclose(samples[:3], [-1.0, 0.0, 0.5])
+        self.assertLess(samples[3], 1.0)
+
+    def test_resample_length(self):
+        audio = np.zeros(44100, dtype=np.float32)
+        self.assertEqual(resample(audio, 44100).size, WHISPER_SAMPLE_RATE)
+
+    def test_resample_preserves_tone(self):
+        t = np.arange(44100) / 44100
+        tone = np.sin(2 * np.pi * 440 * t).astype(np.float32)
+        resampled = resample(tone, 44100)
+        peak_hz = np.argmax(np.abs(np.fft.rfft(resampled))) * WHISPER_SAMPLE_RATE / resampled.size
+        self.assertAlmostEqual(peak_hz, 440, delta=2)
+
+    def test_prepare_for_whisper_stereo_int16(self):
+        stereo = np.full((44100, 2), 16384, dtype=np.int16)
+        prepared = prepare_for_whisper(stereo, 44100)
+        self.assertEqual(prepared.dtype, np.float32)
+        self.assertEqual(prepared.ndim, 1)
+        self.assertEqual(prepared.size, WHISPER_SAMPLE_RATE)
+        self.assertAlmostEqual(float(prepared[WHISPER_SAMPLE_RATE // 2]), 0.5, places=3)
+
+    def test_prepare_for_whisper_passthrough_at_16k(self):
+        audio = np.linspace(-1, 1, WHISPER_SAMPLE_RATE, dtype=np.float32)
+        np.testing.assert_array_equal(prepare_for_whisper(audio, WHISPER_SAMPLE_RATE), audio)
+
+if __name__ == "__main__":
+    unittest.main()
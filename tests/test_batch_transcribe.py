@@ -0,0 +1,130 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import wave
+import numpy as np
+from unittest.mock import patch
+from dataclasses import asdict
+import batch_transcribe
+from batch_transcribe import collect_inputs, load_checkpoint, main, run_batch, worker_threads
+from config import WhisperConfig
+from model_registry import ModelRegistry
+
+def write_wav(path, samples, rate=16000):
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(samples.astype(np.int16).tobytes())
+
+class SpokenLanguageModel:
+    """Hears German in clips with a positive mean and English otherwise."""
+
+    def detect_language(self, audio):
+        return None, ({"de": 0.99} if np.mean(audio) > 0 else {"en": 0.99})
+
+    def transcribe(self, audio, **kwargs):
+        return {"text": kwargs.get("language") or max(self.detect_language(audio)[1].items(), key=lambda p: p[1])[0]}
+
+class TestBatchTranscribe(unittest.TestCase):
+    def setUp(self):
+        os.environ['TESTING'] = 'true'
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.temp_dir, "results.jsonl")
+        tone = 8000 * np.sin(2 * np.pi * 220 * np.arange(16000) / 16000)
+        self.files = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f"clip-{i}.wav")
+            write_wav(path, tone)
+            self.files.append(path)
+        write_wav(os.path.join(self.temp_dir, "silence.wav"), np.zeros(8000))
+        self.logs = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, files):
+        return run_batch(files, self.output, WhisperConfig(model_size="tiny", warmup=False),
+                         workers=2, log=self.logs.append)
+
+    def test_worker_threads_share_the_cores(self):
+        with patch("os.cpu_count", return_value=8):
+            self.assertEqual(worker_threads(2), 4)
+            self.assertEqual(worker_threads(None), 1)
+            self.assertEqual(worker_threads(16), 1)
+
+    def test_worker_does_not_carry_a_language_between_files(self):
+        german = os.path.join(self.temp_dir, "german.wav")
+        english = os.path.join(self.temp_dir, "english.wav")
+        write_wav(german, np.full(16000, 1000))
+        write_wav(english, np.full(16000, -1000))
+        with patch("app.get_model_registry", return_value=ModelRegistry()), \
+                patch("app.WhisperTranscriber._create_mock_model", return_value=SpokenLanguageModel()):
+            batch_transcribe._init_worker(asdict(WhisperConfig(model_size="tiny", warmup=False)))
+        self.addCleanup(setattr, batch_transcribe, "_worker_transcriber", None)
+        self.assertEqual(batch_transcribe._transcribe_file(german)["text"], "de")
+        self.assertEqual(batch_transcribe._transcribe_file(english)["text"], "en")
+
+    def test_collect_inputs_from_folder_and_glob(self):
+        self.assertEqual(len(collect_inputs([self.temp_dir])), 4)
+        self.assertEqual(collect_inputs([os.path.join(self.temp_dir, "clip-*.wav")]), sorted(self.files))
+
+    def test_results_stream_to_jsonl(self):
+        summary = self._run(self.files)
+        with open(self.output) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual({line["path"] for line in lines}, set(self.files))
+        self.assertTrue(all(line["text"] for line in lines))
+        self.assertEqual(summary["transcribed"], 3)
+        self.assertAlmostEqual(summary["audio_seconds"], 3.0)
+        self.assertIsNotNone(summary["rtf"])
+        self.assertIsNotNone(summary["wall_rtf"])
+
+    def test_resume_skips_finished_files(self):
+        self._run(self.files[:2])
+        summary = self._run(self.files)
+        self.assertEqual(summary["skipped"], 2)
+        self.assertEqual(summary["transcribed"], 1)
+        self.assertEqual(len(load_checkpoint(self.output)), 3)
+        self.assertEqual([r["path"] for r in summary["results"]], self.files)
+
+    def test_checkpoint_ignores_truncated_and_failed_lines(self):
+        with open(self.output, "w") as f:
+            f.write(json.dumps({"path": self.files[0], "error": "boom"}) + "\n")
+            f.write('{"path": "' + self.files[1])
+        self.assertEqual(load_checkpoint(self.output), {})
+
+    def test_resume_after_a_truncated_line(self):
+        self._run(self.files[:1])
+        with open(self.output, "a") as f:
+            f.write('{"path": "' + self.files[1])
+        summary = self._run(self.files)
+        self.assertEqual(summary["skipped"], 1)
+        with open(self.output) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(sorted(line["path"] for line in lines), self.files)
+
+    def test_complete_last_line_is_kept(self):
+        self._run(self.files[:1])
+        with open(self.output) as f:
+            line = f.read().rstrip("\n")
+        with open(self.output, "w") as f:
+            f.write(line)
+        summary = self._run(self.files)
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(len(load_checkpoint(self.output)), 3)
+
+    def test_main_writes_transcript(self):
+        prefix = os.path.join(self.temp_dir, "batch")
+        exit_code = main([self.temp_dir, "-o", self.output, "-w", "2", "--model", "tiny", "--transcript", prefix])
+        self.assertEqual(exit_code, 0)
+        transcripts = [f for f in os.listdir(self.temp_dir) if f.startswith("batch-") and f.endswith(".txt")]
+        self.assertEqual(len(transcripts), 1)
+        with open(os.path.join(self.temp_dir, transcripts[0])) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from benchmark import (STAGES, SyntheticCaptureHost, compare, compare_profiles, main, run_benchmark, summarize,
+                       synthesize, word_error_rate)
+from app import WSLAudioRecorder
+from config import AudioConfig
+
+class TestSynthesize(unittest.TestCase):
+    def test_kinds(self):
+        self.assertFalse(np.any(synthesize("silence", 0.1)))
+        tone = synthesize("tone", 0.1, sample_rate=16000)
+        self.assertEqual(tone.dtype, np.int16)
+        self.assertEqual(len(tone), 1600)
+        self.assertGreater(np.abs(synthesize("noise", 0.1)).mean(), 0)
+        self.assertEqual(synthesize("speech", 0.1, channels=2).shape, (4410, 2))
+        with self.assertRaises(ValueError):
+            synthesize("music", 1)
+
+    def test_capture_host_replays_pcm(self):
+        pcm = synthesize("tone", 0.5).tobytes()
+        recorder = WSLAudioRecorder(AudioConfig(), host=SyntheticCaptureHost(pcm, chunk_bytes=1000))
+        recorder.record_audio(duration=1)
+        self.assertEqual(recorder.audio_data, pcm)
+
+class TestResults(unittest.TestCase):
+    def test_summarize(self):
+        stats = summarize([i / 1000 for i in range(1, 101)])
+        self.assertEqual(stats["runs"], 100)
+        self.assertAlmostEqual(stats["p50_ms"], 50.5)
+        self.assertAlmostEqual(stats["p95_ms"], 95.05)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"cases": {"tone-1s": {
+            "load": {"p50_ms": 0.2, "p95_ms": 0.3},
+            "transcribe": {"p50_ms": 100.0, "p95_ms": 120.0}
+        }}}
+        results = {"cases": {"tone-1s": {
+            "load": {"p50_ms": 0.4, "p95_ms": 0.5},
+            "transcribe": {"p50_ms": 150.0, "p95_ms": 160.0}
+        }, "noise-1s": {"load": {"p50_ms": 1.0, "p95_ms": 1.0}}}}
+        rows = {row["stage"]: row for row in compare(results, baseline, tolerance=0.1)}
+        self.assertEqual(set(rows), {"load", "transcribe"})
+        self.assertFalse(rows["load"]["regression"])
+        self.assertTrue(rows["transcribe"]["regression"])
+        self.assertAlmostEqual(rows["transcribe"]["change"], 0.5)
+
+    def test_word_error_rate(self):
+        self.assertEqual(word_error_rate("the cat sat", "the cat sat"), 0.0)
+        self.assertAlmostEqual(word_error_rate("the cat sat", "the bat sat down"), 2 / 3)
+        self.assertEqual(word_error_rate("", ""), 0.0)
+
+class TestRunBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_every_stage_is_measured(self):
+        results = run_benchmark(["silence", "tone"], [0.5], iterations=2, log=lambda message: None)
+        self.assertEqual(set(results["cases"]), {"silence-0.5s", "tone-0.5s"})
+        for stages in results["cases"].values():
+            self.assertEqual(tuple(stages), STAGES)
+            self.assertTrue(all(stats["runs"] == 2 for stats in stages.values()))
+
+    def test_profile_comparison(self):
+        report = compare_profiles(["balanced", "accurate"], seconds=[0.2], iterations=1, log=lambda message: None)
+        self.assertEqual(list(report), ["balanced", "accurate"])
+        self.assertEqual(report["accurate"]["wer_vs_reference"], 0.0)
+        self.assertEqual(report["accurate"]["runs"], 1)
+
+    def test_cli_writes_results_and_compares(self):
+        output = os.path.join(self.temp_dir, "results.json")
+        args = ["--kinds", "tone", "--seconds", "0.2", "-n", "1", "-o", output]
+        self.assertEqual(main(args), 0)
+        with open(output) as f:
+            baseline = json.load(f)
+        self.assertEqual(baseline["model"], "mock")
+
+        for stats in baseline["cases"]["tone-0.2s"].values():
+            stats["p50_ms"] = 1e-6  # impossibly fast baseline
+        baseline_path = os.path.join(self.temp_dir, "baseline.json")
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f)
+        self.assertEqual(main(args + ["--baseline", baseline_path, "--min-delta-ms", "1000"]), 0)
+        self.assertEqual(main(args + ["--baseline", baseline_path, "--min-delta-ms", "0"]), 1)
+        with open(output) as f:
+            self.assertIn("comparison", json.load(f))
+
+if __name__ == "__main__":
+    unittest.main()
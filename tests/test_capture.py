@@ -0,0 +1,123 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+import numpy as np
+from audio_buffer import AudioBuffer
+from capture import (CAPTURE_BACKENDS, AlsaAudioRecorder, PulseAudioRecorder, ReplayRecorder,
+                     WSLAudioRecorder, create_recorder, get_capture_backend)
+from config import AudioConfig, SystemConfiguration
+
+FAKE_PCM_SOURCE = os.path.join(os.path.dirname(__file__), "fake_pcm_source.py")
+
+class TestBackendRegistry(unittest.TestCase):
+    def test_builtin_backends(self):
+        self.assertEqual(sorted(CAPTURE_BACKENDS), ["alsa", "pulse", "replay", "wsl"])
+        self.assertIs(get_capture_backend("pulse"), PulseAudioRecorder)
+
+    def test_unknown_backend(self):
+        with self.assertRaisesRegex(ValueError, "Unknown capture backend"):
+            get_capture_backend("jack")
+
+    def test_create_recorder_uses_config_backend(self):
+        self.assertIsInstance(create_recorder(AudioConfig(backend="wsl")), WSLAudioRecorder)
+        self.assertIsInstance(create_recorder(AudioConfig(backend="wsl"), backend="alsa"), AlsaAudioRecorder)
+
+    def test_preflight_checks_the_selected_backend(self):
+        config = SystemConfiguration()
+        config.audio = AudioConfig(backend="replay", replay_path="")
+        self.assertFalse(config._check_capture_backend())
+        config.audio.replay_path = "-"
+        self.assertTrue(config._check_capture_backend())
+
+class TestNativeCapture(unittest.TestCase):
+    def setUp(self):
+        self.config = AudioConfig(backend="pulse", samplerate=16000, stream_chunk_size=1000)
+
+    def test_commands(self):
+        self.assertIn("--rate=16000", PulseAudioRecorder(self.config).build_command())
+        self.config.device = "RDPSource"
+        self.assertIn("--device=RDPSource", PulseAudioRecorder(self.config).build_command())
+        self.assertEqual(AlsaAudioRecorder(self.config).build_command()[-2:], ["-D", "RDPSource"])
+
+    def test_stops_the_source_after_the_duration(self):
+        recorder = PulseAudioRecorder(self.config)
+        command = [sys.executable, FAKE_PCM_SOURCE, "--duration", "10", "--samplerate", "16000"]
+        chunks = []
+        with patch.object(recorder, "build_command", return_value=command):
+            recorder.record_audio(1, on_chunk=chunks.append)
+        self.assertEqual(len(recorder.buffer), 16000)
+        self.assertEqual(b"".join(chunks), recorder.audio_data)
+        self.assertTrue(all(len(chunk) % 2 == 0 for chunk in chunks))
+
+    def test_full_recording_ignores_the_exit_code(self):
+        recorder = AlsaAudioRecorder(self.config)
+        command = [sys.executable, FAKE_PCM_SOURCE, "--duration", "1", "--samplerate", "16000", "--exit-code", "1"]
+        with patch.object(recorder, "build_command", return_value=command):
+            recorder.record_audio(1)
+        self.assertEqual(len(recorder.buffer), 16000)
+
+    def test_verbose_stderr_does_not_block_the_source(self):
+        recorder = PulseAudioRecorder(self.config)
+        script = ("import sys; sys.stderr.write('x' * (1 << 20)); sys.stderr.flush(); "
+                  "sys.stdout.buffer.write(bytes(32000)); sys.stdout.flush()")
+        with patch.object(recorder, "build_command", return_value=[sys.executable, "-c", script]):
+            recorder.record_audio(1)
+        self.assertEqual(len(recorder.buffer), 16000)
+
+    def test_failure_is_reported(self):
+        recorder = AlsaAudioRecorder(self.config)
+        command = [sys.executable, FAKE_PCM_SOURCE, "--duration", "0", "--exit-code", "3"]
+        with patch.object(recorder, "build_command", return_value=command):
+            with self.assertRaisesRegex(RuntimeError, "capture device unavailable"):
+                recorder.record_audio(1)
+
+class TestReplayCapture(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "clip.wav")
+        self.samples = np.arange(8000, dtype=np.int16)
+        AudioBuffer.wrap(self.samples, 16000).write_wav(self.path)
+        self.config = AudioConfig(backend="replay", samplerate=16000, replay_path=self.path, stream_chunk_size=1000)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_file_is_looped_to_fill_the_recording(self):
+        recorder = ReplayRecorder(self.config)
+        chunks = []
+        recorder.record_audio(1, on_chunk=chunks.append)
+        np.testing.assert_array_equal(recorder.get_samples(), np.concatenate([self.samples, self.samples]))
+        self.assertEqual(b"".join(chunks), recorder.audio_data)
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+
+    def test_consecutive_recordings_continue_through_the_file(self):
+        recorder = ReplayRecorder(self.config)
+        recorder.record_audio(0.25)
+        recorder.record_audio(0.25)
+        np.testing.assert_array_equal(recorder.get_samples(), self.samples[4000:8000])
+
+    def test_realtime_pacing(self):
+        self.config.replay_realtime = True
+        start = time.perf_counter()
+        ReplayRecorder(self.config).record_audio(0.3)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.25)
+
+    def test_format_mismatch(self):
+        self.config.samplerate = 44100
+        with self.assertRaisesRegex(ValueError, "16000 Hz"):
+            ReplayRecorder(self.config).record_audio(1)
+
+    def test_raw_stream(self):
+        self.config.replay_path = "-"
+        recorder = ReplayRecorder(self.config, stream=io.BufferedReader(io.BytesIO(self.samples.tobytes())))
+        recorder.record_audio(0.25)
+        np.testing.assert_array_equal(recorder.get_samples(), self.samples[:4000])
+        recorder.record_audio(1)
+        self.assertEqual(len(recorder.buffer), 4000, "stops at the end of the stream")
+
+if __name__ == "__main__":
+    unittest.main()
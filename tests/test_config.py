@@ -0,0 +1,147 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+from config import AudioConfig, SystemConfiguration, ensure_audio_setup
+
+class TestPreflightChecks(unittest.TestCase):
+    def setUp(self):
+        os.environ['TESTING'] = 'true'
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = SystemConfiguration()
+        self.config.preflight.cache_file = os.path.join(self.temp_dir, "preflight.json")
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _check(self, name, result=True, delay=0.0):
+        def check():
+            self.calls.append(name)
+            time.sleep(delay)
+            return result
+        return check, name
+
+    def _use_checks(self, *checks):
+        self.config._environment_checks = list(checks)
+        self.config._dependency_checks = []
+
+    def test_checks_run_concurrently(self):
+        self._use_checks(*(self._check(f"slow {i}", delay=0.3) for i in range(4)))
+        start = time.monotonic()
+        self.assertTrue(self.config.run_preflight_checks(use_cache=False))
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_check_timeout_fails(self):
+        self.config.preflight.check_timeout = 0.1
+        self._use_checks(self._check("fast"), self._check("hung", delay=1.0))
+        start = time.monotonic()
+        self.assertFalse(self.config.run_preflight_checks(use_cache=False))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_failure_and_exception_fail(self):
+        def broken():
+            raise RuntimeError("boom")
+        self._use_checks(self._check("ok"), (broken, "broken"))
+        self.assertFalse(self.config.run_preflight_checks(use_cache=False))
+        self._use_checks(self._check("no", result=False))
+        self.assertFalse(self.config.run_preflight_checks(use_cache=False))
+        self.assertFalse(os.path.exists(self.config.preflight.cache_file), "Failures must not be cached")
+
+    def test_warm_launch_skips_checks(self):
+        self._use_checks(self._check("env"))
+        self.assertTrue(self.config.run_preflight_checks())
+        self.assertTrue(self.config.run_preflight_checks())
+        self.assertEqual(self.calls, ["env"])
+
+    def test_cache_expires(self):
+        self._use_checks(self._check("env"))
+        self.config.run_preflight_checks()
+        with open(self.config.preflight.cache_file) as f:
+            cached = json.load(f)
+        cached["passed_at"] -= self.config.preflight.cache_ttl + 1
+        with open(self.config.preflight.cache_file, "w") as f:
+            json.dump(cached, f)
+        self.config.run_preflight_checks()
+        self.assertEqual(self.calls, ["env", "env"])
+
+    def test_environment_change_invalidates_cache(self):
+        self._use_checks(self._check("env"))
+        self.config.run_preflight_checks()
+        with patch.dict(os.environ, {"PATH": os.environ.get("PATH", "") + ":/opt/new/bin"}):
+            self.config.run_preflight_checks()
+        self.assertEqual(self.calls, ["env", "env"])
+
+class TestPackageCheck(unittest.TestCase):
+    def setUp(self):
+        os.environ['TESTING'] = 'true'
+        self.config = SystemConfiguration()
+
+    @patch('config.find_spec')
+    def test_packages_found_without_import(self, mock_find_spec):
+        self.assertTrue(self.config._check_python_packages())
+        checked = [call.args[0] for call in mock_find_spec.call_args_list]
+        self.assertEqual(checked, ['numpy', 'whisper', 'torch'])
+
+    @patch('config.find_spec')
+    def test_missing_package(self, mock_find_spec):
+        mock_find_spec.side_effect = lambda name: None if name == 'torch' else object()
+        self.assertFalse(self.config._check_python_packages())
+
+class TestAudioSetup(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.sentinel = os.path.join(self.temp_dir, "audio_setup.json")
+        self.naudio = os.path.join(self.temp_dir, "NAudio.dll")
+        open(self.naudio, "w").close()
+        self.host = MagicMock()
+        self.host.request.return_value = {"exit_code": 0, "output": ""}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _ensure(self, **kwargs):
+        return ensure_audio_setup(host=self.host, sentinel_file=self.sentinel, naudio_path=self.naudio, **kwargs)
+
+    @patch('config.get_powershell_host')
+    def test_audio_config_is_pure_data(self, mock_get_host):
+        AudioConfig()
+        mock_get_host.assert_not_called()
+
+    def test_setup_runs_once(self):
+        self.assertTrue(self._ensure())
+        self.assertFalse(self._ensure())
+        self.assertEqual(self.host.request.call_count, 1)
+        self.assertEqual(self.host.request.call_args.args[0], 'run_script')
+
+    def test_force_reruns(self):
+        self._ensure()
+        self.assertTrue(self._ensure(force=True))
+        self.assertEqual(self.host.request.call_count, 2)
+
+    def test_missing_dll_reruns(self):
+        self._ensure()
+        os.remove(self.naudio)
+        self.assertTrue(self._ensure())
+
+    def test_script_change_reruns(self):
+        self._ensure()
+        with open(self.sentinel) as f:
+            sentinel = json.load(f)
+        sentinel["script_sha256"] = "0" * 64
+        with open(self.sentinel, "w") as f:
+            json.dump(sentinel, f)
+        self.assertTrue(self._ensure())
+
+    def test_failed_setup_raises_without_sentinel(self):
+        self.host.request.return_value = {"exit_code": 1, "output": "nuget unreachable"}
+        with self.assertRaisesRegex(RuntimeError, "Failed to setup audio capture"):
+            self._ensure()
+        self.assertFalse(os.path.exists(self.sentinel))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import os
+from importlib.util import find_spec
+from unittest.mock import patch
+import numpy as np
+from app import WhisperTranscriber
+from config import INFERENCE_PROFILES, InferenceProfile, WhisperConfig, get_inference_profile
+from inference import decode_options, model_variant, prepare_model
+from model_registry import ModelRegistry
+
+HAS_TORCH = find_spec("torch") is not None
+HAS_WHISPER = HAS_TORCH and find_spec("whisper") is not None
+
+class RecordingModel:
+    def __init__(self):
+        self.options = []
+
+    def transcribe(self, audio, **kwargs):
+        self.options.append(kwargs)
+        return {"text": "recorded"}
+
+class TestInferenceProfiles(unittest.TestCase):
+    def test_profiles_describe_trade_off(self):
+        self.assertEqual(set(INFERENCE_PROFILES), {"accurate", "balanced", "fast"})
+        for profile in INFERENCE_PROFILES.values():
+            self.assertTrue(profile.description)
+        with self.assertRaises(ValueError):
+            get_inference_profile("turbo")
+
+    def test_profile_selected_per_deployment(self):
+        with patch.dict(os.environ, {"TAIK_INFERENCE_PROFILE": "fast"}):
+            self.assertEqual(WhisperConfig().profile, "fast")
+        self.assertEqual(WhisperConfig(profile="accurate").profile, "accurate")
+
+    def test_fp16_only_on_cuda(self):
+        accurate = get_inference_profile("accurate")
+        self.assertEqual(decode_options(accurate, "cpu"), {"fp16": False, "beam_size": 5, "best_of": 5})
+        self.assertTrue(decode_options(accurate, "cuda:0")["fp16"])
+        self.assertEqual(decode_options(get_inference_profile("balanced")), {"fp16": False})
+
+    def test_quantized_models_are_cached_separately(self):
+        self.assertEqual(model_variant(get_inference_profile("fast")), "int8")
+        self.assertIsNone(model_variant(get_inference_profile("balanced")))
+
+    def test_unquantized_profile_leaves_model_alone(self):
+        model = RecordingModel()
+        self.assertIs(prepare_model(model, get_inference_profile("accurate")), model)
+
+    def test_transcriber_passes_decode_options(self):
+        model = RecordingModel()
+        registry = ModelRegistry(loader=lambda model_size, device: model)
+        with patch.dict(os.environ, {"TESTING": "false"}):
+            transcriber = WhisperTranscriber(
+                WhisperConfig(model_size="tiny", warmup=False, profile="accurate"), registry=registry
+            )
+            transcriber.transcribe(np.ones(16000, dtype=np.int16), sample_rate=16000)
+        self.assertEqual(model.options, [{"fp16": False, "beam_size": 5, "best_of": 5, "task": "transcribe"}])
+
+@unittest.skipUnless(HAS_TORCH, "torch is not installed")
+class TestQuantization(unittest.TestCase):
+    def test_linear_subclasses_are_quantized(self):
+        import torch
+        from torch import nn
+        from inference import apply_thread_settings, quantize_linear_layers
+
+        class CastingLinear(nn.Linear):
+            def forward(self, x):
+                return super().forward(x)
+
+        torch.manual_seed(0)
+        model = nn.Sequential(CastingLinear(64, 64), nn.ReLU(), nn.Linear(64, 8)).eval()
+        x = torch.randn(4, 64)
+        expected = model(x)
+        quantized = quantize_linear_layers(model)
+        self.assertFalse(any(type(m) in (nn.Linear, CastingLinear) for m in quantized.modules()))
+        self.assertLess((quantized(x) - expected).abs().max().item(), 0.1)
+
+        apply_thread_settings(InferenceProfile("test", "", threads=2))
+        self.assertEqual(torch.get_num_threads(), 2)
+
+@unittest.skipUnless(HAS_WHISPER, "whisper is not installed")
+class TestTinyWhisperModel(unittest.TestCase):
+    """A randomly initialized, tiny-dimension whisper model; no weights are downloaded."""
+
+    def setUp(self):
+        import torch
+        from whisper.model import ModelDimensions, Whisper
+
+        torch.manual_seed(0)
+        dims = ModelDimensions(
+            n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+            n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1
+        )
+        self.model = Whisper(dims).eval()
+
+    def test_quantized_logits_track_full_precision(self):
+        import torch
+
+        mel = torch.randn(1, 80, 3000)
+        tokens = torch.tensor([[50258, 50259, 50359]])
+        with torch.no_grad():
+            expected = self.model(mel, tokens)
+            quantized = prepare_model(self.model, get_inference_profile("fast"))(mel, tokens)
+        self.assertEqual(quantized.shape, expected.shape)
+        correlation = np.corrcoef(expected.flatten().numpy(), quantized.flatten().numpy())[0, 1]
+        self.assertGreater(correlation, 0.95)
+
+    def test_profiles_transcribe(self):
+        audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 0.1
+        for name in ("accurate", "fast"):  # fast quantizes the model in place
+            profile = get_inference_profile(name)
+            model = prepare_model(self.model, profile)
+            result = model.transcribe(audio, temperature=0.0, **decode_options(profile, "cpu"))
+            self.assertIsInstance(result["text"], str)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from audio_buffer import AudioBuffer
+from config import WhisperConfig
+from long_audio import chunk_bounds, find_split_points, main, merge_segments, transcribe_long
+
+RATE = 16000
+
+def tone(seconds):
+    return (8000 * np.sin(2 * np.pi * 220 * np.arange(int(seconds * RATE)) / RATE)).astype(np.int16)
+
+class TestSplitPoints(unittest.TestCase):
+    def test_splits_in_the_quiet_gap_near_each_boundary(self):
+        # Tone with a 0.2 s pause at 2.7 s and 5.6 s; chunks target 3 s.
+        samples = np.concatenate([tone(2.7), np.zeros(int(0.2 * RATE), np.int16),
+                                  tone(2.7), np.zeros(int(0.2 * RATE), np.int16), tone(2.5)])
+        points = find_split_points(samples, RATE, chunk_seconds=3.0, search_seconds=1.0)
+        self.assertEqual(len(points), 2)
+        self.assertTrue(2.7 * RATE <= points[0] <= 2.9 * RATE)
+        self.assertTrue(5.6 * RATE <= points[1] <= 5.8 * RATE)
+
+    def test_short_audio_is_not_split(self):
+        self.assertEqual(find_split_points(tone(4.0), RATE, chunk_seconds=3.0), [])
+
+    def test_multichannel_samples(self):
+        stereo = np.repeat(tone(10.0)[:, None], 2, axis=1)
+        points = find_split_points(stereo, RATE, chunk_seconds=3.0, search_seconds=0.5)
+        lengths = [end - start for start, end in chunk_bounds(len(stereo), points)]
+        self.assertGreater(len(points), 1)
+        self.assertTrue(all(2.0 * RATE <= length <= 4.5 * RATE for length in lengths))
+
+    def test_chunk_bounds_cover_the_recording(self):
+        self.assertEqual(chunk_bounds(100, [30, 70]), [(0, 30), (30, 70), (70, 100)])
+        self.assertEqual(chunk_bounds(0, []), [])
+
+class TestMergeSegments(unittest.TestCase):
+    def test_drops_words_repeated_across_a_boundary(self):
+        merged = merge_segments([
+            (0.0, [{"start": 0.0, "end": 29.8, "text": "we should ship the release on friday"}]),
+            (30.0, [{"start": 29.0, "end": 31.5, "text": "on friday after the review"},
+                    {"start": 31.5, "end": 35.0, "text": "on friday we celebrate"}])
+        ])
+        self.assertEqual([s["text"] for s in merged],
+                         ["we should ship the release on friday", "after the review", "on friday we celebrate"])
+        self.assertEqual(merged[1]["start"], 29.0)
+
+    def test_segments_entirely_repeated_are_dropped(self):
+        merged = merge_segments([
+            (0.0, [{"start": 0.0, "end": 5.0, "text": "hello there"}]),
+            (5.0, [{"start": 4.5, "end": 5.2, "text": "hello there"}])
+        ])
+        self.assertEqual(len(merged), 1)
+
+class TestTranscribeLong(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(os.environ, {"TESTING": "true"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.temp_dir = tempfile.mkdtemp()
+        gap = np.zeros(int(0.3 * RATE), np.int16)
+        self.path = os.path.join(self.temp_dir, "meeting.wav")
+        AudioBuffer.wrap(np.concatenate([tone(1.8), gap, tone(1.8), gap, tone(1.8)]), RATE).write_wav(self.path)
+        self.config = WhisperConfig(model_size="tiny", warmup=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_chunks_are_transcribed_with_recording_timestamps(self):
+        result = transcribe_long(self.path, self.config, workers=2, chunk_seconds=2.0,
+                                 overlap_seconds=0.0, search_seconds=0.5, log=lambda message: None)
+        self.assertEqual(len(result["chunks"]), 3)
+        self.assertEqual(len(result["segments"]), 3)
+        starts = [segment["start"] for segment in result["segments"]]
+        self.assertEqual(starts, sorted(starts))
+        self.assertEqual(starts[0], 0.0)
+        self.assertAlmostEqual(result["segments"][-1]["end"], result["duration"], places=2)
+        self.assertIn("mock transcription", result["text"])
+
+    def test_buffer_input(self):
+        buffer = AudioBuffer.from_wav(self.path)
+        result = transcribe_long(buffer, self.config, workers=2, chunk_seconds=2.0,
+                                 overlap_seconds=0.0, search_seconds=0.5, log=lambda message: None)
+        self.assertEqual(len(result["segments"]), 3)
+
+    def test_main_writes_json(self):
+        output = os.path.join(self.temp_dir, "meeting.json")
+        self.assertEqual(main([self.path, "-o", output, "-w", "2", "--chunk-seconds", "2"]), 0)
+        with open(output) as f:
+            result = json.load(f)
+        self.assertEqual(result["path"], self.path)
+        self.assertTrue(result["segments"])
+
+if __name__ == '__main__':
+    unittest.main()
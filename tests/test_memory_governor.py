@@ -0,0 +1,117 @@
+import unittest
+import os
+import threading
+import time
+from unittest.mock import patch
+import numpy as np
+from app import WhisperTranscriber
+from config import WhisperConfig
+from memory_governor import MemoryGovernor, release_memory, resident_set_size
+from model_registry import ModelRegistry
+
+class BlockingModel:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def transcribe(self, audio, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        return {"text": "hello"}
+
+class TestMemoryGovernor(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(os.environ, {"TESTING": "false"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.models = []
+        self.registry = ModelRegistry(loader=self._loader)
+        self.transcriber = WhisperTranscriber(WhisperConfig(model_size="tiny", warmup=False, language="en"),
+                                              registry=self.registry)
+        self.transcriber.model_ready.result(timeout=5)
+        self.audio = np.ones(16000, dtype=np.int16)
+
+    def _loader(self, model_size, device):
+        self.models.append(BlockingModel())
+        return self.models[-1]
+
+    def _idle_for(self, seconds):
+        self.transcriber.last_used = time.monotonic() - seconds
+
+    def test_idle_model_is_released_and_reloaded_on_demand(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=60)
+        self._idle_for(30)
+        self.assertIsNone(governor.check())
+        self._idle_for(61)
+        with self.assertLogs('SpeechToText', level='INFO') as logs:
+            self.assertEqual(governor.check(), "idle")
+        self.assertTrue(any("RSS" in line for line in logs.output))
+        self.assertFalse(self.transcriber.is_loaded)
+        self.assertFalse(self.registry.is_ready("tiny"))
+
+        self.assertEqual(self.transcriber.transcribe(self.audio, sample_rate=16000), "hello")
+        self.assertEqual(len(self.models), 2)
+        self.assertIsNone(governor.check(), "just used")
+
+    def test_busy_model_is_kept(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=60)
+        model = self.models[0]
+        model.release.clear()
+        worker = threading.Thread(target=self.transcriber.transcribe, args=(self.audio, 16000))
+        worker.start()
+        model.started.wait(5)
+        self._idle_for(120)
+        self.assertIsNone(governor.check())
+        model.release.set()
+        worker.join(5)
+        self.assertTrue(self.transcriber.is_loaded)
+
+    def test_reload_restarts_the_idle_clock(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=60)
+        self._idle_for(61)
+        self.assertEqual(governor.check(), "idle")
+        self.transcriber.model_ready.result(timeout=5)
+        self.assertTrue(self.transcriber.is_loaded)
+        self.assertIsNone(governor.check())
+        self.assertTrue(self.transcriber.is_loaded)
+
+    def test_memory_budget(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=None, memory_budget_mb=100, min_idle=10)
+        self._idle_for(11)
+        with patch("memory_governor.resident_set_size", return_value=50 << 20):
+            self.assertIsNone(governor.check())
+        with patch("memory_governor.resident_set_size", return_value=200 << 20):
+            self.assertEqual(governor.check(), "memory")
+
+    def test_memory_budget_waits_for_min_idle(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=None, memory_budget_mb=100, min_idle=10)
+        self.transcriber.transcribe(self.audio, sample_rate=16000)
+        with patch("memory_governor.resident_set_size", return_value=200 << 20):
+            self.assertIsNone(governor.check())
+        self.assertTrue(self.transcriber.is_loaded)
+
+    def test_background_checks(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=0.01, check_interval=0.01)
+        governor.start()
+        deadline = time.monotonic() + 5
+        while self.transcriber.is_loaded and time.monotonic() < deadline:
+            time.sleep(0.01)
+        governor.stop()
+        self.assertFalse(self.transcriber.is_loaded)
+
+    def test_disabled_policy_does_not_start(self):
+        governor = MemoryGovernor(self.transcriber, idle_timeout=None)
+        governor.start()
+        self.assertIsNone(governor._thread)
+
+class TestMemoryHelpers(unittest.TestCase):
+    @unittest.skipUnless(os.path.exists("/proc/self/status"), "needs /proc")
+    def test_resident_set_size(self):
+        self.assertGreater(resident_set_size(), 0)
+
+    def test_release_memory(self):
+        release_memory()
+
+if __name__ == "__main__":
+    unittest.main()
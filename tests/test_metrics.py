@@ -0,0 +1,96 @@
+import unittest
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import urllib.request
+from config import SystemConfiguration
+from metrics import Histogram, Metrics
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [("0.1", 2), ("1.0", 3), ("+Inf", 4)])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.95), float("inf"))
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.metrics = Metrics()
+
+    def tearDown(self):
+        self.metrics.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_span_records_duration_and_status(self):
+        with self.metrics.span("inference", model="tiny"):
+            pass
+        with self.assertRaises(RuntimeError):
+            with self.metrics.span("inference", model="tiny"):
+                raise RuntimeError("boom")
+        self.assertEqual(self.metrics.histogram("inference", model="tiny").count, 2)
+        self.assertEqual(self.metrics.counter("stage_total", model="tiny", stage="inference", status="ok"), 1)
+        self.assertEqual(self.metrics.counter("stage_total", model="tiny", stage="inference", status="error"), 1)
+
+    def test_prometheus_text(self):
+        self.metrics.record("capture", 0.2, mode="host")
+        self.metrics.increment("cache_lookups_total", result="hit")
+        text = self.metrics.render_prometheus()
+        self.assertIn("# TYPE taik_stage_duration_seconds histogram", text)
+        self.assertIn('taik_stage_duration_seconds_bucket{mode="host",stage="capture",le="0.25"} 1', text)
+        self.assertIn('taik_stage_duration_seconds_count{mode="host",stage="capture"} 1', text)
+        self.assertIn('taik_cache_lookups_total{result="hit"} 1', text)
+
+        path = os.path.join(self.temp_dir, "metrics.prom")
+        self.metrics.write_prometheus(path)
+        with open(path) as f:
+            self.assertEqual(f.read(), text)
+
+    def test_trace_file(self):
+        path = os.path.join(self.temp_dir, "trace.jsonl")
+        self.metrics.open_trace(path)
+        with self.metrics.span("persist", op="append"):
+            pass
+        self.metrics.close()
+        with open(path) as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record["stage"], "persist")
+        self.assertEqual(record["op"], "append")
+        self.assertEqual(record["status"], "ok")
+        self.assertGreaterEqual(record["duration_ms"], 0)
+
+    def test_http_endpoint(self):
+        self.metrics.record("decode", 0.01)
+        server = self.metrics.serve(0)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode()
+        self.assertIn('stage="decode"', body)
+
+    def test_periodic_export_writes_on_stop(self):
+        path = os.path.join(self.temp_dir, "metrics.prom")
+        self.metrics.record("vad", 0.01)
+        stop = self.metrics.export_periodically(path, interval=60)
+        stop.set()
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(path))
+
+class TestLoggerSetup(unittest.TestCase):
+    def test_handler_added_once(self):
+        SystemConfiguration()
+        SystemConfiguration()
+        handlers = [h for h in logging.getLogger('SpeechToText').handlers if getattr(h, '_taik_handler', False)]
+        self.assertEqual(len(handlers), 1)
+
+if __name__ == "__main__":
+    unittest.main()
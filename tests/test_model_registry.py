@@ -0,0 +1,77 @@
+import unittest
+import threading
+import numpy as np
+from model_registry import ModelRegistry
+
+class FakeModel:
+    def __init__(self):
+        self.transcribed = []
+
+    def transcribe(self, audio, **kwargs):
+        self.transcribed.append(audio)
+        return {"text": ""}
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.loads = []
+        self.registry = ModelRegistry(loader=self._loader)
+
+    def _loader(self, model_size, device):
+        self.loads.append((model_size, device))
+        self.release.wait(5)
+        return FakeModel()
+
+    def test_load_does_not_block(self):
+        future = self.registry.load("tiny")
+        self.assertFalse(future.done(), "Loading should happen in the background")
+        self.release.set()
+        self.assertIsInstance(future.result(timeout=5), FakeModel)
+        self.assertTrue(self.registry.is_ready("tiny"))
+
+    def test_same_key_loads_once(self):
+        self.release.set()
+        first = self.registry.get("tiny", timeout=5)
+        second = self.registry.get("tiny", timeout=5)
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, [("tiny", None)])
+
+    def test_device_is_part_of_key(self):
+        self.release.set()
+        cpu = self.registry.get("tiny", "cpu", timeout=5)
+        default = self.registry.get("tiny", timeout=5)
+        self.assertIsNot(cpu, default)
+        self.assertEqual(len(self.loads), 2)
+
+    def test_evicted_model_is_reloaded(self):
+        future = self.registry.load("tiny")
+        self.assertFalse(self.registry.evict("tiny"), "a load in progress is not evicted")
+        self.release.set()
+        first = future.result(timeout=5)
+        self.assertTrue(self.registry.evict("tiny"))
+        self.assertFalse(self.registry.is_ready("tiny"))
+        self.assertIsNot(self.registry.get("tiny", timeout=5), first)
+        self.assertEqual(len(self.loads), 2)
+
+    def test_warmup_runs_on_silence(self):
+        self.release.set()
+        model = self.registry.load("tiny", warmup=True).result(timeout=5)
+        self.assertEqual(len(model.transcribed), 1)
+        self.assertFalse(np.any(model.transcribed[0]))
+
+    def test_failed_load_can_be_retried(self):
+        attempts = []
+
+        def flaky_loader(model_size, device):
+            attempts.append(model_size)
+            if len(attempts) == 1:
+                raise RuntimeError("download failed")
+            return FakeModel()
+
+        registry = ModelRegistry(loader=flaky_loader)
+        with self.assertRaises(RuntimeError):
+            registry.load("tiny").result(timeout=5)
+        self.assertIsInstance(registry.load("tiny").result(timeout=5), FakeModel)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+from powershell_host import PowerShellHost, PowerShellHostError
+
+FAKE_HOST = os.path.join(os.path.dirname(__file__), "fake_powershell_host.py")
+
+class TestPowerShellHost(unittest.TestCase):
+    def setUp(self):
+        self.host = PowerShellHost(command=[sys.executable, FAKE_HOST], timeout=5)
+
+    def tearDown(self):
+        self.host.close()
+
+    def test_ping(self):
+        self.assertEqual(self.host.request("ping"), "pong")
+
+    def test_process_is_reused(self):
+        first = self.host.request("pid")
+        second = self.host.request("pid")
+        self.assertEqual(first, second, "Requests should share one long-lived host process")
+        self.assertEqual(self.host.restarts, 0)
+
+    def test_list_devices(self):
+        devices = self.host.request("list_devices")
+        self.assertEqual(devices[0]["DeviceID"], "FAKE-1")
+
+    def test_error_response(self):
+        with self.assertRaisesRegex(PowerShellHostError, "Unknown operation"):
+            self.host.request("no_such_op")
+        self.assertEqual(self.host.request("ping"), "pong")
+
+    def test_streaming_events(self):
+        chunks = []
+        result = self.host.request(
+            "record", duration=0.5, samplerate=16000, channels=1,
+            on_event=lambda event, data: chunks.append(data)
+        )
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(result["bytes"], 16000)
+
+    def test_restart_after_crash(self):
+        pid = self.host.request("pid")
+        with self.assertRaises(PowerShellHostError):
+            self.host.request("crash")
+        self.assertNotEqual(self.host.request("pid"), pid)
+        self.assertEqual(self.host.restarts, 1)
+
+    def test_timeout_restarts_host(self):
+        pid = self.host.request("pid")
+        with self.assertRaises(TimeoutError):
+            self.host.request("sleep", timeout=0.2, seconds=5)
+        self.assertNotEqual(self.host.request("pid"), pid)
+
+    def test_missing_executable(self):
+        host = PowerShellHost(command=["/nonexistent/powershell.exe"])
+        with self.assertRaises(PowerShellHostError):
+            host.request("ping")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from app import TranscriptionManager
+from session_index import SessionIndex, main
+
+class TestSessionIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = SessionIndex(os.path.join(self.temp_dir, "sessions.db"))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, lines):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            f.write("".join(f"{line}\n" for line in lines))
+        return path
+
+    def test_search_ranks_and_reports_session(self):
+        self.index.add("a", "the quick brown fox", timestamp="2024-01-01T10:00:00")
+        self.index.add("b", "a fox, a fox, another fox")
+        self.index.add("c", "nothing relevant here")
+        hits = self.index.search("fox")
+        self.assertEqual([hit.session_id for hit in hits], ["b", "a"])
+        self.assertIn("[fox]", hits[0].snippet)
+        self.assertEqual(hits[1].timestamp, "2024-01-01T10:00:00")
+
+    def test_phrase_and_invalid_syntax(self):
+        self.index.add("a", "brown fox jumps")
+        self.index.add("b", "fox is brown")
+        self.assertEqual([hit.session_id for hit in self.index.search('"brown fox"')], ["a"])
+        self.assertEqual(len(self.index.search('fox "')), 2)
+
+    def test_import_folder_prefers_jsonl_and_skips_unchanged(self):
+        self._write("session-01-01-2024-100000.txt", ["hello world", "second line"])
+        self._write("session-02-01-2024-100000.txt", ["exported text"])
+        self._write("session-02-01-2024-100000.jsonl", [
+            json.dumps({"text": "logged text", "timestamp": "2024-01-02T10:00:00", "model": "base"})
+        ])
+        self.assertEqual(self.index.import_folder(self.temp_dir), 3)
+        self.assertEqual(self.index.import_folder(self.temp_dir), 0)
+        self.assertEqual(self.index.search("exported"), [])
+        hit = self.index.search("logged")[0]
+        self.assertEqual(hit.session_id, "02-01-2024-100000")
+        self.assertEqual(hit.timestamp, "2024-01-02T10:00:00")
+
+    def test_reimport_replaces_grown_file(self):
+        path = self._write("session-x.txt", ["one"])
+        self.index.import_file(path)
+        with open(path, "a") as f:
+            f.write("two more words\n")
+        self.index.import_file(path)
+        self.assertEqual(len(self.index.search("one")), 1)
+        self.assertEqual(len(self.index.search("words")), 1)
+
+    def test_manager_indexes_transcriptions(self):
+        manager = TranscriptionManager(file_prefix=os.path.join(self.temp_dir, "session"), index=self.index)
+        manager.add_transcription("indexed as it arrives", duration=2.0, model="tiny")
+        hit = self.index.search("arrives")[0]
+        self.assertEqual(hit.session_id, manager.session_id)
+
+    def test_cli_search(self):
+        self._write("session-cli.txt", ["find this phrase"])
+        db = os.path.join(self.temp_dir, "cli.db")
+        self.assertEqual(main(["--db", db, "import", self.temp_dir]), 0)
+        self.assertEqual(main(["--db", db, "search", "phrase"]), 0)
+        self.assertEqual(main(["--db", db, "search", "absent"]), 1)
+
+if __name__ == "__main__":
+    unittest.main()
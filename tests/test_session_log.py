@@ -0,0 +1,126 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from app import TranscriptionManager
+from session_log import SessionLog
+
+class TestSessionLog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log = SessionLog(self.temp_dir, session_id="s1", fsync_every=3, fsync_interval=60)
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_file_is_created_on_the_first_record(self):
+        self.assertFalse(os.path.exists(self.log.path))
+        self.assertEqual(list(self.log.records()), [])
+        self.log.sync()
+        self.log.append("hello")
+        self.assertTrue(os.path.exists(self.log.path))
+
+    def test_records_written_immediately(self):
+        self.log.append("hello", duration=1.5, model="tiny")
+        with open(self.log.path) as f:
+            record = json.loads(f.readline())
+        self.assertEqual(record["text"], "hello")
+        self.assertEqual(record["duration"], 1.5)
+        self.assertEqual(record["model"], "tiny")
+        self.assertIn("timestamp", record)
+
+    def test_fsync_is_batched(self):
+        with patch("session_log.os.fsync") as mock_fsync:
+            self.log.append("one")
+            self.log.append("two")
+            mock_fsync.assert_not_called()
+            self.log.append("three")
+            self.assertEqual(mock_fsync.call_count, 1)
+
+    def test_records_from_offset(self):
+        self.log.append("one")
+        first = list(self.log.records())
+        self.log.append("two")
+        rest = [record["text"] for record, _ in self.log.records(first[-1][1])]
+        self.assertEqual(rest, ["two"])
+
+    def test_partial_trailing_line_is_skipped(self):
+        self.log.append("complete")
+        with open(self.log.path, "a") as f:
+            f.write('{"text": "half')
+        self.assertEqual([r["text"] for r, _ in self.log.records()], ["complete"])
+
+    def test_append_resumes_existing_session(self):
+        self.log.append("before crash")
+        self.log.close()
+        self.log = SessionLog(self.temp_dir, session_id="s1")
+        self.log.append("after restart")
+        self.assertEqual([r["text"] for r, _ in self.log.records()], ["before crash", "after restart"])
+
+class TestTranscriptionManagerWithLog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log = SessionLog(self.temp_dir, session_id="s1")
+        self.manager = TranscriptionManager(
+            file_prefix=os.path.join(self.temp_dir, "session"),
+            session_log=self.log,
+            max_in_memory=2
+        )
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _read_export(self, filename):
+        with open(filename) as f:
+            return [line.strip() for line in f]
+
+    def test_memory_is_bounded(self):
+        for i in range(5):
+            self.manager.add_transcription(f"text {i}")
+        self.assertEqual(list(self.manager.transcriptions), ["text 3", "text 4"])
+        self.assertEqual(len(list(self.log.records())), 5)
+
+    def test_export_is_incremental(self):
+        self.manager.add_transcription("first")
+        filename = self.manager.save_transcriptions()
+        self.assertEqual(filename, os.path.join(self.temp_dir, "session-s1.txt"))
+        self.manager.add_transcription("second")
+        self.manager.save_transcriptions()
+        self.manager.save_transcriptions()
+        self.assertEqual(self._read_export(filename), ["first", "second"])
+
+    def test_export_rebuilt_if_deleted(self):
+        self.manager.add_transcription("first")
+        filename = self.manager.save_transcriptions()
+        os.remove(filename)
+        self.manager.add_transcription("second")
+        self.manager.save_transcriptions()
+        self.assertEqual(self._read_export(filename), ["first", "second"])
+
+    def test_export_after_restart_is_not_duplicated(self):
+        self.manager.add_transcription("first")
+        filename = self.manager.save_transcriptions()
+        self.log.close()
+        self.log = SessionLog(self.temp_dir, session_id="s1")
+        self.manager = TranscriptionManager(file_prefix=os.path.join(self.temp_dir, "session"), session_log=self.log)
+        self.manager.add_transcription("second")
+        self.manager.save_transcriptions()
+        self.assertEqual(self._read_export(filename), ["first", "second"])
+
+    def test_other_session_is_rejected(self):
+        self.manager.add_transcription("first")
+        with self.assertRaises(ValueError):
+            self.manager.save_transcriptions("test-session")
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "session-test-session.txt")))
+
+    def test_empty_log_raises(self):
+        with self.assertRaises(ValueError):
+            self.manager.save_transcriptions()
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "session-s1.txt")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,14 @@
 import unittest
 import os
-from app import SpeechToTextApp, WSLAudioRecorder, WhisperTranscriber
+import numpy as np
+from app import SpeechToTextApp, TranscriptionManager, WSLAudioRecorder, WhisperTranscriber
+from audio_buffer import AudioBuffer
+from session_log import SessionLog
+from transcription_queue import JobState, TranscriptionJob
 from user_settings import Settings, SettingsButton
 from unittest.mock import patch
 import tempfile
+import shutil
 from tkinter import Tk
 import time
 
@@ -47,6 +52,32 @@ class TestSpeechToTextApp(unittest.TestCase):
         # Verify messagebox was called
         mock_showinfo.assert_called_once()
 
+    def test_reprocessed_recording_is_logged_once(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        log = SessionLog(temp_dir)
+        self.addCleanup(log.close)
+        manager = self.app.transcription_manager
+        self.app.transcription_manager = TranscriptionManager(os.path.join(temp_dir, "session"), session_log=log)
+        self.addCleanup(setattr, self.app, "transcription_manager", manager)
+
+        jobs = []
+
+        def submit(audio, sample_rate, duration=None, **options):
+            jobs.append(TranscriptionJob(len(jobs) + 1, audio, sample_rate, duration, state=JobState.DONE,
+                                         result="hello there", options=options))
+            return jobs[-1]
+
+        self.app._recording_finished(AudioBuffer.wrap(np.ones(16000, dtype=np.int16), 16000))
+        with patch.object(self.app.transcription_queue, "submit", side_effect=submit):
+            self.app.process_audio()
+            self.app.process_audio()
+        for job in jobs:
+            self.app._show_result(job)
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual([record["text"] for record, _ in log.records()], ["hello there"])
+        self.root.update()
+
     def test_settings_button_integration(self):
         """Test settings button integration"""
         self.assertIsNotNone(self.app.settings_button, "Settings button should be initialized")
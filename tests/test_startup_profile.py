@@ -0,0 +1,43 @@
+import unittest
+import os
+import subprocess
+import sys
+from startup_profile import format_report, parse_importtime, profile_imports
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       136 |        136 |   _io
+import time:      1500 |       2000 |     numpy.core
+import time:     90000 |      95000 | numpy
+import time:      3000 |       3000 | tkinter
+"""
+
+class TestStartupProfile(unittest.TestCase):
+    def test_parse_importtime(self):
+        timings = parse_importtime(SAMPLE)
+        self.assertEqual([t.module for t in timings], ["_io", "numpy.core", "numpy", "tkinter"])
+        self.assertAlmostEqual(timings[2].cumulative_seconds, 0.095)
+        self.assertAlmostEqual(timings[2].self_seconds, 0.09)
+
+    def test_report_lists_slowest_top_level_modules(self):
+        report = format_report(parse_importtime(SAMPLE), first_window_seconds=0.25, limit=2)
+        lines = report.splitlines()
+        self.assertTrue(lines[2].startswith("numpy"))
+        self.assertTrue(lines[3].startswith("tkinter"))
+        self.assertNotIn("numpy.core", report)
+        self.assertIn("Time to first window: 250 ms", report)
+        self.assertIn("Eagerly imported heavy modules: none", report)
+
+    def test_profile_imports_runs_fresh_interpreter(self):
+        timings = profile_imports("json")
+        self.assertIn("json", [t.module for t in timings])
+
+    def test_app_import_defers_whisper_and_torch(self):
+        result = subprocess.run(
+            [sys.executable, "-c", "import app, sys; print(sorted({'whisper', 'torch'} & set(sys.modules)))"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import time
+import numpy as np
+from streaming import StreamingTranscriber, align, common_prefix, stitch
+
+RATE = 1000
+
+class WordPerSecondTranscriber:
+    """Fake model: every second of audio holds one word, encoded as a constant sample value."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cached_calls = 0
+
+    def transcribe(self, audio, sample_rate, use_cache=True):
+        self.calls += 1
+        self.cached_calls += use_cache
+        values = audio[::sample_rate // 10]
+        words = []
+        for value in values:
+            word = f"word{value}"
+            if not words or words[-1] != word:
+                words.append(word)
+        return " ".join(words)
+
+def speech(n_words):
+    return [np.full(RATE, i, dtype=np.int16).tobytes() for i in range(1, n_words + 1)]
+
+class TestStitch(unittest.TestCase):
+    def test_drops_overlap_with_committed_tail(self):
+        self.assertEqual(stitch("a b c d".split(), "c d e f".split()), ["e", "f"])
+
+    def test_ignores_case_and_punctuation(self):
+        self.assertEqual(stitch("Hello there,".split(), "there. General Kenobi".split()), ["General", "Kenobi"])
+
+    def test_skips_word_cut_at_window_edge(self):
+        self.assertEqual(stitch("one two three four".split(), "ree three four five".split()), ["five"])
+
+    def test_aligns_past_many_repeated_committed_words(self):
+        committed = [f"w{i}" for i in range(1, 21)]
+        hypothesis = [f"w{i}" for i in range(3, 25)]
+        self.assertEqual(stitch(committed, hypothesis), ["w21", "w22", "w23", "w24"])
+
+    def test_short_run_far_from_the_start_is_not_trusted(self):
+        self.assertEqual(stitch("x a b".split(), "c d e f a b g".split()), "c d e f a b g".split())
+
+    def test_no_overlap_keeps_everything(self):
+        self.assertEqual(stitch("a b".split(), "c d".split()), ["c", "d"])
+        self.assertEqual(stitch([], "c d".split()), ["c", "d"])
+
+    def test_align_finds_longest_run(self):
+        self.assertEqual(align("the cat and the dog".split(), "the dog ran".split()), 3)
+        self.assertIsNone(align("a b".split(), "c d".split()))
+
+    def test_common_prefix(self):
+        self.assertEqual(common_prefix("a b c".split(), "a b x".split()), ["a", "b"])
+
+class TestStreamingTranscriber(unittest.TestCase):
+    def _stream(self, **kwargs):
+        self.updates = []
+        self.model = WordPerSecondTranscriber()
+        return StreamingTranscriber(
+            self.model, RATE, window_seconds=3.0, step_ms=10,
+            on_update=lambda committed, partial: self.updates.append((committed, partial)),
+            **kwargs
+        )
+
+    def _expected(self, n_words):
+        return " ".join(f"word{i}" for i in range(1, n_words + 1))
+
+    def test_live_feed_produces_partials_and_no_duplicates(self):
+        stream = self._stream()
+        stream.start()
+        for chunk in speech(8):
+            for i in range(0, len(chunk), 200):
+                stream.feed(chunk[i:i + 200])
+                time.sleep(0.005)
+        self.assertEqual(stream.finish(), self._expected(8))
+        self.assertTrue(any(partial for _, partial in self.updates), "Partial hypotheses should be reported")
+        self.assertEqual(self.updates[-1], (self._expected(8), ""))
+
+    def test_lagging_inference_does_not_drop_audio(self):
+        stream = self._stream()
+        for chunk in speech(10):
+            stream.feed(chunk)
+        self.assertEqual(stream.finish(), self._expected(10))
+        self.assertEqual(self.model.cached_calls, 0, "windows bypass the transcription cache")
+
+    def test_committed_text_only_grows(self):
+        stream = self._stream()
+        stream.start()
+        for chunk in speech(6):
+            stream.feed(chunk)
+            time.sleep(0.03)
+        stream.finish()
+        committed = [c for c, _ in self.updates]
+        for earlier, later in zip(committed, committed[1:]):
+            self.assertTrue(later.startswith(earlier))
+
+    def test_many_words_per_window(self):
+        # Ten words per second: each 3 s window repeats up to 30 committed words.
+        stream = self._stream()
+        for i in range(1, 61):
+            stream.feed(np.full(RATE // 10, i, dtype=np.int16).tobytes())
+            if i % 5 == 0:
+                window = stream._transcribe_window()
+                if window is not None:
+                    stream._advance(*window)
+        self.assertEqual(stream.finish(), self._expected(60))
+
+    def test_no_audio(self):
+        stream = self._stream()
+        stream.start()
+        self.assertEqual(stream.finish(), "")
+        self.assertEqual(self.model.calls, 0)
+
+if __name__ == "__main__":
+    unittest.main()
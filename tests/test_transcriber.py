@@ -1,9 +1,15 @@
 import unittest
-from app import WhisperTranscriber
+from app import TranscriptionManager, WhisperTranscriber
+from model_registry import ModelRegistry
+from transcription_cache import TranscriptionCache
 from config import WhisperConfig
 import tempfile
+import threading
+import time
 import wave
 import os
+import numpy as np
+from unittest.mock import patch
 
 class TestTranscriber(unittest.TestCase):
     def setUp(self):
@@ -25,5 +31,203 @@ class TestTranscriber(unittest.TestCase):
         self.assertIsInstance(transcription, str, "Transcription result should be a string.")
         self.assertEqual(transcription.strip(), "", "Transcription of silence should be empty.")
 
+    def test_transcribe_int16_array_silence(self):
+        silence = np.zeros(44100, dtype=np.int16)
+        transcription = self.transcriber.transcribe(silence, sample_rate=44100)
+        self.assertEqual(transcription.strip(), "", "Transcription of silence should be empty.")
+
+    def test_transcribers_share_model(self):
+        other = WhisperTranscriber(WhisperConfig(model_size="tiny"))
+        self.assertIs(other.model, self.transcriber.model, "Model should be loaded once per (size, device)")
+
+    def test_transcribe_float32_array(self):
+        silence = np.zeros(16000, dtype=np.float32)
+        transcription = self.transcriber.transcribe(silence)
+        self.assertIsInstance(transcription, str, "Transcription result should be a string.")
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return {"text": f"call {self.calls}"}
+
+class TestTranscriberCache(unittest.TestCase):
+    def setUp(self):
+        # Use the registry's loader rather than the TESTING mock model.
+        patcher = patch.dict(os.environ, {"TESTING": "false"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = CountingModel()
+        registry = ModelRegistry(loader=lambda model_size, device: self.model)
+        self.cache = TranscriptionCache()
+        self.transcriber = WhisperTranscriber(WhisperConfig(model_size="tiny", warmup=False),
+                                              registry=registry, cache=self.cache)
+
+    def test_identical_audio_is_served_from_cache(self):
+        audio = np.ones(16000, dtype=np.int16)
+        first = self.transcriber.transcribe(audio, sample_rate=16000)
+        second = self.transcriber.transcribe(audio.copy(), sample_rate=16000)
+        self.assertEqual(first, second)
+        self.assertEqual(self.model.calls, 1)
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    def test_cache_can_be_bypassed(self):
+        audio = np.ones(16000, dtype=np.int16)
+        self.transcriber.transcribe(audio, sample_rate=16000, use_cache=False)
+        self.transcriber.transcribe(audio, sample_rate=16000, use_cache=False)
+        self.assertEqual(self.model.calls, 2)
+        self.assertEqual(self.cache.stats["entries"], 0)
+
+    def test_different_audio_runs_inference(self):
+        self.transcriber.transcribe(np.ones(16000, dtype=np.int16), sample_rate=16000)
+        self.transcriber.transcribe(np.full(16000, 2, dtype=np.int16), sample_rate=16000)
+        self.assertEqual(self.model.calls, 2)
+
+class LanguageModel:
+    """Records decode options; detects ``language`` with the given probability."""
+
+    def __init__(self, language="de", probability=0.95):
+        self.language = language
+        self.probability = probability
+        self.detections = 0
+        self.options = []
+
+    def detect_language(self, audio):
+        self.detections += 1
+        return None, {self.language: self.probability, "en": 1 - self.probability}
+
+    def transcribe(self, audio, **kwargs):
+        self.options.append(kwargs)
+        return {"text": f"clip {len(self.options)}"}
+
+class TestSessionContext(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(os.environ, {"TESTING": "false"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.audio = np.ones(16000, dtype=np.int16)
+
+    def _transcriber(self, model, cache=None, **config):
+        registry = ModelRegistry(loader=lambda model_size, device: model)
+        return WhisperTranscriber(WhisperConfig(model_size="tiny", warmup=False, **config),
+                                  registry=registry, cache=cache)
+
+    def test_confident_detection_pins_the_language(self):
+        model = LanguageModel(probability=0.95)
+        transcriber = self._transcriber(model)
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(model.detections, 1)
+        self.assertEqual(transcriber.session_language, "de")
+        self.assertEqual([options["language"] for options in model.options], ["de", "de"])
+
+    def test_uncertain_detection_is_not_pinned(self):
+        model = LanguageModel(probability=0.6)
+        transcriber = self._transcriber(model)
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(model.detections, 2)
+        self.assertIsNone(transcriber.session_language)
+        self.assertEqual(model.options[0]["language"], "de", "the detection is still passed on")
+
+    def test_configured_language_skips_detection(self):
+        model = LanguageModel()
+        self._transcriber(model, language="fr").transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(model.detections, 0)
+        self.assertEqual(model.options[0]["language"], "fr")
+
+    def test_pinning_can_be_disabled(self):
+        model = LanguageModel()
+        self._transcriber(model, pin_language=False).transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(model.detections, 0)
+        self.assertNotIn("language", model.options[0])
+
+    def test_session_tail_is_the_initial_prompt(self):
+        model = LanguageModel()
+        transcriber = self._transcriber(model, language="en", prompt_chars=25)
+        manager = TranscriptionManager()
+        transcriber.prompt_provider = manager.tail
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        manager.add_transcription("the quarterly numbers")
+        manager.add_transcription("look good overall")
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        self.assertNotIn("initial_prompt", model.options[0])
+        self.assertEqual(model.options[1]["initial_prompt"], "numbers look good overall")
+
+    def test_prompt_is_part_of_the_cache_key(self):
+        model = LanguageModel()
+        transcriber = self._transcriber(model, cache=TranscriptionCache(), language="en")
+        prompt = ["earlier text"]
+        transcriber.prompt_provider = lambda max_chars: prompt[0]
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        prompt[0] = "other text"
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(len(model.options), 2)
+
+    def test_pinned_prompt_reprocesses_from_the_cache(self):
+        model = LanguageModel()
+        transcriber = self._transcriber(model, cache=TranscriptionCache())
+        manager = TranscriptionManager()
+        manager.add_transcription("earlier text")
+        transcriber.prompt_provider = manager.tail
+        prompt = transcriber.initial_prompt()
+        text = transcriber.transcribe(self.audio, sample_rate=16000, prompt=prompt)
+        manager.add_transcription(text)
+        self.assertEqual(transcriber.transcribe(self.audio, sample_rate=16000, prompt=prompt), text)
+        self.assertEqual(len(model.options), 1)
+        self.assertEqual(model.options[0]["initial_prompt"], "earlier text")
+
+    def test_language_pinned_by_a_miss_keys_the_repeat(self):
+        model = LanguageModel()
+        transcriber = self._transcriber(model, cache=TranscriptionCache())
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(transcriber.session_language, "de")
+        transcriber.transcribe(self.audio, sample_rate=16000)
+        self.assertEqual(len(model.options), 1)
+
+class OverlapDetectingModel:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return {"text": "done"}
+
+class TestConcurrentTranscription(unittest.TestCase):
+    def test_decodes_on_a_shared_model_are_serialized(self):
+        model = OverlapDetectingModel()
+        registry = ModelRegistry(loader=lambda model_size, device: model)
+        with patch.dict(os.environ, {"TESTING": "false"}):
+            transcribers = [WhisperTranscriber(WhisperConfig(model_size="tiny", warmup=False, language="en"),
+                                               registry=registry) for _ in range(2)]
+            audio = np.ones(16000, dtype=np.int16)
+            threads = [threading.Thread(target=transcriber.transcribe, args=(audio, 16000))
+                       for transcriber in transcribers for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual(model.max_running, 1)
+
+class TestSessionTail(unittest.TestCase):
+    def test_tail_is_bounded_at_a_word_boundary(self):
+        manager = TranscriptionManager()
+        self.assertEqual(manager.tail(), "")
+        for text in ["first entry", "second entry", "third"]:
+            manager.add_transcription(text)
+        self.assertEqual(manager.tail(200), "first entry second entry third")
+        self.assertEqual(manager.tail(18), "second entry third")
+        self.assertEqual(manager.tail(16), "entry third")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
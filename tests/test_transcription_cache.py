@@ -0,0 +1,71 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from config import WhisperConfig
+from transcription_cache import TranscriptionCache
+
+class TestTranscriptionCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = WhisperConfig(model_size="tiny")
+        self.audio = np.arange(16000, dtype=np.int16)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_key_depends_on_audio_and_config(self):
+        key = TranscriptionCache.key(self.audio, 16000, self.config)
+        self.assertEqual(key, TranscriptionCache.key(self.audio.copy(), 16000, self.config))
+        self.assertNotEqual(key, TranscriptionCache.key(self.audio[::-1], 16000, self.config))
+        self.assertNotEqual(key, TranscriptionCache.key(self.audio, 44100, self.config))
+        self.assertNotEqual(key, TranscriptionCache.key(self.audio, 16000, WhisperConfig(model_size="base")))
+        self.assertNotEqual(key, TranscriptionCache.key(self.audio, 16000, WhisperConfig(model_size="tiny", language="en")))
+        self.assertNotEqual(key, TranscriptionCache.key(self.audio.astype(np.float32), 16000, self.config))
+
+    def test_key_for_file_hashes_contents(self):
+        path = os.path.join(self.temp_dir, "clip.wav")
+        with open(path, "wb") as f:
+            f.write(b"RIFF" + bytes(100))
+        key = TranscriptionCache.key(path, 16000, self.config)
+        with open(path, "ab") as f:
+            f.write(b"\x01")
+        self.assertNotEqual(key, TranscriptionCache.key(path, 16000, self.config))
+
+    def test_hit_and_miss_counters(self):
+        cache = TranscriptionCache()
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "hello")
+        self.assertEqual(cache.get("k"), "hello")
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_memory_lru_eviction(self):
+        cache = TranscriptionCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.stats["entries"], 2)
+
+    def test_disk_tier_survives_restart(self):
+        TranscriptionCache(cache_dir=self.temp_dir).put("k", "persisted")
+        cache = TranscriptionCache(cache_dir=self.temp_dir)
+        self.assertEqual(cache.get("k"), "persisted")
+        self.assertEqual(cache.stats["disk_hits"], 1)
+        cache.get("k")
+        self.assertEqual(cache.stats["disk_hits"], 1, "Second read should come from memory")
+
+    def test_disk_tier_is_size_bounded(self):
+        cache = TranscriptionCache(max_entries=1, cache_dir=self.temp_dir, max_disk_bytes=250)
+        for i in range(5):
+            cache.put(f"key{i}", "x" * 100)
+            os.utime(os.path.join(self.temp_dir, f"key{i}.txt"), (i, i))
+        self.assertLessEqual(cache.stats["disk_bytes"], 250)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["key3.txt", "key4.txt"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import threading
+import time
+from transcription_queue import JobState, TranscriptionQueue
+
+class TestTranscriptionQueue(unittest.TestCase):
+    def setUp(self):
+        self.delivered = []
+        self.all_delivered = threading.Event()
+        self.expected = 0
+
+    def _collect(self, job):
+        self.delivered.append(job)
+        if len(self.delivered) == self.expected:
+            self.all_delivered.set()
+
+    def test_results_delivered_in_submission_order(self):
+        # Earlier jobs take longer, so they finish last on a multi-worker queue.
+        delays = [0.3, 0.2, 0.1, 0.0]
+        self.expected = len(delays)
+        jobs_queue = TranscriptionQueue(
+            lambda job: time.sleep(job.audio) or f"clip {job.job_id}",
+            workers=4,
+            on_result=self._collect
+        )
+        for delay in delays:
+            jobs_queue.submit(delay, 16000)
+        self.assertTrue(self.all_delivered.wait(5))
+        self.assertEqual([job.result for job in self.delivered], ["clip 1", "clip 2", "clip 3", "clip 4"])
+        jobs_queue.shutdown()
+
+    def test_options_are_passed_with_the_job(self):
+        self.expected = 1
+        jobs_queue = TranscriptionQueue(lambda job: job.options["prompt"], on_result=self._collect)
+        jobs_queue.submit(b"", 16000, prompt="earlier text")
+        self.assertTrue(self.all_delivered.wait(5))
+        self.assertEqual(self.delivered[0].result, "earlier text")
+        jobs_queue.shutdown()
+
+    def test_submit_does_not_block(self):
+        started = threading.Event()
+        release = threading.Event()
+        self.expected = 1
+        jobs_queue = TranscriptionQueue(lambda job: started.set() or (release.wait(5) and "done"),
+                                        on_result=self._collect)
+        job = jobs_queue.submit(b"", 16000)
+        self.assertFalse(release.is_set(), "submit returned while the handler was still blocked")
+        self.assertTrue(started.wait(5))
+        self.assertEqual(job.state, JobState.RUNNING)
+        self.assertEqual(jobs_queue.pending(), [job])
+        release.set()
+        self.assertTrue(self.all_delivered.wait(5))
+        self.assertEqual(job.state, JobState.DONE)
+        self.assertEqual(jobs_queue.pending(), [])
+        jobs_queue.shutdown()
+
+    def test_failed_job_does_not_stall_later_jobs(self):
+        def handler(job):
+            if job.job_id == 1:
+                raise RuntimeError("model exploded")
+            return "ok"
+
+        self.expected = 2
+        jobs_queue = TranscriptionQueue(handler, workers=2, on_result=self._collect)
+        jobs_queue.submit(b"", 16000)
+        jobs_queue.submit(b"", 16000)
+        self.assertTrue(self.all_delivered.wait(5))
+        self.assertEqual(self.delivered[0].state, JobState.FAILED)
+        self.assertIn("model exploded", str(self.delivered[0].error))
+        self.assertEqual(self.delivered[1].state, JobState.DONE)
+        jobs_queue.shutdown()
+
+    def test_audio_released_after_completion(self):
+        self.expected = 1
+        jobs_queue = TranscriptionQueue(lambda job: "ok", on_result=self._collect)
+        job = jobs_queue.submit(b"\x00" * 1024, 16000)
+        self.assertTrue(self.all_delivered.wait(5))
+        self.assertIsNone(job.audio)
+        self.assertGreaterEqual(job.finished_at, job.started_at)
+        jobs_queue.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
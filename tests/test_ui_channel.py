@@ -0,0 +1,118 @@
+import unittest
+import threading
+from tkinter import Tk, Text
+from ui_channel import HistoryView, UIChannel
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, fn):
+        self.scheduled.append(fn)
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, after_id):
+        self.scheduled.clear()
+
+class TestUIChannel(unittest.TestCase):
+    def setUp(self):
+        self.batches = 0
+        self.channel = UIChannel(FakeRoot(), max_batch=3, on_batch=self._on_batch)
+
+    def _on_batch(self):
+        self.batches += 1
+
+    def test_updates_applied_in_order_on_drain(self):
+        applied = []
+        for i in range(2):
+            self.channel.post(applied.append, i)
+        self.assertEqual(applied, [])
+        self.assertEqual(self.channel.drain(), 2)
+        self.assertEqual(applied, [0, 1])
+        self.assertEqual(self.batches, 1)
+
+    def test_batch_is_bounded(self):
+        applied = []
+        for i in range(5):
+            self.channel.post(applied.append, i)
+        self.channel.drain()
+        self.assertEqual(applied, [0, 1, 2])
+        self.channel.drain()
+        self.assertEqual(applied, [0, 1, 2, 3, 4])
+
+    def test_post_latest_coalesces(self):
+        applied = []
+        self.channel.post(applied.append, "first")
+        for i in range(10):
+            self.channel.post_latest("live", applied.append, f"live {i}")
+        self.channel.post(applied.append, "last")
+        self.channel.drain()
+        self.assertEqual(applied, ["first", "live 9", "last"])
+
+    def test_failing_update_does_not_stop_batch(self):
+        applied = []
+        self.channel.post(lambda: 1 / 0)
+        self.channel.post(applied.append, "ok")
+        self.channel.drain()
+        self.assertEqual(applied, ["ok"])
+
+    def test_post_from_threads(self):
+        applied = []
+        threads = [
+            threading.Thread(target=lambda: [self.channel.post(applied.append, 1) for _ in range(100)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.channel.max_batch = 1000
+        self.channel.drain()
+        self.assertEqual(len(applied), 400)
+
+    def test_tick_reschedules(self):
+        self.channel.start()
+        self.assertEqual(len(self.channel.root.scheduled), 1)
+        self.channel.root.scheduled[0]()
+        self.assertEqual(len(self.channel.root.scheduled), 2)
+        self.channel.stop()
+        self.assertEqual(self.channel.root.scheduled, [])
+
+class TestHistoryView(unittest.TestCase):
+    def setUp(self):
+        self.root = Tk()
+        self.text = Text(self.root)
+        self.history = HistoryView(self.text, max_lines=3)
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def _lines(self):
+        return self.text.get("1.0", "end-1c").splitlines()
+
+    def test_writes_are_buffered_until_flush(self):
+        self.history.append("one")
+        self.assertEqual(self._lines(), [])
+        self.history.flush()
+        self.assertEqual(self._lines(), ["one"])
+
+    def test_old_lines_are_trimmed(self):
+        for i in range(5):
+            self.history.append(f"line {i}")
+        self.history.flush()
+        self.assertEqual(self._lines(), ["line 2", "line 3", "line 4"])
+
+    def test_live_text_stays_last(self):
+        self.history.append("one")
+        self.history.set_live("hello", "wor")
+        self.history.flush()
+        self.history.append("two")
+        self.history.set_live("hello world", "")
+        self.history.flush()
+        self.assertEqual(self._lines(), ["one", "two", "hello world "])
+        self.history.clear_live()
+        self.history.flush()
+        self.assertEqual(self._lines(), ["one", "two"])
+
+if __name__ == "__main__":
+    unittest.main()
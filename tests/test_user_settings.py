@@ -2,9 +2,12 @@ import unittest
 import tempfile
 import os
 import json
+import threading
+import time
 from unittest.mock import patch, MagicMock
 from tkinter import Tk
-from user_settings import Settings, AudioDeviceManager, SettingsWindow, SettingsButton
+import user_settings
+from user_settings import Settings, AudioDeviceManager, SettingsWindow, SettingsButton, get_device_manager
 from pathlib import Path
 
 class TestSettings(unittest.TestCase):
@@ -27,6 +30,7 @@ class TestSettings(unittest.TestCase):
         
         self.settings.set("audio_device", test_device)
         self.settings.set("session_folder", test_folder)
+        self.settings.flush()
         
         new_settings = Settings(self.config_file)
         self.assertEqual(new_settings.get("audio_device"), test_device)
@@ -41,15 +45,45 @@ class TestSettings(unittest.TestCase):
         )
         self.assertIsNone(settings.get("last_session"))
 
+    def test_set_is_debounced(self):
+        settings = Settings(self.config_file, flush_delay=0.05)
+        with patch('user_settings.os.replace', wraps=os.replace) as mock_replace:
+            settings.set("audio_device", "A")
+            settings.set("audio_device", "B")
+            settings.set("session_folder", "/folder")
+            self.assertFalse(os.path.exists(self.config_file))
+            time.sleep(0.3)
+            self.assertEqual(mock_replace.call_count, 1)
+        with open(self.config_file) as f:
+            self.assertEqual(json.load(f)["audio_device"], "B")
+
+    def test_write_is_atomic(self):
+        self.settings.set("audio_device", "A")
+        self.settings.flush()
+        self.settings.set("audio_device", "B")
+        with patch('user_settings.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.settings.flush()
+        with open(self.config_file) as f:
+            self.assertEqual(json.load(f)["audio_device"], "A")
+        self.assertEqual(os.listdir(self.temp_dir), ["test_settings.json"])
+
+    def test_reloads_when_file_changes(self):
+        self.settings.set("audio_device", "A")
+        self.settings.flush()
+        other = Settings(self.config_file, reload_interval=0)
+        self.settings.set("audio_device", "B")
+        self.settings.flush()
+        os.utime(self.config_file, ns=(0, 10 ** 18))
+        self.assertEqual(other.get("audio_device"), "B")
+
 class TestAudioDeviceManager(unittest.TestCase):
-    @patch('subprocess.run')
-    def test_get_audio_devices(self, mock_run):
-        mock_result = MagicMock()
-        mock_result.stdout = json.dumps([
+    @patch('user_settings.get_powershell_host')
+    def test_get_audio_devices(self, mock_get_host):
+        mock_get_host.return_value.request.return_value = [
             {"Name": "Test Device 1", "DeviceID": "TEST-1"},
             {"Name": "Test Device 2", "DeviceID": "TEST-2"}
-        ])
-        mock_run.return_value = mock_result
+        ]
         
         manager = AudioDeviceManager()
         devices = manager.get_audio_devices()
@@ -57,6 +91,13 @@ class TestAudioDeviceManager(unittest.TestCase):
         self.assertEqual(len(devices), 2)
         self.assertEqual(devices[0]["Name"], "Test Device 1")
         self.assertEqual(devices[1]["DeviceID"], "TEST-2")
+        mock_get_host.return_value.request.assert_called_once_with('list_devices', timeout=30)
+
+    @patch('user_settings.get_powershell_host')
+    def test_get_audio_devices_single_device(self, mock_get_host):
+        mock_get_host.return_value.request.return_value = {"Name": "Only Device", "DeviceID": "ONLY"}
+        devices = AudioDeviceManager().get_audio_devices()
+        self.assertEqual(devices, [{"Name": "Only Device", "DeviceID": "ONLY"}])
 
     def test_get_audio_devices_testing_mode(self):
         os.environ['TESTING'] = 'true'
@@ -66,6 +107,70 @@ class TestAudioDeviceManager(unittest.TestCase):
         self.assertEqual(len(devices), 2)
         self.assertEqual(devices[0]["Name"], "Test Microphone 1")
         self.assertEqual(devices[1]["DeviceID"], "TEST-2")
+        self.assertIs(manager.devices, devices)
+        self.assertFalse(manager.is_stale)
+
+    @patch('user_settings.get_powershell_host')
+    def test_stale_lookup_does_not_wait_for_the_query(self, mock_get_host):
+        release = threading.Event()
+        request = mock_get_host.return_value.request
+        request.return_value = [{"Name": "Mic", "DeviceID": "MIC"}]
+        manager = AudioDeviceManager(ttl=0)
+        manager.get_audio_devices()
+        time.sleep(0.01)
+        request.side_effect = lambda *args, **kwargs: release.wait(5) and [{"Name": "Headset", "DeviceID": "HS"}]
+        self.assertEqual(manager.device_id("Mic"), "MIC", "answered from the cache")
+        release.set()
+        manager.refresh_async().result(timeout=5)
+        manager.ttl = 60
+        self.assertEqual(manager.device_id("Headset"), "HS")
+
+    @patch('user_settings.get_powershell_host')
+    def test_devices_cached_until_ttl(self, mock_get_host):
+        mock_get_host.return_value.request.return_value = [{"Name": "Mic", "DeviceID": "MIC"}]
+        manager = AudioDeviceManager(ttl=60)
+        manager.get_audio_devices()
+        self.assertEqual(manager.device_id("Mic"), "MIC")
+        self.assertIsNone(manager.device_id("Missing"))
+        self.assertEqual(mock_get_host.return_value.request.call_count, 1)
+
+        manager.ttl = 0
+        time.sleep(0.01)
+        manager.get_audio_devices()
+        self.assertEqual(mock_get_host.return_value.request.call_count, 2)
+
+    @patch('user_settings.get_powershell_host')
+    def test_refresh_async_picks_up_new_device(self, mock_get_host):
+        request = mock_get_host.return_value.request
+        request.return_value = [{"Name": "Mic", "DeviceID": "MIC"}]
+        manager = AudioDeviceManager()
+        self.assertEqual(manager.devices, [])
+        self.assertEqual(manager.refresh_async().result(timeout=5), [{"Name": "Mic", "DeviceID": "MIC"}])
+
+        request.return_value = [{"Name": "Mic", "DeviceID": "MIC"}, {"Name": "Headset", "DeviceID": "HS"}]
+        self.assertIsNone(manager.device_id("Headset"))
+        manager.refresh_async().result(timeout=5)
+        self.assertEqual(manager.device_id("Headset"), "HS")
+
+    @patch('user_settings.get_powershell_host')
+    def test_failed_refresh_keeps_last_list(self, mock_get_host):
+        request = mock_get_host.return_value.request
+        request.return_value = [{"Name": "Mic", "DeviceID": "MIC"}]
+        manager = AudioDeviceManager()
+        manager.get_audio_devices()
+        request.side_effect = RuntimeError("host unavailable")
+        with patch.dict(os.environ, {'TESTING': 'false'}):
+            self.assertEqual(manager.get_audio_devices(refresh=True), [{"Name": "Mic", "DeviceID": "MIC"}])
+
+    def test_shared_manager_is_created_once(self):
+        with patch.object(user_settings, "_device_manager", None):
+            managers = []
+            threads = [threading.Thread(target=lambda: managers.append(get_device_manager())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            self.assertEqual(len({id(manager) for manager in managers}), 1)
 
 class TestSettingsWindow(unittest.TestCase):
     @classmethod
@@ -76,6 +181,7 @@ class TestSettingsWindow(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         cls.root.destroy()
+        cls.settings.flush()
         if os.path.exists("user_settings.json"):
             os.remove("user_settings.json")
 
@@ -94,10 +200,11 @@ class TestSettingsWindow(unittest.TestCase):
         self.assertEqual(self.settings.get("session_folder"), test_path)
 
     def test_device_change(self):
-        with patch.object(self.window.device_manager, 'get_audio_devices') as mock_devices:
-            mock_devices.return_value = [
+        with patch('user_settings.get_powershell_host') as mock_get_host:
+            mock_get_host.return_value.request.return_value = [
                 {"Name": "Test Device", "DeviceID": "TEST-ID"}
             ]
+            self.window.device_manager.refresh_async().result(timeout=5)
             self.window.device_var.set("Test Device")
             self.window.on_device_change(None)
             self.assertEqual(self.settings.get("audio_device"), "TEST-ID")
@@ -110,6 +217,7 @@ class TestSettingsButton(unittest.TestCase):
 
     def tearDown(self):
         self.root.destroy()
+        self.settings.flush()
         if os.path.exists("user_settings.json"):
             os.remove("user_settings.json")
 
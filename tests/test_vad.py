@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from config import AudioConfig
+from vad import VoiceActivityDetector
+
+RATE = 16000
+
+def tone(seconds, amplitude=0.3, frequency=220):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.float32)
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    def setUp(self):
+        self.config = AudioConfig(vad_padding_ms=0)
+        self.vad = VoiceActivityDetector(self.config)
+
+    def test_trims_leading_and_trailing_silence(self):
+        audio = np.concatenate([silence(2), tone(1), silence(1.5)])
+        result = self.vad.trim(audio, RATE)
+        self.assertFalse(result.is_empty)
+        self.assertAlmostEqual(result.start / RATE, 2.0, delta=0.03)
+        self.assertAlmostEqual(result.end / RATE, 3.0, delta=0.03)
+        self.assertAlmostEqual(result.removed_seconds, 3.5, delta=0.06)
+
+    def test_result_is_view_of_input(self):
+        audio = np.concatenate([silence(1), tone(1)])
+        result = self.vad.trim(audio, RATE)
+        self.assertTrue(np.shares_memory(result.audio, audio))
+
+    def test_silence_is_empty(self):
+        result = self.vad.trim(np.zeros(RATE * 5, dtype=np.int16), RATE)
+        self.assertTrue(result.is_empty)
+        self.assertEqual(result.audio.size, 0)
+        self.assertAlmostEqual(result.removed_seconds, 5.0)
+
+    def test_brief_click_is_not_speech(self):
+        audio = np.concatenate([silence(1), tone(0.03), silence(1)])
+        self.assertTrue(self.vad.trim(audio, RATE).is_empty)
+
+    def test_scattered_clicks_are_not_speech(self):
+        frame = RATE * self.config.vad_frame_ms // 1000
+        audio = silence(3)
+        for start in range(frame * 4, len(audio) - frame, frame * 7):
+            audio[start:start + frame] = tone(frame / RATE)
+        self.assertGreaterEqual(np.count_nonzero(self.vad.speech_frames(audio, RATE)), 3)
+        self.assertTrue(self.vad.trim(audio, RATE).is_empty)
+
+    def test_int16_input(self):
+        audio = (np.concatenate([silence(1), tone(1)]) * 32767).astype(np.int16)
+        result = self.vad.trim(audio, RATE)
+        self.assertEqual(result.audio.dtype, np.int16)
+        self.assertAlmostEqual(result.start / RATE, 1.0, delta=0.03)
+
+    def test_padding_keeps_context(self):
+        vad = VoiceActivityDetector(AudioConfig(vad_padding_ms=200))
+        audio = np.concatenate([silence(1), tone(1), silence(1)])
+        result = vad.trim(audio, RATE)
+        self.assertAlmostEqual(result.start / RATE, 0.8, delta=0.03)
+        self.assertAlmostEqual(result.end / RATE, 2.2, delta=0.03)
+
+    def _hiss(self, seconds):
+        rng = np.random.default_rng(0)
+        return (rng.uniform(-1, 1, int(RATE * seconds)) * 0.005).astype(np.float32)  # about -51 dBFS, high ZCR
+
+    def test_noise_floor_alone_is_not_speech(self):
+        audio = np.concatenate([silence(1), self._hiss(1), silence(1)])
+        self.assertTrue(self.vad.trim(audio, RATE).is_empty)
+
+    def test_unvoiced_frames_next_to_voiced_ones_are_kept(self):
+        audio = np.concatenate([silence(1), self._hiss(0.12), tone(1), silence(1)])
+        result = self.vad.trim(audio, RATE)
+        self.assertAlmostEqual(result.start / RATE, 1.0, delta=0.03)
+        self.assertAlmostEqual(result.end / RATE, 2.12, delta=0.03)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from config import WhisperConfig
+
+class TranscriptionCache:
+    """Content-addressed transcription results: an in-memory LRU over an optional disk tier.
+
+    Keys hash the audio payload together with the WhisperConfig fields that change
+    the output, so identical audio decoded the same way is only transcribed once.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.logger = logging.getLogger('SpeechToText')
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file())
+
+    @staticmethod
+    def key(audio: Union[str, np.ndarray], sample_rate: int, config: WhisperConfig,
+            language: Optional[str] = None, prompt: str = "") -> str:
+        """Digest of the audio and everything that changes its decode, including the session prompt."""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{config.model_size}|{config.profile}|{language or config.language}|{config.task}|"
+                      f"{sample_rate}|{len(prompt)}|{prompt}|".encode())
+        if isinstance(audio, str):
+            with open(audio, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        else:
+            audio = np.ascontiguousarray(audio)
+            digest.update(f"{audio.dtype.str}|{audio.shape}|".encode())
+            digest.update(memoryview(audio).cast('B'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+
+            text = self._read_disk(key)
+            if text is not None:
+                self._remember(key, text)
+                self.hits += 1
+                self.disk_hits += 1
+                return text
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._remember(key, text)
+            self._write_disk(key, text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'entries': len(self._memory),
+            'disk_bytes': self._disk_bytes
+        }
+
+    def _remember(self, key: str, text: str) -> None:
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)  # mtime doubles as the disk tier's LRU clock
+            return text
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, path)
+            self._disk_bytes += os.path.getsize(path)
+        except OSError as e:
+            self.logger.warning(f"Could not write transcription cache entry: {e}")
+            return
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+                self._disk_bytes -= size
+            except OSError:
+                pass
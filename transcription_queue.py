@@ -0,0 +1,107 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+class JobState(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+@dataclass
+class TranscriptionJob:
+    job_id: int
+    audio: Any
+    sample_rate: int
+    duration: Optional[float] = None
+    state: JobState = JobState.QUEUED
+    result: Optional[str] = None
+    error: Optional[Exception] = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Extra keyword arguments for the handler.
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED)
+
+JobHandler = Callable[[TranscriptionJob], str]
+ResultCallback = Callable[[TranscriptionJob], None]
+
+class TranscriptionQueue:
+    """Runs transcription jobs on worker threads and reports them in submission order."""
+
+    def __init__(self, handler: JobHandler, workers: int = 1, on_result: Optional[ResultCallback] = None):
+        self.handler = handler
+        self.on_result = on_result
+        self.logger = logging.getLogger('SpeechToText')
+        self._queue: "queue.Queue[Optional[TranscriptionJob]]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, TranscriptionJob] = {}
+        self._next_delivery = 1
+        self._delivery_lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"transcriber-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, audio: Any, sample_rate: int, duration: Optional[float] = None,
+               **options: Any) -> TranscriptionJob:
+        with self._delivery_lock:
+            job = TranscriptionJob(next(self._ids), audio, sample_rate, duration, options=options)
+            self._jobs[job.job_id] = job
+        self._queue.put(job)
+        return job
+
+    def pending(self) -> List[TranscriptionJob]:
+        with self._delivery_lock:
+            return [job for job in self._jobs.values() if not job.finished]
+
+    def shutdown(self, wait: bool = True) -> None:
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.state = JobState.RUNNING
+            job.started_at = time.monotonic()
+            try:
+                job.result = self.handler(job)
+                job.state = JobState.DONE
+            except Exception as e:
+                self.logger.error(f"Transcription job {job.job_id} failed: {e}")
+                job.error = e
+                job.state = JobState.FAILED
+            job.finished_at = time.monotonic()
+            job.audio = None
+            self._deliver()
+
+    def _deliver(self) -> None:
+        # Hold back finished jobs until every earlier submission has been reported.
+        with self._delivery_lock:
+            while True:
+                job = self._jobs.get(self._next_delivery)
+                if job is None or not job.finished:
+                    return
+                del self._jobs[self._next_delivery]
+                self._next_delivery += 1
+                if self.on_result is not None:
+                    try:
+                        self.on_result(job)
+                    except Exception as e:
+                        self.logger.error(f"Result callback failed for job {job.job_id}: {e}")
@@ -0,0 +1,124 @@
+import logging
+import threading
+import tkinter as tk
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+class UIChannel:
+    """Thread-safe queue of UI updates, applied on the Tk thread in batches.
+
+    Tk widgets may only be touched from the thread running the mainloop, so worker
+    threads ``post`` callables here and a ``root.after`` loop runs them once per
+    tick. ``post_latest`` coalesces updates where only the newest matters.
+    """
+
+    def __init__(self, root: Any, interval_ms: int = 30, max_batch: int = 200,
+                 on_batch: Optional[Callable[[], None]] = None):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self.on_batch = on_batch
+        self.logger = logging.getLogger('SpeechToText')
+        self._items: Deque[Tuple[Optional[str], Optional[Callable], tuple]] = deque()
+        self._latest: Dict[str, Tuple[Callable, tuple]] = {}
+        self._lock = threading.Lock()
+        self._after_id: Optional[str] = None
+
+    def post(self, fn: Callable, *args: Any) -> None:
+        with self._lock:
+            self._items.append((None, fn, args))
+
+    def post_latest(self, key: str, fn: Callable, *args: Any) -> None:
+        """Post an update that replaces any not yet applied update with the same key."""
+        with self._lock:
+            if key not in self._latest:
+                self._items.append((key, None, ()))
+            self._latest[key] = (fn, args)
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def drain(self) -> int:
+        """Apply up to ``max_batch`` queued updates; must run on the Tk thread."""
+        with self._lock:
+            count = min(len(self._items), self.max_batch)
+            batch = []
+            for _ in range(count):
+                key, fn, args = self._items.popleft()
+                if key is not None:
+                    fn, args = self._latest.pop(key)
+                batch.append((fn, args))
+
+        for fn, args in batch:
+            try:
+                fn(*args)
+            except Exception as e:
+                self.logger.error(f"UI update {getattr(fn, '__name__', fn)} failed: {e}")
+        if self.on_batch is not None:
+            self.on_batch()
+        return len(batch)
+
+    def _tick(self) -> None:
+        self.drain()
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+class HistoryView:
+    """A read-only Text log that buffers writes and keeps at most ``max_lines`` lines."""
+
+    TAGS = {"normal": {"foreground": "black"}, "error": {"foreground": "red"}, "partial": {"foreground": "gray"}}
+
+    def __init__(self, text: tk.Text, max_lines: int = 1000):
+        self.text = text
+        self.max_lines = max_lines
+        self._pending: List[Tuple[str, tuple]] = []
+        for tag, options in self.TAGS.items():
+            self.text.tag_config(tag, **options)
+
+    def append(self, line: str, tag: str = "normal") -> None:
+        self._pending.append(("append", (line, tag)))
+
+    def set_live(self, committed: str, partial: str) -> None:
+        """Show in-progress text below the history, replacing the previous live text."""
+        self._pending.append(("live", (committed, partial)))
+
+    def clear_live(self) -> None:
+        self._pending.append(("live", None))
+
+    def flush(self) -> None:
+        """Apply buffered writes with a single state toggle, trim and scroll."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self.text.config(state=tk.NORMAL)
+        for op, args in pending:
+            if op == "append":
+                line, tag = args
+                live_range = self.text.tag_ranges("live")
+                # Keep the live text last so it can be replaced in place.
+                index = live_range[0] if live_range else tk.END
+                self.text.insert(index, f"{line}\n", tag)
+            else:
+                live_range = self.text.tag_ranges("live")
+                if live_range:
+                    self.text.delete(*live_range)
+                if args is not None:
+                    committed, partial = args
+                    self.text.insert(tk.END, f"{committed} ", "live", f"{partial}\n", ("live", "partial"))
+        self._trim()
+        self.text.see(tk.END)
+        self.text.config(state=tk.DISABLED)
+
+    def line_count(self) -> int:
+        # Every line ends in a newline, so the cursor after the last one sits on an empty line.
+        return int(self.text.index("end-1c").split(".")[0]) - 1
+
+    def _trim(self) -> None:
+        excess = self.line_count() - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
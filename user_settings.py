@@ -1,88 +1,229 @@
 from tkinter import ttk, filedialog
 import tkinter as tk
 from typing import List, Optional, Dict, Any
+import atexit
 import json
 import os
-import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import Future
 from pathlib import Path
+from capture import CAPTURE_BACKENDS
+from powershell_host import get_powershell_host
+
+TESTING_DEVICES = [
+    {"Name": "Test Microphone 1", "DeviceID": "TEST-1"},
+    {"Name": "Test Microphone 2", "DeviceID": "TEST-2"}
+]
 
 class AudioDeviceManager:
-    def __init__(self):
+    """Audio input devices, cached for ``ttl`` seconds with a name to DeviceID index.
+
+    Enumerating devices is a WMI query through PowerShell, so the list is reused
+    until it expires or ``refresh_async`` is called (e.g. after a device is plugged in).
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
         self._devices: List[Dict[str, str]] = []
-        
-    def get_audio_devices(self) -> List[Dict[str, str]]:
+        self._fetched_at: Optional[float] = None
+        self._index: Dict[str, str] = {}
+        self._indexed: Optional[List[Dict[str, str]]] = None
+        self._refresh: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    @property
+    def devices(self) -> List[Dict[str, str]]:
+        """The cached list, possibly stale or empty; never blocks."""
+        return self._devices
+
+    @property
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl
+
+    def get_audio_devices(self, refresh: bool = False) -> List[Dict[str, str]]:
+        if not refresh and not self.is_stale:
+            return self._devices
         try:
-            powershell_command = '''
-            powershell.exe -Command "
-            Get-WmiObject Win32_SoundDevice | 
-            Where-Object { $_.ConfigManagerErrorCode -eq 0 } |
-            Select-Object Name, DeviceID |
-            ConvertTo-Json
-            "'''
-            
-            result = subprocess.run(
-                powershell_command,
-                shell=True,
-                capture_output=True,
-                text=True
-            )
-            
-            devices = json.loads(result.stdout)
+            devices = get_powershell_host().request('list_devices', timeout=30)
             if isinstance(devices, dict):
                 devices = [devices]
-                
-            self._devices = devices
+
+            with self._lock:
+                self._devices = devices
+                self._fetched_at = time.monotonic()
             return devices
-            
+
         except Exception as e:
-            if os.environ.get('TESTING') == 'true':
-                return [
-                    {"Name": "Test Microphone 1", "DeviceID": "TEST-1"},
-                    {"Name": "Test Microphone 2", "DeviceID": "TEST-2"}
-                ]
-            return []
+            with self._lock:
+                if os.environ.get('TESTING') == 'true':
+                    self._devices = TESTING_DEVICES
+                # Keep serving the last known list; retry after the TTL or on refresh.
+                self._fetched_at = time.monotonic()
+            return self._devices
+
+    def refresh_async(self) -> Future:
+        """Re-enumerate devices on a background thread; concurrent calls share one query."""
+        with self._lock:
+            if self._refresh is not None and not self._refresh.done():
+                return self._refresh
+            future: Future = Future()
+            self._refresh = future
+
+        def run() -> None:
+            try:
+                future.set_result(self.get_audio_devices(refresh=True))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="audio-devices", daemon=True).start()
+        return future
+
+    def device_id(self, name: str) -> Optional[str]:
+        """Look ``name`` up in the cached list; a stale list is refreshed in the background."""
+        if self.is_stale:
+            self.refresh_async()
+        devices = self._devices
+        if devices is not self._indexed:
+            self._index = {d["Name"]: d["DeviceID"] for d in devices}
+            self._indexed = devices
+        return self._index.get(name)
+
+_device_manager: Optional[AudioDeviceManager] = None
+_device_manager_lock = threading.Lock()
+
+def get_device_manager() -> AudioDeviceManager:
+    """Return the process-wide device manager so every settings window shares its cache."""
+    global _device_manager
+    with _device_manager_lock:
+        if _device_manager is None:
+            _device_manager = AudioDeviceManager()
+        return _device_manager
 
 class Settings:
-    def __init__(self, config_file: str = "user_settings.json"):
+    """User settings served from memory; changes are flushed to disk in the background.
+
+    ``set`` only updates the in-memory snapshot and (re)starts a debounce timer, so
+    bursts of changes become one atomic write. The file is re-read only when its
+    mtime changes, e.g. when another process saved it.
+    """
+
+    def __init__(self, config_file: str = "user_settings.json", flush_delay: float = 0.5,
+                 reload_interval: float = 1.0):
         self.config_file = config_file
-        self._settings = {
+        self.flush_delay = flush_delay
+        self.reload_interval = reload_interval
+        self._defaults = {
             "audio_device": "",
+            "capture_backend": "",
             "session_folder": str(Path.home() / "transcription_sessions"),
             "last_session": None
         }
+        self._settings = dict(self._defaults)
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
         self.load()
 
     def get(self, key: str, default: Any = None) -> Any:
+        self._reload_if_changed()
         return self._settings.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        self._settings[key] = value
+        with self._lock:
+            if key in self._settings and self._settings[key] == value:
+                return
+            self._settings[key] = value
+            self._dirty = True
         self.save()
 
     def save(self) -> None:
-        dirname = os.path.dirname(self.config_file)
-        if dirname:
-            os.makedirs(dirname, exist_ok=True)
-        with open(self.config_file, "w") as f:
-            json.dump(self._settings, f, indent=4)
+        """Schedule a flush; repeated calls within ``flush_delay`` coalesce into one write."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+            _pending.add(self)
+
+    def flush(self) -> None:
+        """Write pending changes now, atomically replacing the settings file."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            _pending.discard(self)
+            if not self._dirty and os.path.exists(self.config_file):
+                return
+            snapshot = dict(self._settings)
+            self._dirty = False
+
+            dirname = os.path.dirname(self.config_file)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=dirname or ".", prefix=".settings-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(snapshot, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.config_file)
+            except BaseException:
+                self._dirty = True
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._mtime = os.stat(self.config_file).st_mtime_ns
 
     def load(self) -> None:
-        try:
-            if os.path.exists(self.config_file):
+        with self._lock:
+            try:
+                stat = os.stat(self.config_file)
                 with open(self.config_file, "r") as f:
                     loaded_settings = json.load(f)
-                    self._settings.update(loaded_settings)
+            except Exception:
+                return
+            self._settings = {**self._defaults, **loaded_settings}
+            self._mtime = stat.st_mtime_ns
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return
+        with self._lock:
+            # Unsaved local changes win over whatever is on disk.
+            if mtime != self._mtime and not self._dirty:
+                self.load()
+
+# Settings with a scheduled flush; written out at exit so no change is lost.
+_pending: "weakref.WeakSet[Settings]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_pending() -> None:
+    for settings in list(_pending):
+        try:
+            settings.flush()
         except Exception:
             pass
 
 class SettingsWindow:
     def __init__(self, parent: tk.Tk, settings: Settings):
         self.settings = settings
-        self.device_manager = AudioDeviceManager()
+        self.device_manager = get_device_manager()
         
         self.window = tk.Toplevel(parent)
         self.window.title("Settings")
-        self.window.geometry("400x300")
+        self.window.geometry("400x380")
         self.window.resizable(False, False)
         
         self.setup_ui()
@@ -92,17 +233,21 @@ class SettingsWindow:
         device_frame.pack(fill=tk.X, padx=10, pady=5)
         
         self.device_var = tk.StringVar(value=self.settings.get("audio_device"))
-        devices = self.device_manager.get_audio_devices()
         
-        device_menu = ttk.Combobox(
+        self.device_menu = ttk.Combobox(
             device_frame, 
             textvariable=self.device_var,
-            values=[d["Name"] for d in devices],
+            values=[d["Name"] for d in self.device_manager.devices],
             state="readonly",
             width=40
         )
-        device_menu.pack(fill=tk.X)
-        device_menu.bind('<<ComboboxSelected>>', self.on_device_change)
+        self.device_menu.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.device_menu.bind('<<ComboboxSelected>>', self.on_device_change)
+        
+        refresh_btn = ttk.Button(device_frame, text="Refresh", command=self.refresh_devices)
+        refresh_btn.pack(side=tk.RIGHT, padx=(5, 0))
+        if self.device_manager.is_stale:
+            self.refresh_devices()
         
         folder_frame = ttk.LabelFrame(self.window, text="Session Folder", padding=10)
         folder_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -114,16 +259,41 @@ class SettingsWindow:
         browse_btn = ttk.Button(folder_frame, text="Browse", command=self.browse_folder)
         browse_btn.pack(side=tk.RIGHT, padx=(5, 0))
         
+        backend_frame = ttk.LabelFrame(self.window, text="Capture Backend (applies on restart)", padding=10)
+        backend_frame.pack(fill=tk.X, padx=10, pady=5)
+
+        self.backend_var = tk.StringVar(value=self.settings.get("capture_backend") or "wsl")
+        self.backend_menu = ttk.Combobox(
+            backend_frame,
+            textvariable=self.backend_var,
+            values=sorted(CAPTURE_BACKENDS),
+            state="readonly",
+            width=40
+        )
+        self.backend_menu.pack(fill=tk.X, expand=True)
+        self.backend_menu.bind('<<ComboboxSelected>>', self.on_backend_change)
+
         save_btn = ttk.Button(self.window, text="Save", command=self.save_settings)
         save_btn.pack(pady=20)
         
     def on_device_change(self, event):
-        selected_device = self.device_var.get()
-        devices = self.device_manager.get_audio_devices()
-        device_id = next((d["DeviceID"] for d in devices if d["Name"] == selected_device), None)
+        device_id = self.device_manager.device_id(self.device_var.get())
         if device_id:
             self.settings.set("audio_device", device_id)
             
+    def on_backend_change(self, event):
+        self.settings.set("capture_backend", self.backend_var.get())
+
+    def refresh_devices(self):
+        self._poll_devices(self.device_manager.refresh_async())
+        
+    def _poll_devices(self, future: Future):
+        # Tk must only be touched from its own thread, so poll the background query.
+        if not future.done():
+            self.window.after(100, self._poll_devices, future)
+        elif future.exception() is None and self.window.winfo_exists():
+            self.device_menu["values"] = [d["Name"] for d in future.result()]
+            
     def browse_folder(self):
         folder = filedialog.askdirectory(
             initialdir=self.folder_var.get(),
@@ -164,16 +334,6 @@ def test_audio_device() -> bool:
        return False
        
    try:
-       test_command = f'''
-       powershell.exe -Command "
-       $audio = New-Object System.Media.SoundCapture
-       $audio.Device = '{device_id}'
-       $audio.StartRecording()
-       Start-Sleep -Milliseconds 100
-       $audio.StopRecording()
-       "'''
-       
-       subprocess.run(test_command, shell=True, check=True)
-       return True
+       return bool(get_powershell_host().request('test_device', device_id=device_id, timeout=30))
    except:
        return False
\ No newline at end of file
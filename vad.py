@@ -0,0 +1,83 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from audio_utils import pcm16_to_float32, to_mono
+from config import AudioConfig
+
+@dataclass
+class VadResult:
+    audio: np.ndarray
+    start: int
+    end: int
+    sample_rate: int
+    total_samples: int
+
+    @property
+    def is_empty(self) -> bool:
+        return self.end <= self.start
+
+    @property
+    def removed_seconds(self) -> float:
+        return (self.total_samples - (self.end - self.start)) / self.sample_rate
+
+class VoiceActivityDetector:
+    """Frame energy / zero-crossing voice activity detection, vectorized over all frames."""
+
+    def __init__(self, config: AudioConfig):
+        self.config = config
+        self.logger = logging.getLogger('SpeechToText')
+
+    def speech_frames(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Return one boolean per frame, True where the frame looks like speech."""
+        if audio.dtype == np.int16:
+            audio = pcm16_to_float32(audio)
+        audio = to_mono(audio)
+
+        frame_length = max(1, sample_rate * self.config.vad_frame_ms // 1000)
+        n_frames = audio.size // frame_length
+        if n_frames == 0:
+            return np.zeros(0, dtype=bool)
+        frames = audio[:n_frames * frame_length].reshape(n_frames, frame_length)
+
+        energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zero_crossing_rate = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+
+        threshold = self.config.vad_energy_threshold_db
+        voiced = energy_db > threshold
+        # Unvoiced consonants are quiet but noisy; accept them a little below the energy threshold,
+        # but only next to voiced frames, or a hiss floor alone would count as speech.
+        unvoiced = (energy_db > threshold - 10) & (zero_crossing_rate > self.config.vad_zcr_threshold)
+        reach = max(1, self.config.vad_unvoiced_reach_ms // self.config.vad_frame_ms)
+        near_voiced = np.convolve(voiced, np.ones(2 * reach + 1), mode="same") > 0
+        return voiced | (unvoiced & near_voiced)
+
+    def trim(self, audio: np.ndarray, sample_rate: int) -> VadResult:
+        """Drop leading and trailing silence, returning a view of the original samples.
+
+        The clip counts as silent unless some run of speech frames lasts ``vad_min_speech_ms``.
+        """
+        total = len(audio)
+        speech = self.speech_frames(audio, sample_rate)
+        frame_length = max(1, sample_rate * self.config.vad_frame_ms // 1000)
+        min_frames = max(1, self.config.vad_min_speech_ms // self.config.vad_frame_ms)
+
+        # Run starts and ends come in pairs from the edges of the zero-padded mask.
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+        longest_run = int(np.max(edges[1::2] - edges[::2])) if edges.size else 0
+        if longest_run < min_frames:
+            start = end = 0
+        else:
+            indices = np.flatnonzero(speech)
+            padding = sample_rate * self.config.vad_padding_ms // 1000
+            start = max(0, indices[0] * frame_length - padding)
+            end = min(total, (indices[-1] + 1) * frame_length + padding)
+
+        result = VadResult(audio[start:end], int(start), int(end), sample_rate, total)
+        self.logger.info(
+            f"VAD kept {(result.end - result.start) / sample_rate:.2f}s, "
+            f"removed {result.removed_seconds:.2f}s of {total / sample_rate:.2f}s"
+        )
+        return result